@@ -0,0 +1,173 @@
+"""
+flowfield.py
+Champs de flux partagés: une direction par case vers chaque cible
+
+Pour une cible (et ses cases d'arrivée), un parcours en largeur depuis les
+arrivées donne la distance de chaque case; la direction du prochain pas est
+le premier voisin plus proche d'une case (même ordre de voisins que D* Lite:
+bas, haut, droite, gauche). Le champ ne dépend que de la grille: il est
+calculé une fois par cible et par version du WalkabilityMask, puis partagé
+par tous les agents qui vont vers cette cible. Un déplacement coûte alors
+une lecture de tableau, quel que soit le nombre d'agents.
+
+Les autres agents ne font pas partie du champ: si la case indiquée est
+occupée, FlowFieldPlanner prend un autre voisin aussi proche de l'arrivée,
+sinon contourne avec D* Lite jusqu'à cette cible (revenir au champ dès la
+case suivante ferait osciller l'agent devant un agent immobile).
+"""
+
+import threading
+import weakref
+from array import array
+from collections import OrderedDict, deque
+from typing import Iterable, Optional, Set, Tuple
+
+
+class FlowField:
+    """
+    dist[i]: nombre de pas jusqu'à l'arrivée la plus proche (-1: inaccessible)
+    step[i]: décalage d'indice du prochain pas (0 sur les arrivées)
+    """
+
+    def __init__(self, mask, goals: Iterable[int]):
+        cells, stride = mask.cells, mask.stride
+        size = len(cells)
+        dist = array('i', [-1]) * size
+        queue = deque()
+        for g in goals:
+            if cells[g] and dist[g] < 0:
+                dist[g] = 0
+                queue.append(g)
+        offsets = (stride, -stride, 1, -1)
+        reached = 0
+        while queue:
+            u = queue.popleft()
+            reached += 1
+            du = dist[u] + 1
+            for d in offsets:
+                v = u + d
+                if cells[v] and dist[v] < 0:
+                    dist[v] = du
+                    queue.append(v)
+        self.reached = reached
+
+        step = array('i', [0]) * size
+        for u in range(size):
+            du = dist[u]
+            if du > 0:
+                for d in offsets:
+                    if dist[u + d] == du - 1:
+                        step[u] = d
+                        break
+        self.dist = dist
+        self.step = step
+
+
+class FlowFieldCache:
+    """
+    Champs de flux d'une cuisine, par (cible, adjacent)
+
+    Tous les champs sont oubliés quand la grille change (mask.version); au
+    plus max_fields champs sont gardés (les moins récemment utilisés sortent).
+    """
+
+    def __init__(self, mask, max_fields: int = 64):
+        self._mask = weakref.ref(mask)
+        self.max_fields = max_fields
+        self.version = mask.version
+        self.fields: "OrderedDict[Tuple, FlowField]" = OrderedDict()
+        self.built = 0
+        self.cells_visited = 0
+        self._lock = threading.Lock()  # partagé par des agents mis à jour en parallèle
+
+    def get(self, target, adjacent: bool = True) -> FlowField:
+        mask = self._mask()
+        key = (tuple(target), adjacent)
+        with self._lock:
+            if mask.version != self.version:
+                self.fields.clear()
+                self.version = mask.version
+            field = self.fields.get(key)
+            if field is not None:
+                self.fields.move_to_end(key)
+                return field
+            t = mask.index(*target)
+            goals = [t + d for d in (mask.stride, -mask.stride, 1, -1)] if adjacent else [t]
+            field = self.fields[key] = FlowField(mask, goals)
+            self.built += 1
+            self.cells_visited += field.reached
+            if len(self.fields) > self.max_fields:
+                self.fields.popitem(last=False)
+        return field
+
+
+_shared_fields = weakref.WeakKeyDictionary()
+
+
+def shared_flow_fields(mask) -> FlowFieldCache:
+    """Champs de flux communs à tous les agents d'une même cuisine"""
+    cache = _shared_fields.get(mask)
+    if cache is None:
+        cache = _shared_fields[mask] = FlowFieldCache(mask)
+    return cache
+
+
+class FlowFieldPlanner:
+    """
+    Déplacement d'un agent par champ de flux partagé (même interface que PathPlanner)
+
+    fallback: planificateur de contournement quand tous les voisins plus
+    proches de l'arrivée sont occupés (PathPlanner, avec ses coûts de trafic),
+    utilisé jusqu'à l'arrivée ou au changement de cible.
+    """
+
+    def __init__(self, mask, fallback):
+        self.mask = mask
+        self.fields = shared_flow_fields(mask)
+        self.fallback = fallback
+        self.lookups = 0
+        self.repairs = 0
+        self._detour = None  # (cible, adjacent) contournée avec fallback
+
+    @property
+    def searches(self) -> int:
+        return self.fallback.searches
+
+    @property
+    def expansions(self) -> int:
+        """Sommets développés par les contournements (les champs sont comptés par le cache)"""
+        return self.fallback.expansions
+
+    def next_step(self, start, target, obstacles: Set[Tuple[int, int]] = frozenset(),
+                  adjacent: bool = True) -> Optional[Tuple[int, int]]:
+        """Prochaine case vers target, ou None si aucun chemin (ou déjà arrivé)"""
+        mask = self.mask
+        key = (tuple(target), adjacent)
+        if self._detour is not None:
+            if self._detour == key:
+                return self.fallback.next_step(start, target, obstacles, adjacent)
+            self._detour = None
+        field = self.fields.get(target, adjacent)
+        s = mask.index(*start)
+        ds = field.dist[s]
+        if ds <= 0:
+            return None  # arrivé, ou cible inaccessible
+        self.lookups += 1
+        nxt = mask.position(s + field.step[s])
+        if nxt not in obstacles:
+            return nxt
+
+        # Case occupée: autre voisin aussi proche, sinon contournement D* Lite
+        dist = field.dist
+        for d in (mask.stride, -mask.stride, 1, -1):
+            if dist[s + d] == ds - 1:
+                other = mask.position(s + d)
+                if other not in obstacles:
+                    return other
+        self.repairs += 1
+        self._detour = key
+        return self.fallback.next_step(start, target, obstacles, adjacent)
+
+    def reset(self):
+        self._detour = None
+        self.fallback.reset()
@@ -0,0 +1,367 @@
+"""
+hpa.py
+Recherche de chemin hiérarchique (HPA*) pour les grandes cuisines
+
+La grille est découpée en clusters carrés. Sur chaque frontière entre deux
+clusters voisins, les segments de cases marchables des deux côtés forment
+des entrées (une transition au milieu, deux aux extrémités si le segment est
+long). Le graphe abstrait relie les transitions d'un cluster à l'autre
+(coût 1) et, dans un même cluster, les transitions entre elles (distances
+BFS précalculées).
+
+Une requête cherche dans ce petit graphe, puis le chemin est raffiné un
+segment à la fois, à l'intérieur d'un seul cluster. Quand le masque change,
+seuls les clusters touchés et leurs frontières sont reconstruits, à la
+requête suivante.
+"""
+
+import heapq
+import threading
+import weakref
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+INF = float('inf')
+LONG_ENTRANCE = 6  # à partir de cette longueur, une transition à chaque extrémité
+
+
+class ClusterGraph:
+    """
+    Graphe abstrait HPA* sur un WalkabilityMask (indices du masque)
+
+    nodes[c]: transitions du cluster c
+    inter[n]: transitions voisines dans un autre cluster (coût 1)
+    intra[n]: {transition du même cluster: distance}
+    """
+
+    def __init__(self, mask, cluster_size: int = 8):
+        self._mask = weakref.ref(mask)
+        self.cells = mask.cells
+        self.stride = mask.stride
+        self.offsets = mask.offsets
+        self.width, self.height = mask.width, mask.height
+        self.size = cluster_size
+        self.cols = -(-mask.width // cluster_size)
+        self.rows = -(-mask.height // cluster_size)
+
+        # Cluster de chaque indice du masque (-1 sur la bordure)
+        self.cluster_of = [-1] * len(mask.cells)
+        for y in range(mask.height):
+            first = (y // cluster_size) * self.cols
+            base = (y + 1) * self.stride + 1
+            for x in range(mask.width):
+                self.cluster_of[base + x] = first + x // cluster_size
+
+        self.entrances: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        self.nodes: Dict[int, Set[int]] = {c: set() for c in range(self.cols * self.rows)}
+        self.inter: Dict[int, Set[int]] = {}
+        self.intra: Dict[int, Dict[int, int]] = {}
+        self.version = mask.version
+        self.rebuilt_clusters = 0
+        self.expansions = 0
+        self._lock = threading.Lock()  # reconstruction unique si plusieurs agents en parallèle
+        self._rebuild(range(self.cols * self.rows))
+
+    # ----------------------------------------------------------------------
+    # Construction
+    # ----------------------------------------------------------------------
+    def _borders(self, c: int) -> List[Tuple[int, int]]:
+        """Frontières (c1, c2), c1 < c2, du cluster c"""
+        cx, cy = c % self.cols, c // self.cols
+        borders = []
+        if cx > 0:
+            borders.append((c - 1, c))
+        if cx < self.cols - 1:
+            borders.append((c, c + 1))
+        if cy > 0:
+            borders.append((c - self.cols, c))
+        if cy < self.rows - 1:
+            borders.append((c, c + self.cols))
+        return borders
+
+    def _find_entrances(self, c1: int, c2: int) -> List[Tuple[int, int]]:
+        """Paires (case de c1, case de c2) retenues comme transitions sur la frontière"""
+        cells, size = self.cells, self.size
+        cx, cy = c1 % self.cols, c1 // self.cols
+        if c2 == c1 + 1:  # frontière verticale
+            x = (cx + 1) * size - 1
+            line = range(cy * size, min((cy + 1) * size, self.height))
+            first = [(y + 1) * self.stride + x + 1 for y in line]
+            step = 1
+        else:  # frontière horizontale
+            y = (cy + 1) * size - 1
+            line = range(cx * size, min((cx + 1) * size, self.width))
+            first = [(y + 1) * self.stride + x + 1 for x in line]
+            step = self.stride
+
+        pairs, run = [], []
+        for a in first + [None]:
+            if a is not None and cells[a] and cells[a + step]:
+                run.append(a)
+                continue
+            if run:
+                if len(run) >= LONG_ENTRANCE:
+                    pairs += [(run[0], run[0] + step), (run[-1], run[-1] + step)]
+                else:
+                    middle = run[len(run) // 2]
+                    pairs.append((middle, middle + step))
+                run = []
+        return pairs
+
+    def _rebuild(self, clusters: Iterable[int]):
+        """Recalcule les entrées des frontières des clusters donnés et les distances internes"""
+        dirty = set(clusters)
+        borders = set()
+        for c in dirty:
+            borders.update(self._borders(c))
+
+        touched = set(dirty)
+        for key in borders:
+            for a, b in self.entrances.get(key, ()):
+                self.inter[a].discard(b)
+                self.inter[b].discard(a)
+            self.entrances[key] = pairs = self._find_entrances(*key)
+            for a, b in pairs:
+                self.inter.setdefault(a, set()).add(b)
+                self.inter.setdefault(b, set()).add(a)
+            touched.update(key)
+
+        cluster_of = self.cluster_of
+        for c in touched:
+            nodes = set()
+            for key in self._borders(c):
+                for a, b in self.entrances[key]:
+                    nodes.add(a if cluster_of[a] == c else b)
+            for n in self.nodes[c] - nodes:
+                self.intra.pop(n, None)
+                if not self.inter.get(n):
+                    self.inter.pop(n, None)
+            self.nodes[c] = nodes
+            for n in nodes:
+                dist = self._bfs([n], c)
+                self.intra[n] = {m: dist[m] for m in nodes if m != n and m in dist}
+        self.rebuilt_clusters += len(touched)
+
+    def refresh(self):
+        """Reconstruit les clusters modifiés depuis la dernière requête"""
+        mask = self._mask()
+        if mask is None or mask.version == self.version:
+            return
+        with self._lock:
+            if mask.version != self.version:
+                changed = mask.changed_since(self.version)
+                self._rebuild({self.cluster_of[i] for i in changed})
+                self.version = mask.version
+
+    # ----------------------------------------------------------------------
+    # Recherche
+    # ----------------------------------------------------------------------
+    def _bfs(self, sources: List[int], c: int, blocked=frozenset()) -> Dict[int, int]:
+        """Distances depuis sources, sans sortir du cluster c"""
+        cells, cluster_of, offsets = self.cells, self.cluster_of, self.offsets
+        dist = {s: 0 for s in sources}
+        queue = deque(sources)
+        while queue:
+            u = queue.popleft()
+            du = dist[u] + 1
+            for d in offsets:
+                v = u + d
+                if cells[v] and v not in dist and cluster_of[v] == c and v not in blocked:
+                    dist[v] = du
+                    queue.append(v)
+        self.expansions += len(dist)
+        return dist
+
+    def segment(self, start: int, targets: Set[int], blocked=frozenset()) -> Optional[List[int]]:
+        """Chemin le plus court de start vers une des cibles, dans le cluster de start
+        (ou cible voisine directe); None si aucun"""
+        cells, cluster_of, offsets = self.cells, self.cluster_of, self.offsets
+        for d in offsets:
+            if start + d in targets and start + d not in blocked and cells[start + d]:
+                return [start + d]
+        c = cluster_of[start]
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            if u in targets:
+                path = []
+                while u != start:
+                    path.append(u)
+                    u = parent[u]
+                self.expansions += len(parent)
+                return path[::-1]
+            for d in offsets:
+                v = u + d
+                if cells[v] and v not in parent and cluster_of[v] == c and v not in blocked:
+                    parent[v] = u
+                    queue.append(v)
+        self.expansions += len(parent)
+        return None
+
+    def find_route(self, start: int, goals: Iterable[int], blocked=frozenset()) -> Optional[List[int]]:
+        """
+        Transitions à traverser de start jusqu'au cluster d'une arrivée
+        ([] si une arrivée est atteignable dans le cluster de start), None si aucun chemin
+        """
+        self.refresh()
+        cells, cluster_of, stride = self.cells, self.cluster_of, self.stride
+        goals = [g for g in goals if cells[g] and g not in blocked]
+        if not goals:
+            return None
+
+        start_cluster = cluster_of[start]
+        from_start = self._bfs([start], start_cluster, blocked)
+        best = min((from_start[g] for g in goals if g in from_start), default=INF)
+        best_end = None
+
+        to_goal: Dict[int, int] = {}
+        for c in {cluster_of[g] for g in goals}:
+            dist = self._bfs([g for g in goals if cluster_of[g] == c], c, blocked)
+            for n in self.nodes[c]:
+                if n in dist:
+                    to_goal[n] = dist[n]
+
+        goal_xy = [divmod(g, stride) for g in goals]
+
+        def h(n):
+            y, x = divmod(n, stride)
+            return min(abs(x - gx) + abs(y - gy) for gy, gx in goal_xy)
+
+        g_score: Dict[int, int] = {}
+        parent: Dict[int, Optional[int]] = {}
+        open_set = []
+        for n in self.nodes[start_cluster]:
+            if n in from_start:
+                g_score[n] = from_start[n]
+                parent[n] = None
+                heapq.heappush(open_set, (from_start[n] + h(n), from_start[n], n))
+
+        inter, intra = self.inter, self.intra
+        while open_set:
+            f, g, n = heapq.heappop(open_set)
+            if f >= best:
+                break
+            if g > g_score[n]:
+                continue
+            self.expansions += 1
+            if n in to_goal and g + to_goal[n] < best:
+                best, best_end = g + to_goal[n], n
+            for m in inter.get(n, ()):
+                if g + 1 < g_score.get(m, INF) and m not in blocked:
+                    g_score[m] = g + 1
+                    parent[m] = n
+                    heapq.heappush(open_set, (g + 1 + h(m), g + 1, m))
+            for m, cost in intra.get(n, {}).items():
+                if g + cost < g_score.get(m, INF):
+                    g_score[m] = g + cost
+                    parent[m] = n
+                    heapq.heappush(open_set, (g + cost + h(m), g + cost, m))
+
+        if best == INF:
+            return None
+        route = []
+        n = best_end
+        while n is not None:
+            route.append(n)
+            n = parent[n]
+        return route[::-1]
+
+
+_shared_graphs = weakref.WeakKeyDictionary()
+
+
+def shared_cluster_graph(mask, cluster_size: int = 8) -> ClusterGraph:
+    """Graphe abstrait commun à tous les agents d'une même cuisine"""
+    graphs = _shared_graphs.setdefault(mask, {})
+    if cluster_size not in graphs:
+        graphs[cluster_size] = ClusterGraph(mask, cluster_size)
+    return graphs[cluster_size]
+
+
+class HierarchicalPlanner:
+    """
+    Chemin d'un agent via HPA* (même interface que PathPlanner)
+
+    La route abstraite est calculée quand la cible ou la grille change, ou si
+    l'agent a quitté son chemin; chaque segment est raffiné au moment de
+    l'emprunter. Si un autre agent occupe la case suivante, seul le segment
+    courant est recalculé en l'évitant.
+    """
+
+    def __init__(self, mask, cluster_size: int = 8):
+        self.mask = mask
+        self.graph = shared_cluster_graph(mask, cluster_size)
+        self.searches = 0
+        self.repairs = 0
+        self.expansions = 0
+        self.reset()
+
+    def reset(self):
+        self._target = None
+        self._version = None
+        self.goals: Set[int] = set()
+        self.route: Deque[int] = deque()
+        self.steps: Deque[int] = deque()
+        self._segment: Set[int] = set()
+        self._at = None
+
+    def _goals(self, target, adjacent: bool) -> Set[int]:
+        mask = self.mask
+        t = mask.index(*target)
+        if not adjacent:
+            return {t}
+        return {t + d for d in (mask.stride, -mask.stride, 1, -1) if mask.cells[t + d]}
+
+    def _plan(self, s: int, blocked) -> bool:
+        self.searches += 1
+        route = self.graph.find_route(s, self.goals, blocked)
+        self.route = deque(route or ())
+        self.steps = deque()
+        self._at = s
+        return route is not None
+
+    def _next_segment(self, s: int, blocked) -> bool:
+        while self.route and self.route[0] == s:
+            self.route.popleft()
+        self._segment = {self.route.popleft()} if self.route else self.goals
+        path = self.graph.segment(s, self._segment, blocked)
+        self.steps = deque(path or ())
+        return path is not None
+
+    def next_step(self, start, target, obstacles: Set[Tuple[int, int]] = frozenset(),
+                  adjacent: bool = True) -> Optional[Tuple[int, int]]:
+        """Prochaine case vers target, ou None si aucun chemin (ou déjà arrivé)"""
+        mask = self.mask
+        graph = self.graph
+        done = graph.expansions
+        try:
+            s = mask.index(*start)
+            key = (tuple(target), adjacent)
+            if key != self._target or mask.version != self._version:
+                self._target, self._version = key, mask.version
+                self.goals = self._goals(target, adjacent)
+                self._at = None
+            if s in self.goals:
+                return None
+
+            blocked = {mask.index(x, y) for x, y in obstacles}
+            if self.steps and self.steps[0] == s:
+                self.steps.popleft()
+                self._at = s
+            if s != self._at:
+                if not self._plan(s, blocked):
+                    return None
+            if not self.steps and not self._next_segment(s, blocked):
+                # Segment bloqué par un agent: nouvelle route en l'évitant
+                if not self._plan(s, blocked) or not self._next_segment(s, blocked):
+                    return None
+            if self.steps[0] in blocked:
+                self.repairs += 1
+                path = graph.segment(s, self._segment, blocked)
+                if path is None:
+                    return None
+                self.steps = deque(path)
+            return mask.position(self.steps[0])
+        finally:
+            self.expansions += graph.expansions - done
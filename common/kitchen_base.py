@@ -6,6 +6,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from common.objects import Ingredient, Tool, Station
+from common.sprite_cache import SpriteCache, TextCache
+from common.walkability import WalkabilityMask
 
 
 class Kitchen:
@@ -13,22 +15,43 @@ class Kitchen:
     Représente la cuisine complète avec toutes ses zones
     """
 
-    def __init__(self, width=16, height=16, cell_size=50):
+    def __init__(self, width=16, height=16, cell_size=50, headless=False, layout=None):
+        # Layout compilé (common.layouts): impose les dimensions de la grille
+        self.layout = layout
+        if layout is not None:
+            width, height = layout.width, layout.height
         self.width = width
         self.height = height
         self.cell_size = cell_size
         self.grid = [[None for _ in range(width)] for _ in range(height)]
+        # Cases marchables (tenu à jour par set_cell, lu directement par les pathfinders)
+        self.walkable = WalkabilityMask(width, height, walkable=True)
         self.current_dish_image = None
         self.current_dish_pos = None
         self.counter_dishes = []  # Liste des plats sur le comptoir
 
-        # Initialisation Pygame
-        pygame.init()
-        self.screen = pygame.display.set_mode((width * cell_size, height * cell_size + 200))
-        pygame.display.set_caption("Overcooked - Agent Autonome")
+        # Rendu: couche statique en cache + zones modifiées (dirty rects)
+        self._static_layer = None
+        self._prev_dynamic_rects = []
+        self._dynamic_rects = []
+        self._dirty_rects = None  # None = rafraîchissement complet
+
+        # Sprites redimensionnés et textes rendus, réutilisés d'une frame à l'autre
+        self.sprites = SpriteCache()
+        self.texts = TextCache()
+
+        # Initialisation Pygame (headless: ni fenêtre, ni polices, ni images)
+        self.headless = headless
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 28)
-        self.small_font = pygame.font.Font(None, 20)
+        if headless:
+            self.screen = None
+            self.font = self.small_font = None
+        else:
+            pygame.init()
+            self.screen = pygame.display.set_mode((width * cell_size, height * cell_size + 200))
+            pygame.display.set_caption("Overcooked - Agent Autonome")
+            self.font = pygame.font.Font(None, 28)
+            self.small_font = pygame.font.Font(None, 20)
 
         # Données internes
         self.ingredients_available = []
@@ -37,7 +60,10 @@ class Kitchen:
         self.colors = {}
 
         # Configuration de la cuisine
-        self._setup_kitchen()
+        if layout is not None:
+            self._apply_layout(layout)
+        else:
+            self._setup_kitchen()
         self._load_images()
 
         print(f"🍳 Kitchen initialisée ({width}x{height})")
@@ -58,29 +84,60 @@ class Kitchen:
         for x, y, name in ingredient_positions:
             ing = Ingredient(name, "cru", (x, y))
             self.ingredients_available.append(ing)
-            self.grid[y][x] = ing
+            self.set_cell(x, y, ing)
 
         # Zone de découpe (droite haut)
         self.stations['cutting'] = Station('cutting', (13, 1), (1, 1))
         for pos in [(13, 1)]:
             tool = Tool('planche', pos)
             self.tools.append(tool)
-            self.grid[pos[1]][pos[0]] = tool
+            self.set_cell(pos[0], pos[1], tool)
 
         # Zone de cuisson (droite milieu)
         self.stations['cooking'] = Station('cooking', (13, 4), (1, 1))
         for pos in [(13, 4)]:
             tool = Tool('poele', pos)
             self.tools.append(tool)
-            self.grid[pos[1]][pos[0]] = tool
+            self.set_cell(pos[0], pos[1], tool)
 
         # Table centrale (assemblage) - UNE SEULE CASE
         self.stations['assembly'] = Station('assembly', (8, 8), (1, 1))
-        self.grid[8][8] = 'assembly_table'
+        self.set_cell(8, 8, 'assembly_table')
 
         # Comptoir (livraison) - UNE SEULE CASE
         self.stations['counter'] = Station('counter', (3, 12), (1, 1))
-        self.grid[12][3] = 'counter'
+        self.set_cell(3, 12, 'counter')
+
+    # ----------------------------------------------------------------------
+    def _apply_layout(self, layout):
+        """Remplit la grille depuis un layout compilé (voir common.layouts)"""
+        from common.layouts import WALL
+
+        for name, positions in layout.crate_positions.items():
+            for x, y in positions:
+                ing = Ingredient(name, "cru", (x, y))
+                self.ingredients_available.append(ing)
+                self.set_cell(x, y, ing)
+
+        for resource, positions in layout.resources.items():
+            for x, y in positions:
+                if resource in ("cutting_board", "stove"):
+                    tool = Tool('planche' if resource == "cutting_board" else 'poele', (x, y))
+                    self.tools.append(tool)
+                    self.set_cell(x, y, tool)
+                else:
+                    self.set_cell(x, y, resource)
+
+        ys, xs = (layout.cells == WALL).nonzero()
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.set_cell(x, y, 'wall')
+
+        station_names = {'cutting_board': 'cutting', 'stove': 'cooking',
+                         'assembly_table': 'assembly', 'counter': 'counter'}
+        for resource, station in station_names.items():
+            positions = layout.resources.get(resource)
+            if positions:
+                self.stations[station] = Station(station, positions[0], (1, 1))
 
     # ----------------------------------------------------------------------
     def _load_images(self):
@@ -94,6 +151,8 @@ class Kitchen:
         self.colors = {}
 
         def load(name):
+            if self.headless:
+                return None
             path = os.path.join(base_path, name)
             try:
                 img = pygame.image.load(path).convert_alpha()
@@ -133,68 +192,127 @@ class Kitchen:
         self.colors["agent"] = (0, 100, 255)
 
     # ----------------------------------------------------------------------
-    def draw(self, agent, current_order=None, score=0, show_buttons=False):
-        """Dessine toute la cuisine"""
-        self.screen.fill((240, 240, 220))
+    # Rendu en couches: fond statique en cache + sprites dynamiques
+    # ----------------------------------------------------------------------
+    def invalidate_static_layer(self):
+        """Force le re-rendu du fond statique (à appeler après modification de la grille)"""
+        self._static_layer = None
+
+    def _render_static_layer(self):
+        """Dessine sol, murs, caisses et stations dans une surface mise en cache"""
+        layer = pygame.Surface((self.width * self.cell_size, self.height * self.cell_size))
+        layer.fill((240, 240, 220))
 
-        # Grille
         for y in range(self.height):
             for x in range(self.width):
                 rect = pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
                 cell = self.grid[y][x]
 
                 if cell is None:
-                    pygame.draw.rect(self.screen, self.colors['floor'], rect)
+                    pygame.draw.rect(layer, self.colors['floor'], rect)
                 elif isinstance(cell, Ingredient):
-                    pygame.draw.rect(self.screen, (200, 200, 200), rect)
+                    pygame.draw.rect(layer, (200, 200, 200), rect)
                     key = f"{cell.name}_{cell.state}" if cell.state != "cru" else f"{cell.name}_crue"
                     img = self.images.get(key)
                     if img:
                         offset = 5
-                        self.screen.blit(img, (x * self.cell_size + offset, y * self.cell_size + offset))
+                        layer.blit(img, (x * self.cell_size + offset, y * self.cell_size + offset))
                 elif isinstance(cell, Tool):
                     img = self.images.get(cell.tool_type)
                     if img:
-                        self.screen.blit(img, (x * self.cell_size + 5, y * self.cell_size + 5))
+                        layer.blit(img, (x * self.cell_size + 5, y * self.cell_size + 5))
                     else:
-                        pygame.draw.rect(self.screen, (150, 150, 150), rect)
+                        pygame.draw.rect(layer, (150, 150, 150), rect)
                 elif isinstance(cell, str):
                     # Affiche l'image de la table ou du comptoir
                     if cell == "assembly_table":
                         img = self.images.get("assembly_table")
                         if img:
-                            self.screen.blit(img, (x * self.cell_size + 5, y * self.cell_size + 5))
+                            layer.blit(img, (x * self.cell_size + 5, y * self.cell_size + 5))
                         else:
-                            pygame.draw.rect(self.screen, (139, 90, 43), rect)
+                            pygame.draw.rect(layer, (139, 90, 43), rect)
                     elif cell == "counter":
                         img = self.images.get("counter")
                         if img:
-                            self.screen.blit(img, (x * self.cell_size + 5, y * self.cell_size + 5))
+                            layer.blit(img, (x * self.cell_size + 5, y * self.cell_size + 5))
                         else:
-                            pygame.draw.rect(self.screen, (180, 180, 160), rect)
+                            pygame.draw.rect(layer, (180, 180, 160), rect)
                     else:
                         color = self.colors.get(cell, (200, 200, 200))
-                        pygame.draw.rect(self.screen, color, rect)
+                        pygame.draw.rect(layer, color, rect)
+
+                pygame.draw.rect(layer, (200, 200, 200), rect, 1)
+        return layer
+
+    def _begin_frame(self):
+        """Restaure le fond statique sous les sprites de la frame précédente"""
+        self._dynamic_rects = []
+        if self._static_layer is None:
+            self._static_layer = self._render_static_layer()
+            self.screen.blit(self._static_layer, (0, 0))
+            self._prev_dynamic_rects = []
+            self._dirty_rects = None
+            return
+        for rect in self._prev_dynamic_rects:
+            self.screen.blit(self._static_layer, rect, rect)
+        self._dirty_rects = list(self._prev_dynamic_rects)
+
+    def _blit(self, img, dest):
+        """Blit d'un sprite dynamique (zone restaurée à la frame suivante)"""
+        rect = self.screen.blit(img, dest)
+        self._dynamic_rects.append(rect)
+        return rect
+
+    def mark_dirty(self, rect):
+        """Déclare une zone dessinée après draw() (overlay, boutons...)"""
+        rect = pygame.Rect(rect)
+        if self._static_layer is not None:
+            grid_part = rect.clip(self._static_layer.get_rect())
+            if grid_part.width and grid_part.height:
+                self._prev_dynamic_rects.append(grid_part)
+        if self._dirty_rects is not None:
+            self._dirty_rects.append(rect)
+
+    def _end_frame(self, ui_rect):
+        """Clôt la frame: les zones modifiées sont celles d'avant + celles d'aujourd'hui"""
+        grid_rect = self._static_layer.get_rect()
+        current = [r.clip(grid_rect) for r in self._dynamic_rects]
+        if self._dirty_rects is not None:
+            self._dirty_rects.extend(current)
+            self._dirty_rects.append(pygame.Rect(ui_rect))
+        self._prev_dynamic_rects = [r for r in current if r.width and r.height]
+
+    def present(self):
+        """Envoie à l'écran uniquement les zones modifiées"""
+        if self._dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._dirty_rects)
+        self._dirty_rects = []
 
-                pygame.draw.rect(self.screen, (200, 200, 200), rect, 1)
+    # ----------------------------------------------------------------------
+    def draw(self, agent, current_order=None, score=0, show_buttons=False):
+        """Dessine toute la cuisine"""
+        self._begin_frame()
+        ui_rect = pygame.Rect(0, self.height * self.cell_size, self.width * self.cell_size, 200)
+        self.screen.fill((240, 240, 220), ui_rect)
 
         # Dessine les ingrédients assemblés sur la table (AVANT le plat)
         if not (self.current_dish_image and self.current_dish_pos):
             # N'affiche les ingrédients QUE si le plat n'est pas encore créé
-            for ingredient in agent.assembled_ingredients:
+            for idx, ingredient in enumerate(agent.assembled_ingredients):
                 if ingredient.position:
                     ix, iy = ingredient.position
                     key = f"{ingredient.name}_{ingredient.state}" if ingredient.state != "cru" else f"{ingredient.name}_crue"
                     img = self.images.get(key)
                     if img:
                         # Réduit l'image pour les ingrédients sur la table
-                        small_img = pygame.transform.scale(img, (25, 25))
+                        small_img = self.sprites.scaled(img, key, "table", (25, 25), smooth=False)
                         # Décale légèrement pour éviter la superposition
-                        idx = agent.assembled_ingredients.index(ingredient)
                         offset_x = (idx * 10) % 30
                         offset_y = (idx * 10) // 30 * 10
-                        self.screen.blit(small_img,
-                                         (ix * self.cell_size + 10 + offset_x, iy * self.cell_size + 10 + offset_y))
+                        self._blit(small_img,
+                                   (ix * self.cell_size + 10 + offset_x, iy * self.cell_size + 10 + offset_y))
 
         # Dessine les plats sur le comptoir
         for dish_data in self.counter_dishes:
@@ -203,7 +321,7 @@ class Kitchen:
             offset = dish_data.get('offset', 0)
             rect_x = dx * self.cell_size + 5 + offset
             rect_y = dy * self.cell_size + 5
-            self.screen.blit(dish_img, (rect_x, rect_y))
+            self._blit(dish_img, (rect_x, rect_y))
 
         # Agent - Utilise l'image selon la direction
         ax, ay = agent.position
@@ -212,12 +330,13 @@ class Kitchen:
 
         if agent_img:
             # Affiche l'image de l'agent
-            self.screen.blit(agent_img, (ax * self.cell_size + 5, ay * self.cell_size + 5))
+            self._blit(agent_img, (ax * self.cell_size + 5, ay * self.cell_size + 5))
         else:
             # Fallback sur le cercle bleu si l'image n'existe pas
             agent_rect = pygame.Rect(ax * self.cell_size + 5, ay * self.cell_size + 5,
                                      self.cell_size - 10, self.cell_size - 10)
-            pygame.draw.circle(self.screen, self.colors['agent'], agent_rect.center, self.cell_size // 4)
+            self._dynamic_rects.append(
+                pygame.draw.circle(self.screen, self.colors['agent'], agent_rect.center, self.cell_size // 4))
 
         # Dessine l'ingrédient porté par l'agent (si c'est un simple ingrédient)
         if agent.holding and isinstance(agent.holding, Ingredient):
@@ -225,46 +344,49 @@ class Kitchen:
             ing_img = self.images.get(key)
             if ing_img:
                 # Réduit l'image pour qu'elle soit plus petite
-                small_img = pygame.transform.scale(ing_img, (30, 30))
+                small_img = self.sprites.scaled(ing_img, key, "held", (30, 30), smooth=False)
                 # Position au-dessus de l'agent
                 img_x = ax * self.cell_size + self.cell_size // 2 - 15
                 img_y = ay * self.cell_size + 5
-                self.screen.blit(small_img, (img_x, img_y))
+                self._blit(small_img, (img_x, img_y))
 
         # Dessine le plat si l'agent le transporte
         if self.current_dish_image and self.current_dish_pos:
             x, y = self.current_dish_pos
             rect_x = x * self.cell_size + self.cell_size // 4
             rect_y = y * self.cell_size + self.cell_size // 4
-            self.screen.blit(self.current_dish_image, (rect_x, rect_y))
+            self._blit(self.current_dish_image, (rect_x, rect_y))
 
         # Interface en bas
         font = self.font
         ui_y = self.height * self.cell_size
 
         # Score
-        score_text = font.render(f"Score: {score}", True, (0, 100, 0))
+        score_text = self.texts.render(font, f"Score: {score}", (0, 100, 0))
         self.screen.blit(score_text, (10, ui_y + 10))
 
         # Action
-        text_action = font.render(f"Action: {agent.current_action}", True, (0, 0, 0))
+        text_action = self.texts.render(font, f"Action: {agent.current_action}", (0, 0, 0))
         self.screen.blit(text_action, (10, ui_y + 40))
 
         # Commande actuelle
         if current_order:
-            text_order = font.render(f"Commande: {current_order}", True, (0, 0, 150))
+            text_order = self.texts.render(font, f"Commande: {current_order}", (0, 0, 150))
             self.screen.blit(text_order, (10, ui_y + 70))
 
         # Instructions
-        instructions_text = self.small_font.render("Cliquez sur un bouton pour choisir une recette | Q = Quitter", True,
-                                                   (0, 0, 0))
+        instructions_text = self.texts.render(self.small_font,
+                                              "Cliquez sur un bouton pour choisir une recette | Q = Quitter",
+                                              (0, 0, 0))
         self.screen.blit(instructions_text, (10, ui_y + 100))
 
+        self._end_frame(ui_rect)
+
         # Ne dessine les boutons que si demandé
         if show_buttons:
             return self._draw_recipe_buttons_internal()
 
-        pygame.display.flip()
+        self.present()
         return []
 
     # ----------------------------------------------------------------------
@@ -288,30 +410,33 @@ class Kitchen:
             pygame.draw.rect(self.screen, (0, 0, 0), button_rect, 2)
 
             # Texte du bouton
-            button_text = self.small_font.render(recipe_name.capitalize(), True, (255, 255, 255))
+            button_text = self.texts.render(self.small_font, recipe_name.capitalize(), (255, 255, 255))
             text_rect = button_text.get_rect(center=button_rect.center)
             self.screen.blit(button_text, text_rect)
 
             buttons.append((button_rect, recipe_name))
 
-        pygame.display.flip()
+        self.present()
         return buttons
 
     # ----------------------------------------------------------------------
+    def set_cell(self, x, y, value):
+        """Modifie une case de la grille (seul le sol, None, est marchable)"""
+        self.grid[y][x] = value
+        self.walkable.set(x, y, value is None)
+
+    def rebuild_walkability(self):
+        """Recalcule le masque après des écritures directes dans self.grid"""
+        for y in range(self.height):
+            for x in range(self.width):
+                self.walkable.set(x, y, self.grid[y][x] is None)
+
     def is_walkable(self, position):
         """Vérifie si une position est accessible"""
         x, y = position
-
-        if x < 0 or x >= self.width or y < 0 or y >= self.height:
-            return False
-        cell = self.grid[y][x]
-        if cell is None:
-            return True
-        if isinstance(cell, str) and cell in ("assembly_table", "counter"):
-            return False
-        # Les outils et ingrédients ne sont PAS marchables
-        if isinstance(cell, (Tool, Ingredient)):
-            return False
+        if 0 <= x < self.width and 0 <= y < self.height:
+            mask = self.walkable
+            return mask.cells[(y + 1) * mask.stride + x + 1] == 1
         return False
 
     # ----------------------------------------------------------------------
@@ -340,8 +465,7 @@ class Kitchen:
             # Use parent directory (project root) instead of __file__ directory
             root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             image_path = os.path.join(root_dir, recipe_data["image"])
-            self.current_dish_image = pygame.image.load(image_path)
-            self.current_dish_image = pygame.transform.scale(self.current_dish_image, (40, 40))
+            self.current_dish_image = self.sprites.load(image_path, (40, 40))
             self.current_dish_pos = list(position)
             print(f"🍕 Image du plat {recipe_name} affichée sur la table !")
         except Exception as e:
@@ -361,7 +485,7 @@ class Kitchen:
     def place_dish_on_counter(self, recipe_name, position):
         """Place un plat fini sur le comptoir"""
         dish_img = self.images.get(f"dish_{recipe_name}")
-        if not dish_img:
+        if not dish_img and not self.headless:
             # Essaie de charger l'image si pas encore chargée
             from common.recipes import recipes
             import os
@@ -371,8 +495,7 @@ class Kitchen:
                     # Use parent directory (project root) instead of __file__ directory
                     root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
                     image_path = os.path.join(root_dir, recipe_data["image"])
-                    dish_img = pygame.image.load(image_path)
-                    dish_img = pygame.transform.scale(dish_img, (35, 35))
+                    dish_img = self.sprites.load(image_path, (35, 35))
                     self.images[f"dish_{recipe_name}"] = dish_img
                 except Exception as e:
                     print(f"⚠️ Erreur chargement image plat: {e}")
@@ -0,0 +1,243 @@
+"""
+layouts.py
+Cartes de cuisine en fichiers texte (ASCII) ou JSON, compilées une seule fois
+
+Format ASCII (une ligne = une rangée, lignes '#' ignorées):
+
+    XXsXtXoXXXXXXXXX
+    X1.............X
+    B..............S
+    X......A.......X
+    X.............2X
+    XXXCXXXXXXXXXXXX
+
+Légende:
+    .  ou espace   sol            X   mur / plan de travail
+    B              planche        S   poêle
+    A              table d'assemblage
+    C              comptoir de livraison
+    s t o p v f d  caisses: salade, tomate, oignon, pain, viande, fromage, pâte
+    1 .. 9         départ de l'agent n (case de sol)
+
+Format JSON: {"name": ..., "grid": [lignes ASCII], "legend": {symbole: type},
+"starts": [[x, y], ...]} — "legend" complète ou remplace la légende ci-dessus
+(types: floor, wall, board, stove, assembly_table, counter, crate:<ingrédient>).
+
+La compilation produit des tableaux NumPy (types de case, caisses, masque de
+cases marchables) et des index de ressources; elle est mise en cache selon
+l'empreinte SHA-1 du contenu du fichier.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from common.recipes import ingredient_config
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAYOUT_DIR = os.path.join(ROOT_DIR, "layouts")
+
+# === Types de case ===
+FLOOR, WALL, CRATE, BOARD, STOVE, ASSEMBLY, COUNTER = range(7)
+CELL_KINDS = ("floor", "wall", "crate", "board", "stove", "assembly_table", "counter")
+
+INGREDIENTS = tuple(ingredient_config)
+
+DEFAULT_LEGEND = {
+    ".": "floor", " ": "floor", "X": "wall",
+    "B": "board", "S": "stove", "A": "assembly_table", "C": "counter",
+    "s": "crate:salade", "t": "crate:tomate", "o": "crate:oignon", "p": "crate:pain",
+    "v": "crate:viande", "f": "crate:fromage", "d": "crate:pate",
+}
+
+# Noms des ressources tels qu'utilisés par Kitchen.get_best_available_resource
+RESOURCE_NAMES = {BOARD: "cutting_board", STOVE: "stove", ASSEMBLY: "assembly_table", COUNTER: "counter"}
+
+
+@dataclass(frozen=True)
+class CompiledLayout:
+    """
+    Carte compilée (tableaux en lecture seule, partagés entre les cuisines)
+
+    cells     (H, W) int8   type de case (FLOOR, WALL, CRATE, ...)
+    crates    (H, W) int8   1 + index de l'ingrédient dans INGREDIENTS, 0 sinon
+    walkable  (H, W) bool   case de sol
+    resources               type de ressource -> positions (x, y)
+    crate_positions         ingrédient -> positions (x, y)
+    starts                  départs des agents, dans l'ordre 1, 2, ...
+    """
+    name: str
+    source_hash: str
+    width: int
+    height: int
+    cells: np.ndarray
+    crates: np.ndarray
+    walkable: np.ndarray
+    resources: Dict[str, Tuple[Tuple[int, int], ...]]
+    crate_positions: Dict[str, Tuple[Tuple[int, int], ...]]
+    starts: Tuple[Tuple[int, int], ...]
+
+    def count(self, resource: str) -> int:
+        return len(self.resources.get(resource, ()))
+
+    def __repr__(self) -> str:
+        counts = ", ".join(f"{name}={len(pos)}" for name, pos in self.resources.items())
+        return f"CompiledLayout({self.name!r}, {self.width}x{self.height}, {counts})"
+
+
+def compile_layout(rows: List[str], name: str = "layout", legend: Optional[Dict[str, str]] = None,
+                   starts: Optional[List[Tuple[int, int]]] = None, source_hash: str = "") -> CompiledLayout:
+    """Compile une grille ASCII en CompiledLayout (ValueError si la carte est invalide)"""
+    legend = {**DEFAULT_LEGEND, **(legend or {})}
+    rows = [row.rstrip("\n") for row in rows]
+    while rows and not rows[-1].strip():
+        rows.pop()
+    if not rows:
+        raise ValueError(f"Layout {name}: grille vide")
+
+    height = len(rows)
+    width = max(len(row) for row in rows)
+    cells = np.full((height, width), FLOOR, dtype=np.int8)
+    crates = np.zeros((height, width), dtype=np.int8)
+    numbered_starts: Dict[int, Tuple[int, int]] = {}
+
+    for y, row in enumerate(rows):
+        for x, symbol in enumerate(row):
+            if symbol.isdigit() and symbol not in legend:
+                numbered_starts[int(symbol)] = (x, y)
+                continue
+            kind = legend.get(symbol)
+            if kind is None:
+                raise ValueError(f"Layout {name}: symbole inconnu {symbol!r} en ({x}, {y})")
+            if kind.startswith("crate:"):
+                ingredient = kind.split(":", 1)[1]
+                if ingredient not in INGREDIENTS:
+                    raise ValueError(f"Layout {name}: ingrédient inconnu {ingredient!r}")
+                cells[y, x] = CRATE
+                crates[y, x] = 1 + INGREDIENTS.index(ingredient)
+            elif kind in CELL_KINDS:
+                cells[y, x] = CELL_KINDS.index(kind)
+            else:
+                raise ValueError(f"Layout {name}: type de case inconnu {kind!r}")
+
+    walkable = cells == FLOOR
+
+    if starts is None:
+        starts = [numbered_starts[n] for n in sorted(numbered_starts)]
+    starts = tuple((int(x), int(y)) for x, y in starts)
+    for x, y in starts:
+        if not (0 <= x < width and 0 <= y < height) or not walkable[y, x]:
+            raise ValueError(f"Layout {name}: départ ({x}, {y}) hors d'une case de sol")
+
+    resources = {}
+    for code, resource in RESOURCE_NAMES.items():
+        ys, xs = np.nonzero(cells == code)
+        resources[resource] = tuple(zip(xs.tolist(), ys.tolist()))
+    crate_positions = {}
+    for i, ingredient in enumerate(INGREDIENTS):
+        ys, xs = np.nonzero(crates == i + 1)
+        if len(xs):
+            crate_positions[ingredient] = tuple(zip(xs.tolist(), ys.tolist()))
+
+    for resource in ("assembly_table", "counter"):
+        if not resources[resource]:
+            raise ValueError(f"Layout {name}: aucune case {resource}")
+
+    for array in (cells, crates, walkable):
+        array.flags.writeable = False
+
+    return CompiledLayout(name=name, source_hash=source_hash, width=width, height=height,
+                          cells=cells, crates=crates, walkable=walkable, resources=resources,
+                          crate_positions=crate_positions, starts=starts)
+
+
+def parse_layout(text: str, name: str = "layout", fmt: str = "txt", source_hash: str = "") -> CompiledLayout:
+    """Compile le contenu d'un fichier de layout (fmt: 'txt' ou 'json')"""
+    if fmt == "json":
+        data = json.loads(text)
+        starts = data.get("starts")
+        return compile_layout(data["grid"], name=data.get("name", name), legend=data.get("legend"),
+                              starts=[tuple(s) for s in starts] if starts is not None else None,
+                              source_hash=source_hash)
+    rows = [line for line in text.splitlines() if not line.startswith("#")]
+    while rows and not rows[0].strip():
+        rows.pop(0)
+    return compile_layout(rows, name=name, source_hash=source_hash)
+
+
+def to_ascii(layout: CompiledLayout, with_starts: bool = True) -> List[str]:
+    """Grille ASCII d'un layout compilé (inverse de compile_layout, légende par défaut)"""
+    symbols = {FLOOR: ".", WALL: "X", BOARD: "B", STOVE: "S", ASSEMBLY: "A", COUNTER: "C"}
+    crate_symbols = {kind.split(":", 1)[1]: symbol for symbol, kind in DEFAULT_LEGEND.items()
+                     if kind.startswith("crate:")}
+    rows = []
+    for y in range(layout.height):
+        row = []
+        for x in range(layout.width):
+            code = int(layout.cells[y, x])
+            if code == CRATE:
+                row.append(crate_symbols[INGREDIENTS[layout.crates[y, x] - 1]])
+            else:
+                row.append(symbols[code])
+        rows.append(row)
+    if with_starts:
+        for n, (x, y) in enumerate(layout.starts[:9], 1):
+            rows[y][x] = str(n)
+    return ["".join(row) for row in rows]
+
+
+# ----------------------------------------------------------------------
+# Cache des layouts compilés (clé: empreinte du contenu)
+# ----------------------------------------------------------------------
+
+_cache: Dict[Tuple[str, str, str], CompiledLayout] = {}  # (extension, nom, hash du contenu)
+cache_stats = {"hits": 0, "misses": 0}
+
+
+def load_layout(path: str) -> CompiledLayout:
+    """
+    Charge un fichier de layout. Le fichier est relu et haché à chaque appel
+    mais n'est recompilé que si son contenu a changé.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha1(data).hexdigest()
+    stem, ext = os.path.splitext(os.path.basename(path))
+    key = (ext.lower(), stem, digest)
+    layout = _cache.get(key)
+    if layout is not None:
+        cache_stats["hits"] += 1
+        return layout
+    cache_stats["misses"] += 1
+    layout = parse_layout(data.decode("utf-8"), name=stem,
+                          fmt="json" if ext.lower() == ".json" else "txt", source_hash=digest)
+    _cache[key] = layout
+    return layout
+
+
+def clear_layout_cache():
+    _cache.clear()
+    cache_stats.update(hits=0, misses=0)
+
+
+def list_layouts(directory: str = LAYOUT_DIR) -> List[str]:
+    """Chemins des layouts (.txt, .json) d'un dossier, triés par nom"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, f) for f in os.listdir(directory)
+                  if f.endswith((".txt", ".json")))
+
+
+def resolve_layout(name_or_path: str) -> str:
+    """Chemin d'un layout: fichier existant ou nom dans le dossier layouts/"""
+    if os.path.isfile(name_or_path):
+        return name_or_path
+    for ext in ("", ".txt", ".json"):
+        path = os.path.join(LAYOUT_DIR, name_or_path + ext)
+        if os.path.isfile(path):
+            return path
+    raise FileNotFoundError(f"Layout introuvable: {name_or_path}")
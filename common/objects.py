@@ -1,13 +1,19 @@
 """
 objects.py
 Définit les classes pour tous les objets du jeu : ingrédients, outils, plats
+
+Objets créés en grand nombre: attributs en __slots__ (pas de __dict__)
 """
 
+import threading
+
 class Ingredient:
     """
     Représente un ingrédient avec son état actuel
     """
 
+    __slots__ = ('name', 'state', 'position')
+
     def __init__(self, name, state="crue", position=None):
         self.name = name
         self.state = state
@@ -52,20 +58,24 @@ class Ingredient:
 class Tool:
     """Représente un outil (planche à découper, poêle)"""
 
+    __slots__ = ('tool_type', 'position', 'occupied', 'current_item', 'image_path', '_lock')
+
     def __init__(self, tool_type, position):
         self.tool_type = tool_type  # "planche", "poele"
         self.position = position
         self.occupied = False
         self.current_item = None
         self.image_path = f"images/{tool_type}.png"
+        # Prise de l'outil atomique (agents mis à jour en parallèle)
+        self._lock = threading.Lock()
 
     def use(self, ingredient):
-        """Utilise l'outil sur un ingrédient"""
-        if self.occupied:
-            return False
-
-        self.occupied = True
-        self.current_item = ingredient
+        """Utilise l'outil sur un ingrédient (False si déjà occupé)"""
+        with self._lock:
+            if self.occupied:
+                return False
+            self.occupied = True
+            self.current_item = ingredient
 
         # Support des alias anglais utilisés par le mode multi-agent
         if self.tool_type in ("planche", "cutting_board"):
@@ -78,11 +88,12 @@ class Tool:
 
     def release(self):
         """Libère l'outil et retourne l'ingrédient traité"""
-        if self.current_item:
-            item = self.current_item
-            self.current_item = None
-            self.occupied = False
-            return item
+        with self._lock:
+            if self.current_item:
+                item = self.current_item
+                self.current_item = None
+                self.occupied = False
+                return item
         return None
 
     def __repr__(self):
@@ -93,6 +104,8 @@ class Tool:
 class Dish:
     """Représente un plat assemblé"""
 
+    __slots__ = ('recipe_name', 'ingredients', 'completed', 'image_path', 'position')
+
     def __init__(self, recipe_name, ingredients):
         self.recipe_name = recipe_name
         self.ingredients = ingredients  # Liste d'objets Ingredient
@@ -113,6 +126,8 @@ class Dish:
 class Station:
     """Représente une station de travail (zone ingrédients, table, comptoir)"""
 
+    __slots__ = ('station_type', 'position', 'size', 'items')
+
     def __init__(self, station_type, position, size=(1, 1)):
         self.station_type = station_type
         self.position = position  # (x, y)
@@ -0,0 +1,260 @@
+"""
+pathfinding.py
+Recherche de chemin incrémentale (D* Lite) sur le masque de cases marchables
+
+Un agent garde son chemin d'un tick à l'autre: la recherche est faite
+depuis les cases d'arrivée vers l'agent, les valeurs g restent valides
+quand l'agent avance, et seule la zone touchée par un changement
+(agent qui bloque la prochaine case) est réparée. Le coût d'un pas peut
+dépendre de la case d'arrivée (congestion, voir common/traffic.py).
+
+Les sommets sont les indices du WalkabilityMask (bordure non marchable:
+pas de test de bornes pour les voisins).
+
+make_planner choisit entre ce planificateur et HPA* (common/hpa.py) selon
+la taille de la carte, ou les champs de flux partagés (common/flowfield.py).
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from common.flowfield import FlowFieldPlanner
+from common.hpa import HierarchicalPlanner
+
+INF = float('inf')
+HIERARCHICAL_MIN_CELLS = 96 * 96  # 'auto': HPA* à partir de cette surface
+
+
+class DStarLite:
+    """
+    D* Lite (Koenig & Likhachev) à plusieurs arrivées
+
+    start, goals et blocked sont des indices du masque; blocked contient
+    les cases occupées temporairement (autres agents). costs[v] est le coût
+    d'un pas vers v (>= 1, heuristique de Manhattan admissible); 1 par défaut.
+    """
+
+    def __init__(self, mask, start: int, goals: Iterable[int], blocked: Iterable[int] = (),
+                 costs: Optional[Sequence[float]] = None):
+        self.mask = mask
+        self.version = mask.version
+        self.cells = mask.cells
+        self.stride = mask.stride
+        # Ordre des voisins identique à l'A* de CooperativeAgent (bas, haut, droite, gauche)
+        self.offsets = (mask.stride, -mask.stride, 1, -1)
+        self.goals: Set[int] = set(goals)
+        self.blocked: Set[int] = set(blocked)
+        self.costs = costs
+        self.start = start
+        self.last = start
+        self.km = 0
+        self.g: Dict[int, float] = {}
+        self.rhs: Dict[int, float] = {}
+        self.open: List[Tuple[Tuple[float, float], int]] = []
+        self.open_keys: Dict[int, Tuple[float, float]] = {}
+        self.expansions = 0
+
+        for goal in self.goals:
+            if self._free(goal):
+                self.rhs[goal] = 0
+                self._push(goal)
+        self.compute()
+
+    # ----------------------------------------------------------------------
+    def _free(self, s: int) -> bool:
+        return self.cells[s] == 1 and s not in self.blocked
+
+    def _h(self, a: int, b: int) -> int:
+        ay, ax = divmod(a, self.stride)
+        by, bx = divmod(b, self.stride)
+        return abs(ax - bx) + abs(ay - by)
+
+    def _key(self, s: int) -> Tuple[float, float]:
+        m = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (m + self._h(self.start, s) + self.km, m)
+
+    def _push(self, s: int):
+        key = self._key(s)
+        self.open_keys[s] = key
+        heapq.heappush(self.open, (key, s))
+
+    def _update(self, u: int):
+        if not self._free(u):
+            rhs = INF
+        elif u in self.goals:
+            rhs = 0
+        else:
+            rhs = INF
+            g, cells, blocked, costs = self.g, self.cells, self.blocked, self.costs
+            for d in self.offsets:
+                v = u + d
+                if cells[v] and v not in blocked:
+                    c = g.get(v, INF) + (costs[v] if costs is not None else 1)
+                    if c < rhs:
+                        rhs = c
+        self.rhs[u] = rhs
+        self.open_keys.pop(u, None)
+        if self.g.get(u, INF) != rhs:
+            self._push(u)
+
+    # ----------------------------------------------------------------------
+    def compute(self):
+        """Propage les changements jusqu'à ce que la case de départ soit cohérente"""
+        g, rhs, cells = self.g, self.rhs, self.cells
+        open_, open_keys = self.open, self.open_keys
+        start = self.start
+        while open_:
+            key, u = open_[0]
+            if open_keys.get(u) != key:
+                heapq.heappop(open_)  # entrée périmée
+                continue
+            if not (key < self._key(start) or rhs.get(start, INF) != g.get(start, INF)):
+                break
+            heapq.heappop(open_)
+            self.expansions += 1
+            new_key = self._key(u)
+            if key < new_key:
+                self._push(u)
+                continue
+            del open_keys[u]
+            if g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+            else:
+                g[u] = INF
+                self._update(u)
+            for d in self.offsets:
+                v = u + d
+                if cells[v]:
+                    self._update(v)
+
+    def set_blocked(self, blocked: Set[int]) -> int:
+        """Remplace les cases bloquées et répare le chemin; retourne le nombre de cases changées"""
+        changed = self.blocked ^ blocked
+        self.km += self._h(self.last, self.start)
+        self.last = self.start
+        self.blocked = set(blocked)
+        for u in changed:
+            self._update(u)
+            for d in self.offsets:
+                v = u + d
+                if self.cells[v]:
+                    self._update(v)
+        self.compute()
+        return len(changed)
+
+    def next_step(self) -> Optional[int]:
+        """Voisin de start sur un plus court chemin (None: arrivé ou aucun chemin connu)"""
+        s = self.start
+        if s in self.goals:
+            return None
+        best, best_cost = None, INF
+        costs = self.costs
+        for d in self.offsets:
+            v = s + d
+            if self._free(v):
+                c = self.g.get(v, INF) + (costs[v] if costs is not None else 1)
+                if c < best_cost:
+                    best, best_cost = v, c
+        return best
+
+    def path(self, limit: int = 10000) -> List[int]:
+        """Chemin complet courant depuis start (indices)"""
+        path, s = [], self.start
+        saved = self.start
+        try:
+            while len(path) < limit:
+                self.start = s
+                nxt = self.next_step()
+                if nxt is None:
+                    break
+                path.append(nxt)
+                s = nxt
+        finally:
+            self.start = saved
+        return path
+
+
+class PathPlanner:
+    """
+    Chemin d'un agent conservé entre les ticks
+
+    Une recherche complète n'a lieu que si la cible ou la grille (mask.version)
+    change; si la prochaine case est occupée par un autre agent, les cases
+    bloquées sont mises à jour et D* Lite répare localement le chemin.
+    adjacent=True: arriver à côté de la cible (station non marchable).
+    traffic (TrafficHeatmap): coûts de congestion relevés à chaque nouvelle
+    recherche et conservés pendant les réparations.
+    """
+
+    def __init__(self, mask, traffic=None):
+        self.mask = mask
+        self.traffic = traffic
+        self.search: Optional[DStarLite] = None
+        self._target = None
+        self.searches = 0
+        self.repairs = 0
+        self._expansions_done = 0
+
+    @property
+    def expansions(self) -> int:
+        """Nombre total de sommets développés (toutes recherches confondues)"""
+        return self._expansions_done + (self.search.expansions if self.search else 0)
+
+    def _goals(self, target, adjacent: bool) -> List[int]:
+        mask = self.mask
+        t = mask.index(*target)
+        if not adjacent:
+            return [t]
+        return [t + d for d in (mask.stride, -mask.stride, 1, -1) if mask.cells[t + d]]
+
+    def next_step(self, start, target, obstacles: Set[Tuple[int, int]] = frozenset(),
+                  adjacent: bool = True) -> Optional[Tuple[int, int]]:
+        """Prochaine case vers target, ou None si aucun chemin (ou déjà arrivé)"""
+        mask = self.mask
+        s = mask.index(*start)
+        key = (tuple(target), adjacent)
+        search = self.search
+        if search is None or key != self._target or search.version != mask.version:
+            if search is not None:
+                self._expansions_done += search.expansions
+            blocked = {mask.index(x, y) for x, y in obstacles}
+            costs = self.traffic.costs() if self.traffic is not None else None
+            search = self.search = DStarLite(mask, s, self._goals(target, adjacent), blocked, costs)
+            self._target = key
+            self.searches += 1
+        elif s in search.goals:
+            return None  # déjà arrivé
+        else:
+            search.start = s
+            nxt = search.next_step()
+            if nxt is None or mask.position(nxt) in obstacles:
+                search.set_blocked({mask.index(x, y) for x, y in obstacles})
+                self.repairs += 1
+        nxt = search.next_step()
+        return mask.position(nxt) if nxt is not None else None
+
+    def reset(self):
+        if self.search is not None:
+            self._expansions_done += self.search.expansions
+        self.search = None
+        self._target = None
+
+
+def make_planner(mask, mode: str = 'auto', traffic=None):
+    """
+    Planificateur de chemin d'un agent
+    mode: 'dstar' (PathPlanner), 'hpa' (HierarchicalPlanner), 'flow'
+    (FlowFieldPlanner, champs partagés + contournement D* Lite) ou 'auto'
+    (HPA* à partir de HIERARCHICAL_MIN_CELLS cases)
+    traffic: TrafficHeatmap pour PathPlanner (HPA* et les champs de flux
+    gardent des coûts uniformes)
+    """
+    if mode == 'auto':
+        mode = 'hpa' if mask.width * mask.height >= HIERARCHICAL_MIN_CELLS else 'dstar'
+    if mode == 'hpa':
+        return HierarchicalPlanner(mask)
+    if mode == 'dstar':
+        return PathPlanner(mask, traffic)
+    if mode == 'flow':
+        return FlowFieldPlanner(mask, PathPlanner(mask, traffic))
+    raise ValueError(f"Planificateur inconnu: {mode!r}")
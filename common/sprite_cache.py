@@ -0,0 +1,93 @@
+"""
+sprite_cache.py
+Caches LRU des surfaces Pygame : sprites redimensionnés et textes rendus
+"""
+
+import threading
+from collections import OrderedDict
+
+import pygame
+
+
+class SurfaceCache:
+    """
+    Cache LRU générique clé -> Surface
+
+    La surface est construite par `factory()` au premier accès puis réutilisée;
+    au-delà de `max_entries`, l'entrée la moins récemment utilisée est évincée.
+    Partagé entre le thread de rendu et celui de la simulation (sprites des
+    plats): accès protégés par un verrou.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, factory):
+        """Retourne la surface associée à `key`, construite si absente"""
+        with self._lock:
+            surface = self._entries.get(key)
+            if surface is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return surface
+
+            self.misses += 1
+            surface = factory()
+            if surface is None:
+                return None
+            self._entries[key] = surface
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return surface
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}(entries={len(self)}/{self.max_entries}, "
+                f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})")
+
+
+class SpriteCache(SurfaceCache):
+    """Sprites redimensionnés, indexés par (nom, état, taille)"""
+
+    def scaled(self, image, name, state, size, smooth=True):
+        """Version de `image` redimensionnée à `size` pour le sprite (name, state)"""
+        if image is None:
+            return None
+        size = tuple(size)
+        scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        return self.get((name, state, size, smooth), lambda: scale(image, size))
+
+    def load(self, path, size, smooth=False):
+        """Image chargée depuis le disque et redimensionnée (un seul accès disque par taille)"""
+        size = tuple(size)
+
+        def factory():
+            image = pygame.image.load(path)
+            scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+            return scale(image, size)
+
+        return self.get((path, "file", size, smooth), factory)
+
+
+class TextCache(SurfaceCache):
+    """Textes rendus, indexés par (police, contenu, couleur)"""
+
+    def render(self, font, text, color, antialias=True):
+        """Équivalent mis en cache de font.render(text, antialias, color)"""
+        key = (font, text, tuple(color), antialias)
+        return self.get(key, lambda: font.render(text, antialias, color))
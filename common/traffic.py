@@ -0,0 +1,84 @@
+"""
+traffic.py
+Carte de chaleur du trafic récent des agents (coûts de congestion)
+
+Chaque tick, la chaleur de toutes les cases décroît (decay) et chaque case
+occupée par un agent gagne 1. Le coût d'entrée dans une case vaut
+1 + min(weight * chaleur, max_cost): les pathfinders (PathPlanner) évitent
+les passages encombrés quand un chemin parallèle existe.
+
+Les valeurs sont rangées comme les cases du WalkabilityMask (indices bordés):
+
+    costs = traffic.costs()
+    cost = costs[mask.index(x, y)]
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class TrafficHeatmap:
+    """
+    decay: facteur de décroissance par tick (0.9: ~10 ticks de mémoire)
+    weight: coût supplémentaire par unité de chaleur
+    max_cost: coût supplémentaire maximal d'une case (agents à l'arrêt)
+    """
+
+    def __init__(self, mask, decay: float = 0.9, weight: float = 1.0, max_cost: float = 2.0):
+        self.mask = mask
+        self.decay = decay
+        self.weight = weight
+        self.max_cost = max_cost
+        self.heat = np.zeros(len(mask.cells), dtype=np.float64)
+        self.ticks = 0
+        self.show_overlay = False
+        self._costs: Optional[List[float]] = None
+
+    def observe(self, positions: Iterable[Tuple[int, int]]):
+        """Appelé une fois par tick avec les positions des agents"""
+        heat, index = self.heat, self.mask.index
+        heat *= self.decay
+        for x, y in positions:
+            heat[index(x, y)] += 1.0
+        self.ticks += 1
+        self._costs = None
+
+    def costs(self) -> List[float]:
+        """Coût d'entrée de chaque case (indices du masque), recalculé au plus une fois par tick"""
+        if self._costs is None:
+            self._costs = (1.0 + np.minimum(self.heat * self.weight, self.max_cost)).tolist()
+        return self._costs
+
+    def as_array(self) -> np.ndarray:
+        """Chaleur (H, W) sans la bordure"""
+        mask = self.mask
+        return self.heat.reshape(mask.height + 2, mask.stride)[1:-1, 1:-1]
+
+    # ----------------------------------------------------------------------
+    # Overlay
+    # ----------------------------------------------------------------------
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+
+    def draw_overlay(self, screen, cell_size: int, heat: Optional[np.ndarray] = None):
+        """Colore les cases selon leur chaleur (heat: copie (H, W), sinon la carte courante)"""
+        if not self.show_overlay:
+            return None
+        import pygame
+
+        if heat is None:
+            heat = self.as_array()
+        peak = float(heat.max())
+        height, width = heat.shape
+        panel = pygame.Surface((width * cell_size, height * cell_size), pygame.SRCALPHA)
+        if peak > 0:
+            alpha = (heat * (180.0 / peak)).astype(np.int32)
+            for y, x in zip(*np.nonzero(alpha)):
+                panel.fill((230, 40, 30, int(alpha[y, x])),
+                           (x * cell_size, y * cell_size, cell_size, cell_size))
+        return screen.blit(panel, (0, 0))
+
+    def __repr__(self) -> str:
+        return f"TrafficHeatmap(ticks={self.ticks}, max={float(self.heat.max()):.2f})"
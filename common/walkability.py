@@ -0,0 +1,74 @@
+"""
+walkability.py
+Masque compact des cases marchables, partagé par les pathfinders
+
+Une case par octet dans un bytearray bordé d'une rangée/colonne non
+marchable: depuis une case de la grille, les 4 voisins sont toujours des
+indices valides, sans test de bornes. La Kitchen le tient à jour à chaque
+mutation de la grille (Kitchen.set_cell). Les indices modifiés sont
+journalisés (changed_since) pour les reconstructions partielles (HPA*).
+
+    mask = kitchen.walkable
+    cells, stride = mask.cells, mask.stride
+    i = mask.index(x, y)
+    for d in mask.offsets:                  # droite, gauche, bas, haut
+        if cells[i + d]: ...                # voisin marchable
+"""
+
+import numpy as np
+
+
+class WalkabilityMask:
+    """
+    cells[(y + 1) * stride + (x + 1)] vaut 1 si (x, y) est marchable, 0 sinon
+    version est incrémentée à chaque changement (invalidation des caches de chemins)
+    changes[v] est l'indice modifié par le changement v (version == len(changes))
+    """
+
+    def __init__(self, width: int, height: int, walkable: bool = False):
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        self.cells = bytearray(self.stride * (height + 2))
+        self.offsets = (1, -1, self.stride, -self.stride)
+        self.version = 0
+        self.changes = []
+        if walkable:
+            for y in range(height):
+                start = (y + 1) * self.stride + 1
+                self.cells[start:start + width] = b"\x01" * width
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def position(self, index: int):
+        """Inverse de index()"""
+        y, x = divmod(index, self.stride)
+        return (x - 1, y - 1)
+
+    def set(self, x: int, y: int, walkable: bool):
+        value = 1 if walkable else 0
+        i = (y + 1) * self.stride + x + 1
+        if self.cells[i] != value:
+            self.cells[i] = value
+            self.changes.append(i)
+            self.version += 1
+
+    def changed_since(self, version: int):
+        """Indices modifiés depuis la version donnée"""
+        return set(self.changes[version:])
+
+    def is_walkable(self, position) -> bool:
+        """Accès sûr pour une position quelconque (hors grille -> False)"""
+        x, y = position
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[(y + 1) * self.stride + x + 1] == 1
+        return False
+
+    def as_array(self, padded: bool = False) -> np.ndarray:
+        """Vue NumPy (H, W) sur le même buffer (bordure incluse si padded)"""
+        array = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height + 2, self.stride)
+        return array if padded else array[1:-1, 1:-1]
+
+    def __repr__(self) -> str:
+        return f"WalkabilityMask({self.width}x{self.height}, {sum(self.cells)} cases marchables)"
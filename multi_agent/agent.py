@@ -13,19 +13,21 @@ from typing import Optional, Tuple, Dict, Any
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from common.objects import Ingredient, Dish, Tool
+from common.pathfinding import make_planner
 from multi_agent.planning.strips import Action, ActionType
 from multi_agent.coordination.task_market import Task, Bid
 from multi_agent.coordination.communication import AgentCommunicator
 
 class CooperativeAgent:
-    def __init__(self, agent_id: int, position: Tuple[int, int], kitchen, communicator: AgentCommunicator):
+    def __init__(self, agent_id: int, position: Tuple[int, int], kitchen, communicator: AgentCommunicator,
+                 pathfinding: str = 'auto', traffic=None):
         self.id = agent_id
-        self.position = list(position)
+        self._position = list(position)
         self.kitchen = kitchen
         self.communicator = communicator
 
         # État interne
-        self.holding = None
+        self._holding = None
         self.current_task: Optional[Task] = None
         self.current_action = "En attente"
         self.action_timer = 0
@@ -36,6 +38,24 @@ class CooperativeAgent:
         self.processing_action: Optional[str] = None
         self.target_tool_pos = None
 
+        # Chemin conservé d'un tick à l'autre, réparé si bloqué
+        # ('dstar', 'hpa' pour les grandes cartes, 'flow' champs de flux partagés,
+        # 'auto' selon la taille),
+        # pénalisé par le trafic récent (TrafficHeatmap partagée par le jeu)
+        self.path_planner = make_planner(kitchen.walkable, pathfinding, traffic)
+        self.move_target = None   # cible du dernier déplacement
+        self.joint_route = None   # (cible, pas restants) fournis par CBSCoordinator
+        self.blocked_ticks = 0    # ticks consécutifs sans pouvoir avancer
+        self.yield_cell = None    # case où céder le passage (DeadlockWatchdog)
+        self.yield_ticks = 0
+        # Jeu multi-agent: le pas et les interactions avec la cuisine partagée
+        # (outils, table d'assemblage, comptoir) sont appliqués après tous les
+        # agents (ClaimResolver, MoveResolver)
+        self.defer_moves = False
+        self.intended_move = None
+        self.intended_use = None  # (case de l'outil, verbe, durée) demandé ce tick
+        self.deferred = []        # interactions partagées en attente
+
         # Performance tracking
         self.total_distance_traveled = 0
         self.tasks_completed = 0
@@ -43,6 +63,29 @@ class CooperativeAgent:
 
         print(f"🤖 Agent {self.id} initialisé à position {position}")
 
+    # Position et objet porté notifient les observateurs de la cuisine
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        old = self._position
+        self._position = value
+        if self.kitchen.observers:
+            self.kitchen.notify('agent_moved', self, old)
+
+    @property
+    def holding(self):
+        return self._holding
+
+    @holding.setter
+    def holding(self, value):
+        old = self._holding
+        self._holding = value
+        if self.kitchen.observers:
+            self.kitchen.notify('holding_changed', self, old)
+
     # ----------------------------------------------------------------------
     # 1. Évaluation et Bidding (Intelligence)
     # ----------------------------------------------------------------------
@@ -77,7 +120,8 @@ class CooperativeAgent:
 
     def update(self, task_market=None) -> bool:
         """Appelé à chaque frame"""
-        self.communicator.update_position(self.position[0], self.position[1])
+        if not self.defer_moves:
+            self.communicator.update_position(self.position[0], self.position[1])
 
         # Gestion du timer (Action en cours)
         if self.action_timer > 0:
@@ -86,6 +130,11 @@ class CooperativeAgent:
                 self._finish_action()
             return False
 
+        # Cède le passage à la demande du watchdog
+        if self.yield_ticks > 0:
+            self._do_yield()
+            return False
+
         finished = False
 
         # Action longue qui vient juste de se terminer (cut/cook)
@@ -109,6 +158,8 @@ class CooperativeAgent:
             self.tasks_completed += 1
             self.current_task = None
             self.target_tool_pos = None
+            self.move_target = None
+            self.joint_route = None
             return True
 
         return False
@@ -120,9 +171,7 @@ class CooperativeAgent:
             tx, ty = self.target_tool_pos
             cell = self.kitchen.grid[ty][tx]
             if isinstance(cell, Tool):
-                res = cell.release()
-                if res:
-                    self.holding = res
+                self._shared(self._release_tool, cell, (tx, ty))
 
         self.processing_action = None
         self.target_tool_pos = None
@@ -194,12 +243,12 @@ class CooperativeAgent:
             # on fait confiance à l'intelligence spatiale
 
             tool = self.kitchen.grid[target[1]][target[0]]
-            if isinstance(tool, Tool) and tool.use(self.holding):
-                self.holding = None
-                self.processing_action = action_verb
-                self.target_tool_pos = target
-                self.action_timer = duration
-                self.current_action = f"{action_verb.capitalize()}..."
+            if isinstance(tool, Tool) and self.defer_moves and not tool.occupied:
+                # Outil accordé ou refusé après tous les agents (ClaimResolver)
+                self.intended_use = (target, action_verb, duration)
+                return False
+            if isinstance(tool, Tool) and not self.defer_moves and tool.use(self.holding):
+                self._start_tool_action(target, action_verb, duration)
                 return False
 
         # 3. Se déplacer
@@ -215,7 +264,7 @@ class CooperativeAgent:
 
         if self._is_adjacent(target):
             self.holding.position = list(target)
-            self.kitchen.shared_assembly_table.append(self.holding)
+            self._shared(self.kitchen.add_to_assembly, self.holding)
             self.holding = None
             return True
 
@@ -231,9 +280,7 @@ class CooperativeAgent:
 
             if self._is_adjacent(target):
                 # Simule assemblage final
-                items = [i for i in self.kitchen.shared_assembly_table]
-                self.holding = Dish(recipe, items)
-                self.kitchen.shared_assembly_table = []
+                self._shared(self._take_dish, recipe)
                 return False
             else:
                 self._move_towards(target)
@@ -246,7 +293,7 @@ class CooperativeAgent:
         if not target: target = (3, 0)
 
         if self._is_adjacent(target):
-            self.kitchen.place_dish_on_counter(recipe, target)
+            self._shared(self._place_dish, recipe, target)
             self.holding = None
             return True
 
@@ -254,6 +301,55 @@ class CooperativeAgent:
         self.current_action = "Livraison"
         return False
 
+    # ----------------------------------------------------------------------
+    # Interactions avec la cuisine partagée (différées en jeu multi-agent)
+    # ----------------------------------------------------------------------
+
+    def _shared(self, action, *args):
+        """Exécute l'interaction, ou la garde pour ClaimResolver si defer_moves"""
+        if self.defer_moves:
+            self.deferred.append((action, args))
+        else:
+            action(*args)
+
+    def apply_deferred(self):
+        """Interactions du tick (appelé par ClaimResolver, par ordre d'id)"""
+        deferred, self.deferred = self.deferred, []
+        for action, args in deferred:
+            action(*args)
+
+    def commit_use(self):
+        """Outil accordé par ClaimResolver"""
+        (target, action_verb, duration), self.intended_use = self.intended_use, None
+        tool = self.kitchen.grid[target[1]][target[0]]
+        if tool.use(self.holding):
+            self._start_tool_action(target, action_verb, duration)
+
+    def reject_use(self):
+        """Outil refusé (pris par un agent plus prioritaire): nouvel essai au prochain tick"""
+        self.intended_use = None
+
+    def _start_tool_action(self, target, action_verb, duration):
+        self.kitchen.notify('tool_changed', target)
+        self.holding = None
+        self.processing_action = action_verb
+        self.target_tool_pos = target
+        self.action_timer = duration
+        self.current_action = f"{action_verb.capitalize()}..."
+
+    def _release_tool(self, tool, pos):
+        res = tool.release()
+        self.kitchen.notify('tool_changed', pos)
+        if res:
+            self.holding = res
+
+    def _take_dish(self, recipe):
+        self.holding = Dish(recipe, self.kitchen.take_assembly())
+
+    def _place_dish(self, recipe, target):
+        with self.kitchen.lock:
+            self.kitchen.place_dish_on_counter(recipe, target)
+
     # ----------------------------------------------------------------------
     # 4. Helpers & Navigation (Le Vrai Pathfinding A*)
     # ----------------------------------------------------------------------
@@ -294,8 +390,10 @@ class CooperativeAgent:
 
     def _move_towards(self, target):
         """
-        Algorithme A* complet et robuste (celui qui marchait).
-        Évite les murs et les autres agents.
+        Avance d'une case vers la cible en évitant les murs et les autres agents.
+        Le chemin est conservé et réparé (D* Lite, HPA* ou champ de flux, voir make_planner); l'A*
+        best-effort ne sert que si aucun chemin n'existe. Un plan joint
+        (joint_route, CBS) pour cette cible est suivi en priorité.
         """
         if not target: return
         start = tuple(self.position)
@@ -304,14 +402,91 @@ class CooperativeAgent:
         if start == goal: return
 
         # Obstacles = autres agents
-        obstacles = set()
-        others = self.communicator.get_other_agents_positions()
-        for pos in others.values():
-            obstacles.add(pos)
-
+        obstacles = set(self.communicator.get_other_agents_positions().values())
+        self.move_target = goal
+
+        next_step = None
+        if self.joint_route is not None and self.joint_route[0] == goal and self.joint_route[1]:
+            planned = self.joint_route[1].popleft()
+            if planned == start:
+                return  # attente prévue par le plan joint
+            if planned not in obstacles:
+                next_step = planned
+            else:
+                self.joint_route = None
+        if next_step is None:
+            next_step = self.path_planner.next_step(start, goal, obstacles)
+        if next_step is None:
+            next_step = self._best_effort_step(start, goal, obstacles)
+
+        if next_step:
+            self._step_to(start, next_step)
+            self.blocked_ticks = 0
+        else:
+            self.blocked_ticks += 1  # veut avancer mais ne peut pas (voir DeadlockWatchdog)
+
+    def _step_to(self, start, next_step):
+        if self.defer_moves:
+            self.intended_move = tuple(next_step)
+            return
+        self._apply_step(start, next_step)
+
+    def commit_move(self):
+        """Pas accepté par MoveResolver"""
+        next_step, self.intended_move = self.intended_move, None
+        self._apply_step(tuple(self.position), next_step)
+
+    def reject_move(self):
+        """Pas refusé par MoveResolver (case prise ou échange): compte comme bloqué"""
+        self.intended_move = None
+        self.blocked_ticks += 1
+
+    def _apply_step(self, start, next_step):
+        self.position = list(next_step)
+        self.total_distance_traveled += 1
+
+        # Mise à jour direction visuelle
+        dx = next_step[0] - start[0]
+        dy = next_step[1] - start[1]
+        if dx > 0: self.direction = "CD"
+        elif dx < 0: self.direction = "CG"
+        elif dy > 0: self.direction = "CF"
+        else: self.direction = "CD"
+
+    def step_aside(self, cell, ticks: int):
+        """
+        Cède le passage (DeadlockWatchdog): rejoint cell (None: reste sur place)
+        puis y attend, pendant ticks ticks au total
+        """
+        self.yield_cell = tuple(cell) if cell else None
+        self.yield_ticks = ticks
+        self.blocked_ticks = 0
+        self.joint_route = None
+
+    def _do_yield(self):
+        self.yield_ticks -= 1
+        self.current_action = "Cède le passage"
+        start = tuple(self.position)
+        if self.yield_cell is None or start == self.yield_cell:
+            return
+        obstacles = set(self.communicator.get_other_agents_positions().values())
+        next_step = self.path_planner.next_step(start, self.yield_cell, obstacles, adjacent=False)
+        if next_step:
+            self._step_to(start, next_step)
+
+    def _best_effort_step(self, start, goal, obstacles):
+        """
+        Algorithme A* complet et robuste (celui qui marchait).
+        Si pas de chemin complet, premier pas vers le noeud le plus proche du but.
+        """
         def heuristic(a, b):
             return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
+        # Masque bordé de la Kitchen: limites et murs en une seule lecture
+        walkable = self.kitchen.walkable
+        cells, stride = walkable.cells, walkable.stride
+        steps = ((0, 1, stride), (0, -1, -stride), (1, 0, 1), (-1, 0, -1))
+
         open_set = []
         heapq.heappush(open_set, (0, start))
         came_from = {}
@@ -329,12 +504,12 @@ class CooperativeAgent:
                 found = True
                 break
 
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                neighbor = (current[0] + dx, current[1] + dy)
-
+            index = (current[1] + 1) * stride + current[0] + 1
+            for dx, dy, offset in steps:
                 # Vérif limites et murs
-                if not self.kitchen.is_walkable(neighbor):
+                if not cells[index + offset]:
                     continue
+                neighbor = (current[0] + dx, current[1] + dy)
                 # Vérif agents
                 if neighbor in obstacles:
                     continue
@@ -360,18 +535,7 @@ class CooperativeAgent:
             path.append(target_node)
             target_node = came_from[target_node]
 
-        if path:
-            next_step = path[-1] # Le premier pas après start
-            self.position = list(next_step)
-            self.total_distance_traveled += 1
-
-            # Mise à jour direction visuelle
-            dx = next_step[0] - start[0]
-            dy = next_step[1] - start[1]
-            if dx > 0: self.direction = "CD"
-            elif dx < 0: self.direction = "CG"
-            elif dy > 0: self.direction = "CF"
-            else: self.direction = "CD"
+        return path[-1] if path else None  # Le premier pas après start
 
     def get_performance_stats(self) -> Dict[str, Any]:
         return {
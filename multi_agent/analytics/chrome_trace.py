@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+Export au format Chrome Trace Event (JSON)
+
+Le fichier produit s'ouvre dans chrome://tracing et dans Perfetto
+(ui.perfetto.dev). Chaque piste (track) correspond à un thread (tid)
+nommé via un événement de métadonnées.
+"""
+
+import json
+from typing import Dict, List, Any, Iterable
+
+
+def complete_event(name: str, start_us: float, duration_us: float, tid: int,
+                   pid: int = 1, category: str = "sim", args: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Crée un événement 'X' (span complet)"""
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start_us,
+        "dur": duration_us,
+        "pid": pid,
+        "tid": tid,
+    }
+    if args:
+        event["args"] = args
+    return event
+
+
+def instant_event(name: str, ts_us: float, tid: int, pid: int = 1,
+                  category: str = "sim", args: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Crée un événement instantané 'i' (portée: thread)"""
+    event = {"name": name, "cat": category, "ph": "i", "s": "t", "ts": ts_us, "pid": pid, "tid": tid}
+    if args:
+        event["args"] = args
+    return event
+
+
+def track_metadata(track_names: Dict[int, str], pid: int = 1,
+                   process_name: str = "Overcooked") -> List[Dict[str, Any]]:
+    """Événements 'M' nommant le processus et chaque piste"""
+    events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+               "args": {"name": process_name}}]
+    for tid, name in sorted(track_names.items()):
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                       "args": {"name": name}})
+        events.append({"name": "thread_sort_index", "ph": "M", "pid": pid, "tid": tid,
+                       "args": {"sort_index": tid}})
+    return events
+
+
+def write_chrome_trace(filename: str, events: Iterable[Dict[str, Any]],
+                       track_names: Dict[int, str], process_name: str = "Overcooked"):
+    """Écrit un fichier de trace JSON"""
+    trace = {
+        "traceEvents": track_metadata(track_names, process_name=process_name) + list(events),
+        "displayTimeUnit": "ms",
+    }
+    with open(filename, 'w') as f:
+        json.dump(trace, f, separators=(",", ":"))
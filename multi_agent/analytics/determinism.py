@@ -0,0 +1,106 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+Vérification du déterminisme de la simulation
+
+Tous les N ticks, l'état simulé (agents, outils, table d'assemblage, Task
+Market, commandes) est sérialisé de façon canonique puis haché. Deux runs de
+même graine doivent produire exactement la même suite de hachages: la
+première divergence indique le tick où le non-déterminisme apparaît.
+Les horodatages (time.time) sont exclus: seuls les ticks comptent.
+"""
+
+import hashlib
+from typing import List, Optional, Tuple
+
+from common.objects import Ingredient, Tool
+
+
+def _item_key(item) -> Tuple:
+    if item is None:
+        return ()
+    if isinstance(item, Ingredient):
+        return ('ingredient', item.name, item.state)
+    if isinstance(item, Tool):
+        return ('tool', item.tool_type, item.occupied)
+    return ('other', repr(item))
+
+
+def state_key(game) -> Tuple:
+    """Représentation canonique (tuple) de l'état simulé"""
+    kitchen = game.kitchen
+    grid = []
+    for y in range(kitchen.height):
+        for x in range(kitchen.width):
+            cell = kitchen.grid[y][x]
+            if isinstance(cell, Tool):
+                grid.append((x, y, cell.tool_type, cell.occupied, _item_key(cell.current_item)))
+            elif isinstance(cell, str):
+                grid.append((x, y, cell))
+
+    agents = tuple(
+        (agent.id, tuple(agent.position), agent.direction, _item_key(agent.holding),
+         agent.current_task.task_id if agent.current_task else None,
+         agent.action_timer, agent.processing_action)
+        for agent in game.agents
+    )
+
+    market = game.task_market
+    tasks = ()
+    if market is not None:
+        tasks = tuple(
+            (task.task_id, task.status.value, task.assigned_agent)
+            for task in sorted(market.tasks.values(), key=lambda t: t.task_id)
+        )
+
+    return (
+        game.tick,
+        game.score,
+        game.current_order,
+        tuple(game.order_queue),
+        agents,
+        tuple(grid),
+        tuple(_item_key(ing) for ing in kitchen.shared_assembly_table),
+        tasks,
+    )
+
+
+def state_hash(game) -> str:
+    """Empreinte SHA-1 de l'état simulé"""
+    return hashlib.sha1(repr(state_key(game)).encode()).hexdigest()
+
+
+class StateHasher:
+    """Enregistre le hachage de l'état tous les `every` ticks"""
+
+    def __init__(self, every: int = 10):
+        self.every = max(1, every)
+        self.hashes: List[Tuple[int, str]] = []
+
+    def observe(self, game):
+        """À appeler une fois par tick, après la mise à jour des agents"""
+        if game.tick % self.every == 0:
+            self.hashes.append((game.tick, state_hash(game)))
+
+    def digest(self) -> str:
+        """Empreinte de toute la suite de hachages"""
+        h = hashlib.sha1()
+        for tick, value in self.hashes:
+            h.update(f"{tick}:{value};".encode())
+        return h.hexdigest()
+
+    def __repr__(self) -> str:
+        return f"StateHasher(every={self.every}, samples={len(self.hashes)})"
+
+
+def first_divergence(a: List[Tuple[int, str]], b: List[Tuple[int, str]]) -> Optional[int]:
+    """Premier tick où deux suites de hachages diffèrent (None si identiques)"""
+    for (tick_a, hash_a), (tick_b, hash_b) in zip(a, b):
+        if tick_a != tick_b or hash_a != hash_b:
+            return min(tick_a, tick_b)
+    if len(a) != len(b):
+        shorter = a if len(a) < len(b) else b
+        return shorter[-1][0] + 1 if shorter else 0
+    return None
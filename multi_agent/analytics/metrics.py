@@ -18,7 +18,7 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderMetrics:
     """Métriques pour une commande individuelle"""
     order_id: int
@@ -97,6 +97,9 @@ class PerformanceMetrics:
         self.total_distance_traveled = 0
         self.total_idle_time = 0
 
+        # Blocages détectés et résolus par le DeadlockWatchdog
+        self.deadlocks: List[Dict[str, Any]] = []
+
     # ----------------------------------------------------------------------
     # Gestion des commandes
     # ----------------------------------------------------------------------
@@ -160,6 +163,23 @@ class PerformanceMetrics:
             return self.resource_utilization[resource_name].utilization_rate
         return 0.0
 
+    # ----------------------------------------------------------------------
+    # Blocages (deadlocks / livelocks)
+    # ----------------------------------------------------------------------
+
+    def record_deadlock(self, tick: int, kind: str, agents: List[int], resolution: str):
+        """Enregistre un blocage: kind (blocked, cyclic_wait, livelock), résolution appliquée"""
+        self.deadlocks.append({'tick': tick, 'kind': kind, 'agents': list(agents), 'resolution': resolution})
+
+    def get_deadlock_summary(self) -> Dict[str, Any]:
+        """Nombre de blocages, par type et par résolution"""
+        by_kind: Dict[str, int] = {}
+        by_resolution: Dict[str, int] = {}
+        for event in self.deadlocks:
+            by_kind[event['kind']] = by_kind.get(event['kind'], 0) + 1
+            by_resolution[event['resolution']] = by_resolution.get(event['resolution'], 0) + 1
+        return {'count': len(self.deadlocks), 'by_kind': by_kind, 'by_resolution': by_resolution}
+
     # ----------------------------------------------------------------------
     # Métriques globales
     # ----------------------------------------------------------------------
@@ -234,7 +254,8 @@ class PerformanceMetrics:
                 }
                 for agent_id, stats in self.agent_stats.items()
             },
-            'workload_balance': self.get_workload_balance_score()
+            'workload_balance': self.get_workload_balance_score(),
+            'deadlocks': self.get_deadlock_summary()
         }
 
         return report
@@ -294,6 +315,9 @@ class PerformanceMetrics:
             print(f"    Inactivité: {stats['idle_time']} frames")
 
         print(f"\n⚖️  ÉQUILIBRAGE DE CHARGE: {report['workload_balance']*100:.1f}%")
+        if report['deadlocks']['count']:
+            print(f"\n🚧 BLOCAGES: {report['deadlocks']['count']} "
+                  f"{report['deadlocks']['by_kind']} → {report['deadlocks']['by_resolution']}")
         print("="*60 + "\n")
 
     def export_to_csv(self, filename: str = "metrics.csv"):
@@ -0,0 +1,219 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+Profileur par phase de la boucle de jeu
+
+Mesure (perf_counter_ns) la durée de chaque phase d'un tick:
+- allocate_tasks  : enchères du Task Market
+- agents_update   : mise à jour des agents (dont A*), avec un sous-span par agent
+- update_metrics  : mise à jour de PerformanceMetrics
+- kitchen.draw / order_interface / display.update : rendu
+
+Fournit des histogrammes glissants par phase, un overlay à l'écran
+et un export Chrome Trace JSON (chrome://tracing, Perfetto).
+"""
+
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any
+
+from multi_agent.analytics.chrome_trace import complete_event, write_chrome_trace
+
+MAIN_TRACK = "main"
+
+
+class PhaseStats:
+    """Fenêtre glissante des durées (ns) d'une phase"""
+
+    def __init__(self, window: int = 300):
+        self.durations: deque = deque(maxlen=window)
+        self.total_calls = 0
+
+    def add(self, duration_ns: int):
+        self.durations.append(duration_ns)
+        self.total_calls += 1
+
+    def copy(self) -> 'PhaseStats':
+        """Copie figée de la fenêtre (à prendre sous le verrou du profileur)"""
+        stats = PhaseStats(self.durations.maxlen)
+        stats.durations.extend(list(self.durations))
+        stats.total_calls = self.total_calls
+        return stats
+
+    @property
+    def mean_ms(self) -> float:
+        if not self.durations:
+            return 0.0
+        return sum(self.durations) / len(self.durations) / 1e6
+
+    def percentile_ms(self, q: float) -> float:
+        """Percentile (0-100) sur la fenêtre courante"""
+        if not self.durations:
+            return 0.0
+        ordered = sorted(self.durations)
+        idx = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return ordered[idx] / 1e6
+
+    @property
+    def max_ms(self) -> float:
+        return max(self.durations) / 1e6 if self.durations else 0.0
+
+    def histogram(self, bins: int = 12, base_ns: int = 1000) -> List[int]:
+        """
+        Histogramme logarithmique (base 2) à partir de base_ns (1 µs)
+        bin 0: < 2µs, bin 1: < 4µs, ... dernier bin: tout le reste
+        """
+        counts = [0] * bins
+        for d in self.durations:
+            b = max(0, int(d // base_ns).bit_length() - 1) if d >= base_ns else 0
+            counts[min(b, bins - 1)] += 1
+        return counts
+
+
+class TickProfiler:
+    """
+    Instrumentation légère de la boucle de jeu
+
+    Usage:
+        with profiler.span("allocate_tasks"):
+            ...
+        with profiler.span("agent.update", track="agent 0"):
+            ...
+    """
+
+    def __init__(self, enabled: bool = True, window: int = 300, max_events: int = 200_000):
+        self.enabled = enabled
+        self.window = window
+        self.phases: Dict[str, PhaseStats] = {}
+        self.events: deque = deque(maxlen=max_events)
+        self.tracks: Dict[str, int] = {MAIN_TRACK: 1}
+        self.show_overlay = False
+        self.origin_ns = time.perf_counter_ns()
+        self.tick = 0
+        self._lock = threading.Lock()  # spans des threads d'agents, de simulation et de rendu
+
+    # ----------------------------------------------------------------------
+    # Spans
+    # ----------------------------------------------------------------------
+
+    def _track_id(self, track: str) -> int:
+        tid = self.tracks.get(track)
+        if tid is None:
+            tid = len(self.tracks) + 1
+            self.tracks[track] = tid
+        return tid
+
+    @contextmanager
+    def span(self, name: str, track: str = MAIN_TRACK, **args):
+        """Mesure la durée du bloc et l'enregistre"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self.record(name, start, end - start, track, args)
+
+    def record(self, name: str, start_ns: int, duration_ns: int,
+               track: str = MAIN_TRACK, args: Optional[Dict[str, Any]] = None):
+        """Enregistre un span déjà mesuré"""
+        with self._lock:
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = PhaseStats(self.window)
+            stats.add(duration_ns)
+            self.events.append((name, start_ns, duration_ns, self._track_id(track), args))
+
+    def begin_tick(self):
+        self.tick += 1
+
+    def snapshot(self) -> Dict[str, PhaseStats]:
+        """Copie des fenêtres par phase, lisible pendant que d'autres threads enregistrent"""
+        with self._lock:
+            return {name: stats.copy() for name, stats in self.phases.items()}
+
+    # ----------------------------------------------------------------------
+    # Rapports
+    # ----------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Statistiques par phase sur la fenêtre glissante"""
+        return {
+            name: {
+                'mean_ms': stats.mean_ms,
+                'p50_ms': stats.percentile_ms(50),
+                'p95_ms': stats.percentile_ms(95),
+                'max_ms': stats.max_ms,
+                'calls': stats.total_calls,
+            }
+            for name, stats in self.snapshot().items()
+        }
+
+    def print_summary(self):
+        """Affiche les statistiques par phase"""
+        print("\n⏱️  PROFIL PAR PHASE (fenêtre glissante):")
+        for name, s in sorted(self.summary().items(), key=lambda kv: -kv[1]['mean_ms']):
+            print(f"  {name:24} moy {s['mean_ms']:7.3f}ms  p95 {s['p95_ms']:7.3f}ms  "
+                  f"max {s['max_ms']:7.3f}ms  ({s['calls']} appels)")
+
+    def export_chrome_trace(self, filename: str = "profile_trace.json"):
+        """Exporte les spans enregistrés au format Chrome Trace JSON"""
+        with self._lock:
+            recorded = list(self.events)
+            track_names = {tid: track for track, tid in self.tracks.items()}
+        events = [
+            complete_event(name, (start - self.origin_ns) / 1000, duration / 1000,
+                           tid, category="profile", args=args)
+            for name, start, duration, tid, args in recorded
+        ]
+        write_chrome_trace(filename, events, track_names, process_name="Overcooked profiler")
+        print(f"✅ Trace de profilage exportée vers {filename} ({len(events)} spans)")
+
+    # ----------------------------------------------------------------------
+    # Overlay
+    # ----------------------------------------------------------------------
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+
+    def draw_overlay(self, screen, font, origin=(8, 8)):
+        """Dessine les temps par phase et leur histogramme, retourne la zone dessinée"""
+        if not self.show_overlay or not self.phases:
+            return None
+        import pygame
+
+        phases = self.snapshot()
+        names = sorted(phases)
+        line_h = 18
+        bins = 12
+        width, height = 430, 10 + line_h * (len(names) + 1)
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((20, 20, 20, 190))
+        screen.blit(panel, origin)
+
+        x0, y0 = origin
+        title = font.render(f"tick {self.tick}   moy / p95 (ms)", True, (230, 230, 230))
+        screen.blit(title, (x0 + 6, y0 + 4))
+        for i, name in enumerate(names):
+            stats = phases[name]
+            y = y0 + 4 + line_h * (i + 1)
+            txt = font.render(f"{name[:20]:20} {stats.mean_ms:6.2f} {stats.percentile_ms(95):6.2f}",
+                              True, (230, 230, 230))
+            screen.blit(txt, (x0 + 6, y))
+            counts = stats.histogram(bins)
+            peak = max(counts) or 1
+            for b, count in enumerate(counts):
+                h = int((line_h - 4) * count / peak)
+                if h:
+                    pygame.draw.rect(screen, (90, 200, 120),
+                                     (x0 + 300 + b * 10, y + line_h - 4 - h, 8, h))
+        return pygame.Rect(origin, (width, height))
+
+    def __repr__(self) -> str:
+        return f"TickProfiler(phases={len(self.phases)}, events={len(self.events)})"
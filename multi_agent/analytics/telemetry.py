@@ -0,0 +1,239 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+Enregistreur de télémétrie par tick (format colonnes NumPy)
+
+Contrairement à PerformanceMetrics qui écrase agent_stats à chaque frame,
+le TelemetryRecorder conserve l'historique complet de la simulation:
+- Positions, action courante, tâche et objet porté de chaque agent
+- Occupation de chaque outil (planches, poêles)
+- Longueurs des files (commandes, tâches disponibles, tâches restantes)
+
+Les colonnes sont stockées dans des buffers NumPy préalloués par blocs
+(chunks): aucun objet Python n'est créé par tick, ce qui permet d'analyser
+des runs de 10^6 ticks. Export en .npz ou en fichiers .npy memory-mappés.
+"""
+
+import json
+from typing import Dict, List, Any
+
+import numpy as np
+
+from common.objects import Ingredient, Dish, Tool
+
+
+# Codes des types de tâches (colonne agent_task), -1 = aucune tâche
+TASK_CODES = {
+    "pickup": 0,
+    "cut": 1,
+    "cook": 2,
+    "bring_to_assembly": 3,
+    "deliver": 4,
+    "wait": 5,
+}
+
+
+class TelemetryRecorder:
+    """
+    Enregistre l'état de la simulation à chaque tick dans des colonnes NumPy
+
+    Les chaînes (actions, objets portés) sont internées dans un vocabulaire
+    commun et stockées sous forme de codes int16. Le code 0 correspond à la
+    chaîne vide (rien porté / pas d'action).
+    """
+
+    def __init__(self, num_agents: int, tool_positions: List[tuple],
+                 chunk_size: int = 4096):
+        self.num_agents = num_agents
+        self.tool_positions = [tuple(p) for p in tool_positions]
+        self.num_tools = len(self.tool_positions)
+        self.chunk_size = chunk_size
+
+        # Vocabulaire des chaînes internées ("" = code 0)
+        self.vocab: List[str] = [""]
+        self._vocab_index: Dict[str, int] = {"": 0}
+
+        # Blocs remplis + bloc courant
+        self._chunks: List[Dict[str, np.ndarray]] = []
+        self._current = self._allocate_chunk()
+        self._cursor = 0
+        self.length = 0
+
+    @classmethod
+    def for_kitchen(cls, kitchen, num_agents: int, chunk_size: int = 4096) -> 'TelemetryRecorder':
+        """Crée un enregistreur pour les outils présents dans la grille"""
+        tool_positions = []
+        for y in range(kitchen.height):
+            for x in range(kitchen.width):
+                if isinstance(kitchen.grid[y][x], Tool):
+                    tool_positions.append((x, y))
+        return cls(num_agents, tool_positions, chunk_size)
+
+    # ----------------------------------------------------------------------
+    # Buffers
+    # ----------------------------------------------------------------------
+
+    def _allocate_chunk(self) -> Dict[str, np.ndarray]:
+        """Alloue un nouveau bloc de colonnes"""
+        n, a, t = self.chunk_size, self.num_agents, self.num_tools
+        return {
+            'tick': np.zeros(n, dtype=np.int64),
+            'agent_x': np.zeros((n, a), dtype=np.int16),
+            'agent_y': np.zeros((n, a), dtype=np.int16),
+            'agent_action': np.zeros((n, a), dtype=np.int16),
+            'agent_task': np.full((n, a), -1, dtype=np.int8),
+            'agent_holding': np.zeros((n, a), dtype=np.int16),
+            'tool_occupied': np.zeros((n, t), dtype=np.bool_),
+            'order_queue_len': np.zeros(n, dtype=np.int32),
+            'available_tasks': np.zeros(n, dtype=np.int32),
+            'pending_tasks': np.zeros(n, dtype=np.int32),
+        }
+
+    def _intern(self, text: str) -> int:
+        """Retourne le code d'une chaîne (l'ajoute au vocabulaire si besoin)"""
+        code = self._vocab_index.get(text)
+        if code is None:
+            code = len(self.vocab)
+            self.vocab.append(text)
+            self._vocab_index[text] = code
+        return code
+
+    @staticmethod
+    def _holding_key(holding) -> str:
+        """Nom canonique de l'objet porté"""
+        if holding is None:
+            return ""
+        if isinstance(holding, Ingredient):
+            return f"{holding.name}_{holding.state}"
+        if isinstance(holding, Dish):
+            return f"dish_{holding.recipe_name}"
+        return type(holding).__name__
+
+    # ----------------------------------------------------------------------
+    # Enregistrement
+    # ----------------------------------------------------------------------
+
+    def record(self, tick: int, agents: List[Any], grid, order_queue_len: int = 0,
+               task_market=None):
+        """Ajoute une ligne (un tick) aux colonnes"""
+        if self._cursor == self.chunk_size:
+            self._chunks.append(self._current)
+            self._current = self._allocate_chunk()
+            self._cursor = 0
+
+        c = self._current
+        i = self._cursor
+        c['tick'][i] = tick
+
+        for a, agent in enumerate(agents[:self.num_agents]):
+            c['agent_x'][i, a] = agent.position[0]
+            c['agent_y'][i, a] = agent.position[1]
+            c['agent_action'][i, a] = self._intern(str(agent.current_action))
+            c['agent_holding'][i, a] = self._intern(self._holding_key(agent.holding))
+            task = getattr(agent, 'current_task', None)
+            if task is not None:
+                c['agent_task'][i, a] = TASK_CODES.get(task.action_type.value, -1)
+            else:
+                c['agent_task'][i, a] = -1
+
+        for t, (x, y) in enumerate(self.tool_positions):
+            cell = grid[y][x]
+            c['tool_occupied'][i, t] = isinstance(cell, Tool) and cell.occupied
+
+        c['order_queue_len'][i] = order_queue_len
+        if task_market is not None:
+            stats = task_market.get_completion_stats()
+            c['available_tasks'][i] = stats['available']
+            c['pending_tasks'][i] = stats['total'] - stats['completed']
+        else:
+            c['available_tasks'][i] = 0
+            c['pending_tasks'][i] = 0
+
+        self._cursor += 1
+        self.length += 1
+
+    def record_game(self, game):
+        """Raccourci: enregistre l'état courant d'un MultiAgentOvercookedGame"""
+        self.record(game.tick, game.agents, game.kitchen.grid,
+                    len(game.order_queue), game.task_market)
+
+    # ----------------------------------------------------------------------
+    # Lecture / export
+    # ----------------------------------------------------------------------
+
+    def column(self, name: str) -> np.ndarray:
+        """Retourne une colonne complète (concaténation des blocs)"""
+        parts = [chunk[name] for chunk in self._chunks]
+        parts.append(self._current[name][:self._cursor])
+        return np.concatenate(parts) if len(parts) > 1 else parts[0].copy()
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Retourne toutes les colonnes"""
+        return {name: self.column(name) for name in self._current}
+
+    def _metadata(self) -> Dict[str, Any]:
+        return {
+            'num_agents': self.num_agents,
+            'tool_positions': self.tool_positions,
+            'length': self.length,
+            'vocab': self.vocab,
+            'task_codes': TASK_CODES,
+        }
+
+    def save_npz(self, filename: str = "telemetry.npz", compressed: bool = True):
+        """Exporte toutes les colonnes dans une archive .npz"""
+        data = self.columns()
+        data['vocab'] = np.array(self.vocab, dtype=str)
+        data['tool_positions'] = np.array(self.tool_positions, dtype=np.int16).reshape(-1, 2)
+        saver = np.savez_compressed if compressed else np.savez
+        saver(filename, **data)
+        print(f"✅ Télémétrie exportée vers {filename} ({self.length} ticks)")
+
+    def save_memmap(self, directory: str):
+        """
+        Exporte chaque colonne en .npy (lisible avec mmap_mode='r')
+        accompagné d'un fichier meta.json contenant le vocabulaire
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in self._current:
+            shape = (self.length,) + self._current[name].shape[1:]
+            out = np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"), mode='w+',
+                                            dtype=self._current[name].dtype, shape=shape)
+            start = 0
+            for chunk in self._chunks:
+                out[start:start + self.chunk_size] = chunk[name]
+                start += self.chunk_size
+            out[start:self.length] = self._current[name][:self._cursor]
+            out.flush()
+            del out
+        with open(os.path.join(directory, "meta.json"), 'w') as f:
+            json.dump(self._metadata(), f)
+        print(f"✅ Télémétrie exportée vers {directory}/ ({self.length} ticks)")
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"TelemetryRecorder(ticks={self.length}, agents={self.num_agents}, tools={self.num_tools})"
+
+
+def load_telemetry(path: str, mmap: bool = True) -> Dict[str, Any]:
+    """
+    Charge une télémétrie exportée (.npz ou dossier memory-mappé)
+    Retourne un dict {colonne: array, 'vocab': [...], ...}
+    """
+    if os.path.isdir(path):
+        with open(os.path.join(path, "meta.json")) as f:
+            data: Dict[str, Any] = json.load(f)
+        for filename in os.listdir(path):
+            if filename.endswith(".npy"):
+                data[filename[:-4]] = np.load(os.path.join(path, filename),
+                                              mmap_mode='r' if mmap else None)
+        return data
+
+    with np.load(path, allow_pickle=False) as archive:
+        data = {name: archive[name] for name in archive.files}
+    data['vocab'] = [str(v) for v in data['vocab']]
+    return data
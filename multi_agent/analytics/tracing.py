@@ -0,0 +1,231 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+Traçage du cycle de vie des tâches (timeline Perfetto / Chrome Trace)
+
+Transforme l'exécution de la simulation en spans sur une timeline:
+- Une piste par agent pour ses tâches (PICKUP, CUT, ...), doublée d'une piste
+  d'activité (déplacement, attente, traitement, inactivité)
+- Une piste par instance d'outil (planche, poêle): périodes d'utilisation
+- Une piste "commandes": durée de chaque commande
+
+Le temps est exprimé en ticks de simulation (100 ms par tick à 10 FPS),
+ce qui rend les traces comparables entre runs graphiques et headless.
+"""
+
+from typing import Dict, List, Optional, Tuple, Any
+
+from common.objects import Tool
+from multi_agent.analytics.chrome_trace import complete_event, write_chrome_trace
+
+# Activités d'un agent sur un tick
+IDLE = "idle"
+MOVE = "move"
+WAIT = "wait"
+PROCESS = "process"
+
+
+class TaskTracer:
+    """
+    Observe la simulation tick par tick et produit des spans
+
+    Appeler observe(game) une fois par tick, après la mise à jour des agents.
+    """
+
+    def __init__(self, tick_duration_ms: float = 100.0):
+        self.tick_us = tick_duration_ms * 1000.0
+        self.events: List[Dict[str, Any]] = []
+        self.track_names: Dict[int, str] = {}
+        self._track_ids: Dict[str, int] = {}
+
+        # État courant par agent: (activité, tick de début)
+        self._activity: Dict[int, Tuple[str, int]] = {}
+        self._last_pos: Dict[int, Tuple[int, int]] = {}
+        # Tâches ouvertes: (order_id, task_id) -> (agent_id, tick de début, nom)
+        self._open_tasks: Dict[Tuple[int, int], Tuple[int, int, str]] = {}
+        self._closed_tasks = set()
+        # Outils occupés: position -> tick de début
+        self._tool_busy: Dict[Tuple[int, int], int] = {}
+        self._tool_labels: Dict[Tuple[int, int], str] = {}
+        # Commandes ouvertes: order_id -> (tick de début, recette)
+        self._open_orders: Dict[int, Tuple[int, str]] = {}
+
+        # Cumuls pour le résumé (en ticks)
+        self.activity_ticks: Dict[int, Dict[str, int]] = {}
+        self.tool_busy_ticks: Dict[Tuple[int, int], int] = {}
+        self.observed_ticks = 0
+        self.last_tick = 0
+
+    # ----------------------------------------------------------------------
+    # Pistes
+    # ----------------------------------------------------------------------
+
+    def _track(self, name: str) -> int:
+        tid = self._track_ids.get(name)
+        if tid is None:
+            tid = len(self._track_ids) + 1
+            self._track_ids[name] = tid
+            self.track_names[tid] = name
+        return tid
+
+    def _span(self, track: str, name: str, start_tick: int, end_tick: int,
+              category: str, args: Optional[Dict[str, Any]] = None):
+        if end_tick <= start_tick:
+            return
+        self.events.append(complete_event(
+            name, start_tick * self.tick_us, (end_tick - start_tick) * self.tick_us,
+            self._track(track), category=category, args=args
+        ))
+
+    def register_tools(self, kitchen):
+        """Crée une piste par outil présent dans la grille"""
+        for y in range(kitchen.height):
+            for x in range(kitchen.width):
+                cell = kitchen.grid[y][x]
+                if isinstance(cell, Tool):
+                    label = f"{cell.tool_type} ({x},{y})"
+                    self._tool_labels[(x, y)] = label
+                    self.tool_busy_ticks.setdefault((x, y), 0)
+                    self._track(label)
+
+    # ----------------------------------------------------------------------
+    # Observation
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def _classify(agent, moved: bool) -> str:
+        if agent.action_timer > 0 or agent.processing_action:
+            return PROCESS
+        if moved:
+            return MOVE
+        if agent.current_task is None:
+            return IDLE
+        return WAIT
+
+    def observe(self, game):
+        """Enregistre le tick qui vient d'être simulé (game.tick - 1)"""
+        if not self._tool_labels:
+            self.register_tools(game.kitchen)
+        start, end = game.tick - 1, game.tick
+        self.observed_ticks += 1
+        self.last_tick = end
+
+        self._observe_orders(game, start)
+        self._observe_tasks(game, start, end)
+        self._observe_agents(game, start)
+        self._observe_tools(game.kitchen, start)
+
+    def _observe_orders(self, game, start: int):
+        order_id = game.current_order_id
+        if game.current_order and order_id is not None and order_id not in self._open_orders:
+            self._open_orders[order_id] = (start, game.current_order)
+        for oid in list(self._open_orders):
+            order = game.metrics.get_order_metrics(oid)
+            if order is not None and order.is_completed:
+                self._close_order(oid, start)
+
+    def _close_order(self, order_id: int, end: int):
+        begin, recipe = self._open_orders.pop(order_id)
+        self._span("commandes", f"{recipe} #{order_id}", begin, end, "order",
+                   {'order_id': order_id, 'recipe': recipe})
+
+    def _observe_tasks(self, game, start: int, end: int):
+        market = game.task_market
+        if market is None:
+            return
+        order_id = game.current_order_id
+        for task in market.tasks.values():
+            key = (order_id, task.task_id)
+            if key in self._closed_tasks:
+                continue
+            status = task.status.value
+            if key not in self._open_tasks and task.assigned_agent is not None and status != "available":
+                name = task.action_type.value
+                param = task.parameters.get('ingredient') or task.parameters.get('recipe')
+                if param:
+                    name = f"{name}({param})"
+                self._open_tasks[key] = (task.assigned_agent, start, name)
+            if key in self._open_tasks and status == "completed":
+                agent_id, begin, name = self._open_tasks.pop(key)
+                self._closed_tasks.add(key)
+                self._span(f"agent {agent_id}", name, begin, end, "task",
+                           {'order_id': order_id, 'task_id': task.task_id,
+                            'start_time': task.start_time, 'completion_time': task.completion_time})
+
+    def _observe_agents(self, game, start: int):
+        for agent in game.agents:
+            pos = tuple(agent.position)
+            moved = self._last_pos.get(agent.id, pos) != pos
+            self._last_pos[agent.id] = pos
+            activity = self._classify(agent, moved)
+
+            counts = self.activity_ticks.setdefault(agent.id, {IDLE: 0, MOVE: 0, WAIT: 0, PROCESS: 0})
+            counts[activity] += 1
+
+            current = self._activity.get(agent.id)
+            if current is None or current[0] != activity:
+                if current is not None:
+                    self._close_activity(agent.id, start)
+                self._activity[agent.id] = (activity, start)
+
+    def _close_activity(self, agent_id: int, end: int):
+        activity, begin = self._activity.pop(agent_id)
+        self._span(f"agent {agent_id} · activité", activity, begin, end, "activity")
+
+    def _observe_tools(self, kitchen, start: int):
+        for pos, label in self._tool_labels.items():
+            cell = kitchen.grid[pos[1]][pos[0]]
+            busy = isinstance(cell, Tool) and cell.occupied
+            if busy:
+                self.tool_busy_ticks[pos] += 1
+                if pos not in self._tool_busy:
+                    self._tool_busy[pos] = start
+            elif pos in self._tool_busy:
+                self._close_tool(pos, start)
+
+    def _close_tool(self, pos: Tuple[int, int], end: int):
+        begin = self._tool_busy.pop(pos)
+        self._span(self._tool_labels[pos], "occupé", begin, end, "tool")
+
+    # ----------------------------------------------------------------------
+    # Export
+    # ----------------------------------------------------------------------
+
+    def flush(self):
+        """Ferme tous les spans encore ouverts au dernier tick observé"""
+        end = self.last_tick
+        for agent_id in list(self._activity):
+            self._close_activity(agent_id, end)
+        for pos in list(self._tool_busy):
+            self._close_tool(pos, end)
+        for key in list(self._open_tasks):
+            agent_id, begin, name = self._open_tasks.pop(key)
+            self._span(f"agent {agent_id}", name, begin, end, "task", {'unfinished': True})
+        for order_id in list(self._open_orders):
+            self._close_order(order_id, end)
+
+    def summary(self) -> Dict[str, Any]:
+        """Répartition des activités par agent et taux d'utilisation des outils"""
+        total = max(1, self.observed_ticks)
+        return {
+            'agents': {
+                agent_id: {activity: count / total for activity, count in counts.items()}
+                for agent_id, counts in self.activity_ticks.items()
+            },
+            'tools': {
+                self._tool_labels[pos]: busy / total
+                for pos, busy in self.tool_busy_ticks.items()
+            },
+        }
+
+    def export_perfetto(self, filename: str = "task_trace.json"):
+        """Exporte la timeline (JSON Chrome Trace, ouvrable dans Perfetto)"""
+        self.flush()
+        write_chrome_trace(filename, self.events, self.track_names,
+                           process_name="Overcooked tâches")
+        print(f"✅ Timeline des tâches exportée vers {filename} ({len(self.events)} spans)")
+
+    def __repr__(self) -> str:
+        return f"TaskTracer(ticks={self.observed_ticks}, spans={len(self.events)})"
@@ -0,0 +1,163 @@
+"""
+multi_agent/async_loop.py
+Pilote asyncio: plusieurs cuisines (et leurs agents) sur une seule boucle d'événements
+
+AsyncKitchen fait avancer un MultiAgentOvercookedGame sans thread ni
+fenêtre: chaque tick est une coroutine (game.update_steps) qui rend la main
+à la boucle après chaque agent. Les coroutines prêtes passant à tour de
+rôle (file FIFO d'asyncio), des centaines de cuisines partagent la boucle à
+raison d'une mise à jour d'agent chacune par tour.
+
+Les commandes arrivent par une asyncio.Queue (AsyncKitchen.orders): une
+cuisine sans commande attend la suivante sans consommer de temps.
+
+AsyncBlackboard rend les lectures / écritures du blackboard attendables.
+Avec un RemoteBlackboard, les lectures réseau passent par un thread
+(asyncio.to_thread): avant chaque tick, la cuisine attend un instantané des
+états (sync), puis ses agents le lisent sans bloquer la boucle
+(read_timeout = 0 pendant le tick).
+
+Les spans englobants du profileur (update, agents_update) comptent aussi
+le temps passé dans les autres cuisines entre deux agents.
+"""
+
+import sys
+import os
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from multi_agent.coordination.communication import MessageType
+from multi_agent.coordination.net_blackboard import RemoteBlackboard
+
+
+class AsyncBlackboard:
+    """
+    Façade attendable d'un blackboard (Blackboard, SharedBlackboard ou RemoteBlackboard)
+
+    sync_timeout: attente maximale (s) d'un instantané des états dans sync()
+    (None: sans limite)
+    """
+
+    def __init__(self, blackboard, sync_timeout: Optional[float] = None):
+        self.blackboard = blackboard
+        self.sync_timeout = sync_timeout
+        self.remote = isinstance(blackboard, RemoteBlackboard)
+        if self.remote:
+            # Les lectures du tick utilisent l'instantané attendu par sync()
+            blackboard.read_timeout = 0.0
+
+    async def _read(self, fn, *args):
+        if self.remote:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def sync(self) -> bool:
+        """Envoie les écritures en tampon et attend un instantané des états; True si à jour"""
+        if not self.remote:
+            return True
+        return await asyncio.to_thread(self.blackboard.refresh, self.sync_timeout)
+
+    async def post_message(self, msg_type: MessageType, sender_id: Optional[int],
+                           receiver_id: Optional[int], content: Dict[str, Any], priority: int = 0):
+        return self.blackboard.post_message(msg_type, sender_id, receiver_id, content, priority)
+
+    async def update_agent_state(self, agent_id: int, state: Dict[str, Any]):
+        self.blackboard.update_agent_state(agent_id, state)
+
+    async def get_messages(self, receiver_id: Optional[int] = None,
+                           msg_type: Optional[MessageType] = None,
+                           since_timestamp: Optional[float] = None,
+                           limit: int = 100) -> List:
+        return await self._read(self.blackboard.get_messages, receiver_id, msg_type, since_timestamp, limit)
+
+    async def get_all_agent_states(self) -> Dict[int, Dict[str, Any]]:
+        if self.remote:
+            await self.sync()
+        return self.blackboard.get_all_agent_states()
+
+    async def get_agent_state(self, agent_id: int) -> Optional[Dict[str, Any]]:
+        return (await self.get_all_agent_states()).get(agent_id)
+
+
+class AsyncKitchen:
+    """
+    Une cuisine pilotée par la boucle asyncio
+
+    ticks_per_second: cadence maximale (0: aussi vite que possible)
+    yield_every: agents mis à jour entre deux passages de main
+    """
+
+    def __init__(self, game, ticks_per_second: float = 0.0, yield_every: int = 1,
+                 sync_timeout: Optional[float] = None):
+        self.game = game
+        self.ticks_per_second = ticks_per_second
+        self.yield_every = max(1, yield_every)
+        self.blackboard = AsyncBlackboard(game.blackboard, sync_timeout)
+        self.orders: asyncio.Queue = asyncio.Queue()
+        self.ticks = 0
+        self.agent_steps = 0
+        self.stale_ticks = 0
+
+    def submit(self, *recipe_names: str):
+        """Ajoute une commande (une ou plusieurs recettes) sans attendre"""
+        self.orders.put_nowait(list(recipe_names))
+
+    def close(self):
+        """run() s'arrête une fois les commandes reçues terminées"""
+        self.orders.put_nowait(None)
+
+    def _ingest(self, recipe_names) -> bool:
+        """Transmet une commande au jeu; False pour la fin du flux"""
+        if recipe_names is None:
+            return False
+        for name in recipe_names:
+            self.game.add_recipe_to_order(name)
+        self.game.send_orders()
+        return True
+
+    async def step(self):
+        """Un tick du jeu, en rendant la main entre les agents"""
+        if not await self.blackboard.sync():
+            self.stale_ticks += 1
+        for _ in self.game.update_steps():
+            self.agent_steps += 1
+            if self.agent_steps % self.yield_every == 0:
+                await asyncio.sleep(0)
+        self.ticks += 1
+        await asyncio.sleep(0)
+
+    async def run(self, max_ticks: Optional[int] = None):
+        """Traite les commandes de la file jusqu'à close() (ou max_ticks ticks)"""
+        game = self.game
+        period = 1.0 / self.ticks_per_second if self.ticks_per_second > 0 else 0.0
+        next_tick = time.perf_counter()
+        open_stream = True
+        while game.running and (max_ticks is None or self.ticks < max_ticks):
+            # Commandes arrivées pendant le tick précédent
+            while open_stream and not self.orders.empty():
+                open_stream = self._ingest(self.orders.get_nowait())
+            if game.awaiting_recipe_choice:
+                if not open_stream:
+                    break
+                open_stream = self._ingest(await self.orders.get())
+                next_tick = time.perf_counter()
+                continue
+
+            await self.step()
+            if period:
+                next_tick += period
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    next_tick = time.perf_counter()  # en retard: pas de rattrapage en rafale
+        return self.ticks
+
+
+async def run_kitchens(kitchens: Iterable[AsyncKitchen], max_ticks: Optional[int] = None) -> List[int]:
+    """Fait tourner des cuisines ensemble sur la boucle courante; ticks de chacune"""
+    return await asyncio.gather(*(kitchen.run(max_ticks) for kitchen in kitchens))
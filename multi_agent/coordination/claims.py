@@ -0,0 +1,74 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+Interactions différées d'un tick: outils, table d'assemblage, comptoir
+
+Pendant agent.update(), les agents du jeu (defer_moves) ne modifient pas
+la cuisine partagée: ils voient tous l'état du début du tick et
+enregistrent
+- l'outil qu'ils veulent prendre (agent.intended_use)
+- leurs autres interactions (agent.deferred): rendre un outil, poser sur
+  la table d'assemblage, prendre le plat, livrer au comptoir
+
+ClaimResolver applique ensuite les interactions par ordre d'id, puis
+accorde chaque outil libre au plus prioritaire de ses demandeurs
+(DeadlockWatchdog.priority); les autres réessaient au tick suivant. Comme
+MoveResolver, le résultat ne dépend pas de l'ordre de mise à jour des
+agents, ni du mode séquentiel ou parallèle.
+"""
+
+from typing import Dict, List, Tuple
+
+from multi_agent.coordination.watchdog import DeadlockWatchdog
+
+Position = Tuple[int, int]
+
+
+class ClaimResolver:
+    """Accorde les outils demandés pendant le tick, sans dépendre de l'ordre des agents"""
+
+    def __init__(self):
+        self.claims = 0
+        self.conflicts = 0
+        self.refused = 0
+
+    def plan(self, agents) -> Tuple[List, List]:
+        """(agents qui obtiennent leur outil, agents refusés), sans rien modifier"""
+        by_tool: Dict[Position, List] = {}
+        for agent in agents:
+            if agent.intended_use is not None:
+                by_tool.setdefault(agent.intended_use[0], []).append(agent)
+
+        granted, refused = [], []
+        for (x, y), claimants in sorted(by_tool.items()):
+            tool = claimants[0].kitchen.grid[y][x]
+            if tool.occupied:
+                refused += claimants
+                continue
+            if len(claimants) > 1:
+                self.conflicts += 1
+            winner = max(claimants, key=DeadlockWatchdog.priority)
+            granted.append(winner)
+            refused += [a for a in claimants if a is not winner]
+        return granted, sorted(refused, key=lambda a: a.id)
+
+    def resolve(self, agents):
+        """Appelé par le jeu après la mise à jour de tous les agents, avant MoveResolver"""
+        for agent in sorted(agents, key=lambda a: a.id):
+            agent.apply_deferred()
+        granted, refused = self.plan(agents)
+        for agent in granted:
+            agent.commit_use()
+        for agent in refused:
+            agent.reject_use()
+        self.claims += len(granted)
+        self.refused += len(refused)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'claims': self.claims,
+            'claim_conflicts': self.conflicts,
+            'refused_claims': self.refused,
+        }
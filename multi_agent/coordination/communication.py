@@ -17,6 +17,7 @@ from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, field
 from enum import Enum
 import time
+import threading
 from collections import deque
 
 
@@ -46,7 +47,7 @@ class MessageType(Enum):
     EMERGENCY_STOP = "emergency_stop"       # Arrêt d'urgence
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """
     Message échangé entre agents ou avec le système central
@@ -80,6 +81,8 @@ class Blackboard:
     def __init__(self, max_messages: int = 1000):
         self.messages: deque = deque(maxlen=max_messages)
         self.message_counter = 0
+        # Agents mis à jour en parallèle: numérotation et états sans course
+        self._lock = threading.RLock()
         self.agent_states: Dict[int, Dict[str, Any]] = {}
         self.global_state: Dict[str, Any] = {
             'total_orders': 0,
@@ -93,17 +96,18 @@ class Blackboard:
         """
         Publie un message sur le tableau noir
         """
-        msg = Message(
-            msg_id=self.message_counter,
-            msg_type=msg_type,
-            sender_id=sender_id,
-            receiver_id=receiver_id,
-            timestamp=time.time(),
-            content=content,
-            priority=priority
-        )
-        self.messages.append(msg)
-        self.message_counter += 1
+        with self._lock:
+            msg = Message(
+                msg_id=self.message_counter,
+                msg_type=msg_type,
+                sender_id=sender_id,
+                receiver_id=receiver_id,
+                timestamp=time.time(),
+                content=content,
+                priority=priority
+            )
+            self.messages.append(msg)
+            self.message_counter += 1
         return msg
 
     def get_messages(self, receiver_id: Optional[int] = None,
@@ -120,8 +124,10 @@ class Blackboard:
             limit: Nombre maximum de messages à retourner
         """
         filtered_messages = []
+        with self._lock:
+            messages = list(self.messages)
 
-        for msg in reversed(self.messages):  # Plus récents d'abord
+        for msg in reversed(messages):  # Plus récents d'abord
             # Filtrage par timestamp
             if since_timestamp and msg.timestamp < since_timestamp:
                 continue
@@ -150,10 +156,11 @@ class Blackboard:
 
     def update_agent_state(self, agent_id: int, state: Dict[str, Any]):
         """Met à jour l'état d'un agent sur le tableau"""
-        if agent_id not in self.agent_states:
-            self.agent_states[agent_id] = {}
-        self.agent_states[agent_id].update(state)
-        self.agent_states[agent_id]['last_update'] = time.time()
+        with self._lock:
+            if agent_id not in self.agent_states:
+                self.agent_states[agent_id] = {}
+            self.agent_states[agent_id].update(state)
+            self.agent_states[agent_id]['last_update'] = time.time()
 
     def get_agent_state(self, agent_id: int) -> Optional[Dict[str, Any]]:
         """Récupère l'état d'un agent"""
@@ -161,7 +168,8 @@ class Blackboard:
 
     def get_all_agent_states(self) -> Dict[int, Dict[str, Any]]:
         """Récupère les états de tous les agents"""
-        return self.agent_states.copy()
+        with self._lock:
+            return self.agent_states.copy()
 
     def update_global_state(self, updates: Dict[str, Any]):
         """Met à jour l'état global du système"""
@@ -177,8 +185,9 @@ class Blackboard:
         cutoff_time = current_time - older_than_seconds
 
         # Filtrer les messages récents
-        recent_messages = [msg for msg in self.messages if msg.timestamp >= cutoff_time]
-        self.messages = deque(recent_messages, maxlen=self.messages.maxlen)
+        with self._lock:
+            recent_messages = [msg for msg in self.messages if msg.timestamp >= cutoff_time]
+            self.messages = deque(recent_messages, maxlen=self.messages.maxlen)
 
     def get_message_stats(self) -> Dict[str, int]:
         """Retourne des statistiques sur les messages"""
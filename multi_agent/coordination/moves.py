@@ -0,0 +1,95 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+Résolution simultanée des déplacements d'un tick
+
+Pendant agent.update(), les agents du jeu ne bougent pas: ils enregistrent
+le pas voulu (agent.intended_move) en voyant tous les mêmes positions, celles
+du début du tick. MoveResolver applique ensuite tous les pas en une fois:
+- conflit de sommet: plusieurs agents visent la même case, seul le plus
+  prioritaire (DeadlockWatchdog.priority) avance
+- échange: deux agents visent chacun la case de l'autre, aucun n'avance
+- case occupée par un agent qui reste sur place (ou dont le pas est refusé):
+  le pas est refusé, en cascade jusqu'à stabilité
+
+Suivre un agent qui libère sa case, ou tourner à plusieurs sur un cycle de
+cases, reste permis. Le résultat ne dépend pas de l'ordre de mise à jour
+des agents.
+"""
+
+from typing import Dict, List, Set, Tuple
+
+from multi_agent.coordination.watchdog import DeadlockWatchdog
+
+Position = Tuple[int, int]
+
+
+class MoveResolver:
+    """Applique les pas voulus par les agents, sans collision ni traversée"""
+
+    def __init__(self):
+        self.moves = 0
+        self.vertex_conflicts = 0
+        self.swap_conflicts = 0
+        self.blocked_moves = 0
+
+    def plan(self, agents) -> Tuple[List, List]:
+        """(agents qui avancent, agents dont le pas est refusé), sans rien modifier"""
+        position: Dict[int, Position] = {a.id: tuple(a.position) for a in agents}
+        wants = {a.id: a.intended_move for a in agents if a.intended_move is not None}
+        by_id = {a.id: a for a in agents}
+        rejected: Set[int] = set()
+
+        # Sommets: un seul agent par case visée
+        claims: Dict[Position, List[int]] = {}
+        for aid in sorted(wants):
+            claims.setdefault(wants[aid], []).append(aid)
+        for cell, ids in claims.items():
+            if len(ids) > 1:
+                winner = max(ids, key=lambda i: DeadlockWatchdog.priority(by_id[i]))
+                rejected.update(i for i in ids if i != winner)
+                self.vertex_conflicts += 1
+
+        # Échanges de cases
+        at = {p: i for i, p in position.items()}
+        for aid in sorted(wants):
+            other = at.get(wants[aid])
+            if other is not None and wants.get(other) == position[aid] and aid < other:
+                rejected.update((aid, other))
+                self.swap_conflicts += 1
+
+        # Cases tenues par un agent immobile: refus en cascade
+        changed = True
+        while changed:
+            changed = False
+            staying = {position[i] for i in position if i not in wants or i in rejected}
+            for aid in sorted(wants):
+                if aid not in rejected and wants[aid] in staying:
+                    rejected.add(aid)
+                    self.blocked_moves += 1
+                    changed = True
+
+        movers = [by_id[i] for i in sorted(wants) if i not in rejected]
+        return movers, [by_id[i] for i in sorted(rejected)]
+
+    def resolve(self, agents):
+        """Appelé par le jeu après la mise à jour de tous les agents"""
+        movers, refused = self.plan(agents)
+        for agent in movers:
+            agent.commit_move()
+        for agent in refused:
+            agent.reject_move()
+        self.moves += len(movers)
+        # Positions du prochain tick, identiques pour tous les agents
+        for agent in agents:
+            agent.communicator.update_position(agent.position[0], agent.position[1])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'moves': self.moves,
+            'vertex_conflicts': self.vertex_conflicts,
+            'swap_conflicts': self.swap_conflicts,
+            'blocked_moves': self.blocked_moves,
+        }
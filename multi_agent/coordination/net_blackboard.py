@@ -0,0 +1,583 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+Blackboard en réseau: serveur TCP / socket Unix et client pour AgentCommunicator
+
+BlackboardServer sert un Blackboard à plusieurs clients (un thread par
+connexion). RemoteBlackboard a l'API de Blackboard:
+- les écritures (messages, états d'agents) sont mises en tampon et partent
+  groupées dans une trame au premier besoin de lecture, ou quand le tampon
+  dépasse batch_bytes: une position publiée ne coûte pas d'aller-retour
+- une trame = longueur + numéro de lot + enregistrements (op + champs
+  binaires struct); le serveur répond à chaque lot (résultats des lectures,
+  dans l'ordre), ce qui sert aussi d'accusé de réception
+- Message en binaire: en-tête fixe (pack_message) et contenu clé -> valeur
+  typé (pack_content, JSON seulement pour les types inhabituels)
+
+Latence du transport: une lecture des états attend au plus read_timeout la
+réponse; au-delà, elle renvoie le dernier instantané reçu (complété par les
+écritures locales) et ne réattend pas tant que cette requête est en vol. La
+simulation ralentit donc au plus d'un read_timeout par aller-retour, avec
+des positions des autres agents en retard (MoveResolver tranche sur les
+vraies positions). transport_stats() donne latence et débit par type.
+"""
+
+import json
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from multi_agent.coordination.communication import Blackboard, Message, MessageType
+from multi_agent.coordination.shared_blackboard import STATUSES
+
+MESSAGE_TYPES = list(MessageType)
+
+FRAME = struct.Struct('<II')           # longueur du corps, numéro de lot
+MESSAGE = struct.Struct('<BqiiidH')    # type, id, émetteur, destinataire, priorité, date, taille du contenu
+STATE = struct.Struct('<iBBBiii')      # agent, champs présents, statut, a une position, x, y, tâche
+STATE_ROW = struct.Struct('<iBBiiid')  # agent, statut, a une position, x, y, tâche, date
+QUERY = struct.Struct('<iBdH')         # destinataire (-2: tous), type (255: tous), depuis, limite
+COUNT = struct.Struct('<I')
+
+OP_POST, OP_STATE, OP_GET_STATES, OP_GET_MESSAGES, OP_CLEAR, OP_STATS = range(1, 7)
+HAS_STATUS, HAS_POSITION, HAS_TASK = 1, 2, 4
+
+
+# ----------------------------------------------------------------------
+# Encodage
+# ----------------------------------------------------------------------
+def _pack_varint(value: int, out: bytearray):
+    """Entier signé en zigzag + varint (1 octet de -64 à 63)"""
+    value = (value << 1) ^ (value >> 63)
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _unpack_varint(data, offset: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (value >> 1) ^ -(value & 1), offset
+        shift += 7
+
+
+def pack_content(content: Dict[str, Any]) -> bytes:
+    """Contenu clé -> valeur: entiers (varint), flottants, textes et None en binaire, le reste en JSON"""
+    out = bytearray((len(content),))
+    for key, value in content.items():
+        name = key.encode()
+        out += bytes((len(name),)) + name
+        if value is None:
+            out += b'n'
+        elif isinstance(value, int) and not isinstance(value, bool) and -2 ** 63 <= value < 2 ** 63:
+            out += b'i'
+            _pack_varint(value, out)
+        elif isinstance(value, float):
+            out += b'f' + struct.pack('<d', value)
+        else:
+            tag, data = (b's', value.encode()) if isinstance(value, str) else (b'j', json.dumps(value).encode())
+            out += tag + struct.pack('<H', len(data)) + data
+    return bytes(out)
+
+
+def unpack_content(data, offset: int = 0) -> Tuple[Dict[str, Any], int]:
+    content = {}
+    count = data[offset]
+    offset += 1
+    for _ in range(count):
+        size = data[offset]
+        key = bytes(data[offset + 1:offset + 1 + size]).decode()
+        tag = data[offset + 1 + size]
+        offset += 2 + size
+        if tag == ord('n'):
+            value = None
+        elif tag == ord('i'):
+            value, offset = _unpack_varint(data, offset)
+        elif tag == ord('f'):
+            value = struct.unpack_from('<d', data, offset)[0]
+            offset += 8
+        else:
+            size = struct.unpack_from('<H', data, offset)[0]
+            raw = bytes(data[offset + 2:offset + 2 + size])
+            value = raw.decode() if tag == ord('s') else json.loads(raw)
+            offset += 2 + size
+        content[key] = value
+    return content, offset
+
+
+def pack_message(msg: Message) -> bytes:
+    content = pack_content(msg.content)
+    return MESSAGE.pack(MESSAGE_TYPES.index(msg.msg_type), msg.msg_id,
+                        -1 if msg.sender_id is None else msg.sender_id,
+                        -1 if msg.receiver_id is None else msg.receiver_id,
+                        msg.priority, msg.timestamp, len(content)) + content
+
+
+def unpack_message(data, offset: int = 0) -> Tuple[Message, int]:
+    code, msg_id, sender, receiver, priority, timestamp, _ = MESSAGE.unpack_from(data, offset)
+    content, offset = unpack_content(data, offset + MESSAGE.size)
+    return Message(msg_id, MESSAGE_TYPES[code], None if sender < 0 else sender,
+                   None if receiver < 0 else receiver, timestamp, content, priority), offset
+
+
+def _recv_exact(sock, size: int) -> Optional[bytes]:
+    chunks, remaining = [], size
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def _recv_frame(sock) -> Optional[Tuple[int, bytes]]:
+    head = _recv_exact(sock, FRAME.size)
+    if head is None:
+        return None
+    size, batch = FRAME.unpack(head)
+    body = _recv_exact(sock, size)
+    return None if body is None else (batch, body)
+
+
+# ----------------------------------------------------------------------
+# Serveur
+# ----------------------------------------------------------------------
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server.owner
+        sock = self.request
+        # Latence simulée: chaque réponse part latency après l'arrivée de son lot
+        delayed = queue.Queue() if server.latency else None
+        if delayed is not None:
+            threading.Thread(target=self._send_later, args=(delayed,), daemon=True).start()
+        try:
+            while True:
+                frame = _recv_frame(sock)
+                if frame is None:
+                    return
+                batch, body = frame
+                reply = server.apply(body)
+                data = FRAME.pack(len(reply), batch) + reply
+                if delayed is None:
+                    sock.sendall(data)
+                else:
+                    delayed.put((time.perf_counter() + server.latency, data))
+        except OSError:
+            return  # client déconnecté
+        finally:
+            if delayed is not None:
+                delayed.put(None)
+
+    def _send_later(self, delayed):
+        while True:
+            item = delayed.get()
+            if item is None:
+                return
+            due, data = item
+            time.sleep(max(0.0, due - time.perf_counter()))
+            try:
+                self.request.sendall(data)
+            except OSError:
+                return
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+class BlackboardServer:
+    """
+    Sert un Blackboard sur TCP (address: (hôte, port), port 0: libre) ou sur
+    une socket Unix (address: chemin). latency_ms: délai ajouté à chaque
+    réponse, pour simuler un réseau lent.
+    """
+
+    def __init__(self, address=('127.0.0.1', 0), blackboard: Optional[Blackboard] = None,
+                 latency_ms: float = 0.0):
+        self.blackboard = blackboard or Blackboard()
+        self.latency = latency_ms / 1000.0
+        server_class = _UnixServer if isinstance(address, str) else _TCPServer
+        self._server = server_class(address, _Handler)
+        self._server.owner = self
+        self.address = self._server.server_address
+        self._thread = threading.Thread(target=self._server.serve_forever, name="blackboard-server", daemon=True)
+        self._thread.start()
+
+    def apply(self, body: bytes) -> bytes:
+        """Applique les enregistrements d'un lot, renvoie les résultats des lectures"""
+        bb = self.blackboard
+        reply = bytearray()
+        view, offset = memoryview(body), 0
+        while offset < len(body):
+            op = body[offset]
+            offset += 1
+            if op == OP_POST:
+                msg, offset = unpack_message(view, offset)
+                bb.post_message(msg.msg_type, msg.sender_id, msg.receiver_id, msg.content, msg.priority)
+            elif op == OP_STATE:
+                agent_id, fields, status, has_position, x, y, task = STATE.unpack_from(body, offset)
+                offset += STATE.size
+                state = {}
+                if fields & HAS_STATUS:
+                    state['status'] = STATUSES[status]
+                if fields & HAS_POSITION:
+                    state['position'] = (x, y) if has_position else None
+                if fields & HAS_TASK:
+                    state['current_task'] = None if task < 0 else task
+                bb.update_agent_state(agent_id, state)
+            elif op == OP_GET_STATES:
+                states = bb.get_all_agent_states()
+                reply += COUNT.pack(len(states))
+                for agent_id, s in states.items():
+                    position = s.get('position')
+                    task = s.get('current_task')
+                    reply += STATE_ROW.pack(agent_id, STATUSES.index(s.get('status')), position is not None,
+                                            *(position or (0, 0)), -1 if task is None else task,
+                                            s.get('last_update', 0.0))
+            elif op == OP_GET_MESSAGES:
+                receiver, code, since, limit = QUERY.unpack_from(body, offset)
+                offset += QUERY.size
+                messages = bb.get_messages(None if receiver == -2 else receiver,
+                                           None if code == 255 else MESSAGE_TYPES[code], since or None, limit)
+                reply += COUNT.pack(len(messages))
+                for msg in messages:
+                    reply += pack_message(msg)
+            elif op == OP_CLEAR:
+                bb.clear_old_messages(struct.unpack_from('<d', body, offset)[0])
+                offset += 8
+            elif op == OP_STATS:
+                stats = bb.get_message_stats()
+                reply += struct.pack('<q', bb.message_counter) + COUNT.pack(stats['total'])
+                reply += b''.join(COUNT.pack(stats[t.value]) for t in MESSAGE_TYPES)
+            else:
+                raise ValueError(f"Opération inconnue: {op}")
+        return bytes(reply)
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+# ----------------------------------------------------------------------
+# Client
+# ----------------------------------------------------------------------
+class RemoteBlackboard:
+    """
+    Client d'un BlackboardServer, même API que Blackboard
+
+    read_timeout: attente maximale (s) d'une lecture des états avant de
+    renvoyer le dernier instantané (None: attend toujours la réponse)
+    batch_bytes: taille du tampon d'écritures qui déclenche un envoi
+    latency_window: latences gardées par type (fenêtre glissante des derniers lots)
+    """
+
+    def __init__(self, address, read_timeout: Optional[float] = None, batch_bytes: int = 16384,
+                 latency_window: int = 1000):
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.connect(address)
+        if family == socket.AF_INET:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.read_timeout = read_timeout
+        self.batch_bytes = batch_bytes
+        self.global_state: Dict[str, Any] = {
+            'total_orders': 0,
+            'completed_orders': 0,
+            'active_agents': set()
+        }
+
+        self._lock = threading.RLock()
+        self._replied = threading.Condition(self._lock)
+        self._pending = bytearray()
+        self._labels: List[str] = []                   # type de chaque enregistrement du lot en cours
+        self._reads: List[int] = []                    # opérations de lecture du lot en cours
+        self._batch = 0
+        self._in_flight: Dict[int, Tuple[float, List[str], List[int]]] = {}
+        self._results: Dict[int, List[Any]] = {}
+        self._closed = False
+
+        # États: dernier instantané reçu + écritures locales plus récentes
+        self._states: Dict[int, Dict[str, Any]] = {}
+        self._local: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+        self._states_batch: Optional[int] = None        # lecture des états en vol
+        self._states_seen = 0                           # lot de l'instantané reçu
+        self._late = False
+
+        self.stale_reads = 0
+        self._latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=latency_window))
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._bytes: Dict[str, int] = defaultdict(int)
+        self._started = time.perf_counter()
+
+        self._reader = threading.Thread(target=self._read_loop, name="blackboard-client", daemon=True)
+        self._reader.start()
+
+    # ----------------------------------------------------------------------
+    # Transport
+    # ----------------------------------------------------------------------
+    def _add(self, label: str, record: bytes, read: Optional[int] = None):
+        self._pending += record
+        self._labels.append(label)
+        self._counts[label] += 1
+        self._bytes[label] += len(record)
+        if read is not None:
+            self._reads.append(read)
+
+    def flush(self) -> Optional[int]:
+        """Envoie le lot en cours; renvoie son numéro (None si vide)"""
+        with self._lock:
+            if not self._pending:
+                return None
+            self._batch += 1
+            batch, body = self._batch, bytes(self._pending)
+            self._in_flight[batch] = (time.perf_counter(), self._labels, self._reads)
+            self._pending, self._labels, self._reads = bytearray(), [], []
+            self.sock.sendall(FRAME.pack(len(body), batch) + body)
+            return batch
+
+    def _maybe_flush(self):
+        if len(self._pending) >= self.batch_bytes:
+            self.flush()
+
+    def _read_loop(self):
+        while True:
+            try:
+                frame = _recv_frame(self.sock)
+            except OSError:
+                frame = None
+            with self._lock:
+                if frame is None:
+                    self._closed = True
+                    self._replied.notify_all()
+                    return
+                batch, body = frame
+                sent, labels, reads = self._in_flight.pop(batch)
+                elapsed = time.perf_counter() - sent
+                for label in labels:
+                    self._latencies[label].append(elapsed)
+                if batch == self._states_batch:
+                    self._states = self._decode_results(body, reads)[0]
+                    self._states_seen, self._states_batch = batch, None
+                    self._late = False
+                elif reads:
+                    self._results[batch] = self._decode_results(body, reads)
+                self._replied.notify_all()
+
+    @staticmethod
+    def _decode_results(body: bytes, reads: List[int]) -> List[Any]:
+        results, offset = [], 0
+        view = memoryview(body)
+        for op in reads:
+            if op == OP_GET_STATES:
+                count = COUNT.unpack_from(body, offset)[0]
+                offset += COUNT.size
+                states = {}
+                for _ in range(count):
+                    agent_id, status, has_position, x, y, task, last = STATE_ROW.unpack_from(body, offset)
+                    offset += STATE_ROW.size
+                    states[agent_id] = {'status': STATUSES[status], 'position': (x, y) if has_position else None,
+                                        'current_task': None if task < 0 else task, 'last_update': last}
+                results.append(states)
+            elif op == OP_GET_MESSAGES:
+                count = COUNT.unpack_from(body, offset)[0]
+                offset += COUNT.size
+                messages = []
+                for _ in range(count):
+                    msg, offset = unpack_message(view, offset)
+                    messages.append(msg)
+                results.append(messages)
+            elif op == OP_STATS:
+                counter, total = struct.unpack_from('<qI', body, offset)
+                offset += 12
+                counts = struct.unpack_from(f'<{len(MESSAGE_TYPES)}I', body, offset)
+                offset += 4 * len(MESSAGE_TYPES)
+                stats = {t.value: c for t, c in zip(MESSAGE_TYPES, counts)}
+                stats['total'] = total
+                results.append((counter, stats))
+        return results
+
+    def _request(self, label: str, op: int, body: bytes = b'') -> Any:
+        """Lecture bloquante: envoie le lot avec la requête et attend sa réponse"""
+        with self._lock:
+            self._add(label, bytes((op,)) + body, read=op)
+            batch = self.flush()
+            while batch not in self._results:
+                if self._closed:
+                    raise ConnectionError("Serveur du blackboard déconnecté")
+                self._replied.wait()
+            return self._results.pop(batch)[0]
+
+    def close(self):
+        with self._lock:
+            if not self._closed:
+                self.flush()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        self._reader.join(timeout=1.0)
+
+    # ----------------------------------------------------------------------
+    # Messages
+    # ----------------------------------------------------------------------
+    def post_message(self, msg_type: MessageType, sender_id: Optional[int],
+                     receiver_id: Optional[int], content: Dict[str, Any],
+                     priority: int = 0) -> Message:
+        """Message mis en tampon (msg_id: -1, numéroté par le serveur)"""
+        msg = Message(-1, msg_type, sender_id, receiver_id, time.time(), content, priority)
+        with self._lock:
+            self._add(msg_type.value, bytes((OP_POST,)) + pack_message(msg))
+            self._maybe_flush()
+        return msg
+
+    def get_messages(self, receiver_id: Optional[int] = None,
+                     msg_type: Optional[MessageType] = None,
+                     since_timestamp: Optional[float] = None,
+                     limit: int = 100) -> List[Message]:
+        query = QUERY.pack(-2 if receiver_id is None else receiver_id,
+                           255 if msg_type is None else MESSAGE_TYPES.index(msg_type),
+                           since_timestamp or 0.0, limit)
+        return self._request('get_messages', OP_GET_MESSAGES, query)
+
+    def get_latest_message(self, receiver_id: Optional[int] = None,
+                           msg_type: Optional[MessageType] = None) -> Optional[Message]:
+        messages = self.get_messages(receiver_id, msg_type, limit=1)
+        return messages[0] if messages else None
+
+    @property
+    def messages(self) -> List[Message]:
+        return self.get_messages(limit=2 ** 16 - 1)[::-1]
+
+    @property
+    def message_counter(self) -> int:
+        return self._request('get_stats', OP_STATS)[0]
+
+    def clear_old_messages(self, older_than_seconds: float = 60.0):
+        with self._lock:
+            self._add('clear', bytes((OP_CLEAR,)) + struct.pack('<d', older_than_seconds))
+
+    def get_message_stats(self) -> Dict[str, int]:
+        return self._request('get_stats', OP_STATS)[1]
+
+    # ----------------------------------------------------------------------
+    # États des agents
+    # ----------------------------------------------------------------------
+    def update_agent_state(self, agent_id: int, state: Dict[str, Any]):
+        """Écriture en tampon, visible tout de suite par ce client"""
+        fields, status, has_position, x, y, task = 0, 0, 0, 0, 0, -1
+        if 'status' in state:
+            fields |= HAS_STATUS
+            status = STATUSES.index(state['status'])
+        if 'position' in state:
+            fields |= HAS_POSITION
+            if state['position'] is not None:
+                has_position = 1
+                x, y = state['position']
+        if 'current_task' in state:
+            fields |= HAS_TASK
+            task = -1 if state['current_task'] is None else state['current_task']
+        unknown = set(state) - {'status', 'position', 'current_task'}
+        if unknown:
+            raise ValueError(f"Clés d'état non transmises: {sorted(unknown)}")
+        with self._lock:
+            self._add('agent_state', bytes((OP_STATE,)) + STATE.pack(agent_id, fields, status, has_position, x, y, task))
+            previous = self._local.get(agent_id, (0, {}))[1]
+            self._local[agent_id] = (self._batch + 1, dict(previous, **state, last_update=time.time()))
+            self._maybe_flush()
+
+    def _query_states(self):
+        """Envoie le lot en cours, avec une lecture des états si aucune n'est en vol"""
+        if self._states_batch is None:
+            self._add('get_states', bytes((OP_GET_STATES,)), read=OP_GET_STATES)
+            self._states_batch = self.flush()
+        elif self._pending:
+            self.flush()
+
+    def _wait_states(self, timeout: Optional[float]) -> bool:
+        """Attend la réponse à la lecture des états en vol; False si timeout dépassé"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self._states_batch is not None and not self._closed:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                return False
+            self._replied.wait(remaining)
+        return True
+
+    def refresh(self, timeout: Optional[float] = None) -> bool:
+        """Demande un instantané des états et attend sa réponse (au plus timeout s); True si reçu"""
+        with self._lock:
+            self._query_states()
+            return self._wait_states(timeout) and self._states_batch is None
+
+    def get_all_agent_states(self) -> Dict[int, Dict[str, Any]]:
+        """Dernier instantané du serveur, plus les écritures locales qu'il ne contient pas encore"""
+        with self._lock:
+            self._query_states()
+            if not self._late and not self._wait_states(self.read_timeout):
+                self._late = True
+            if self._states_batch is not None:
+                self.stale_reads += 1
+            states = {i: dict(s) for i, s in self._states.items()}
+            for agent_id, (batch, state) in self._local.items():
+                if batch > self._states_seen:
+                    states[agent_id] = dict(states.get(agent_id, {}), **state)
+            return states
+
+    def get_agent_state(self, agent_id: int) -> Optional[Dict[str, Any]]:
+        return self.get_all_agent_states().get(agent_id)
+
+    @property
+    def agent_states(self) -> Dict[int, Dict[str, Any]]:
+        return self.get_all_agent_states()
+
+    def update_global_state(self, updates: Dict[str, Any]):
+        self.global_state.update(updates)
+
+    def get_global_state(self) -> Dict[str, Any]:
+        return self.global_state.copy()
+
+    # ----------------------------------------------------------------------
+    # Mesures
+    # ----------------------------------------------------------------------
+    def transport_stats(self) -> Dict[str, Dict[str, float]]:
+        """Par type: nombre, octets, latence aller-retour du lot (ms, sur la fenêtre) et débit (par seconde)"""
+        with self._lock:
+            elapsed = max(time.perf_counter() - self._started, 1e-9)
+            stats = {}
+            for label, count in sorted(self._counts.items()):
+                latencies = np.asarray(self._latencies.get(label, ()), dtype=np.float64) * 1000.0
+                stats[label] = {
+                    'count': count,
+                    'bytes': self._bytes[label],
+                    'mean_ms': float(latencies.mean()) if latencies.size else 0.0,
+                    'p95_ms': float(np.percentile(latencies, 95)) if latencies.size else 0.0,
+                    'per_s': count / elapsed,
+                }
+            return stats
+
+    def __repr__(self) -> str:
+        return f"RemoteBlackboard({self.sock.getpeername()}, lots={self._batch})"
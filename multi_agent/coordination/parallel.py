@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+Mise à jour des agents d'un tick sur un pool de threads
+
+Les agents sont répartis en workers paquets (agent i dans le paquet
+i % workers); le thread du jeu traite le premier paquet pendant que le pool
+traite les autres, puis attend la fin de tous. Prérequis: déplacements et
+interactions différés (MoveResolver, ClaimResolver), pour que chaque agent
+décide sur l'état du début du tick: la partie est identique, tick pour
+tick, à la mise à jour séquentielle. Les états encore modifiés pendant la
+mise à jour sont protégés:
+- TaskMarket.lock, verrou du Blackboard, caches de champs de flux et de
+  graphes HPA*, TickProfiler
+- Kitchen.lock: notifications des observateurs
+
+Avec le GIL (CPython standard), les threads se relaient sur un seul coeur:
+le gain n'apparaît qu'avec un interpréteur sans GIL (CPython 3.13t et
+suivants).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ParallelAgentUpdater:
+    """Pool de threads réutilisé à chaque tick"""
+
+    def __init__(self, workers: int):
+        self.workers = max(1, int(workers))
+        self._pool = ThreadPoolExecutor(max_workers=self.workers - 1, thread_name_prefix="agents") \
+            if self.workers > 1 else None
+        self.ticks = 0
+
+    def update(self, agents, task_market, profiler):
+        """Équivalent de agent.update(task_market) pour chaque agent"""
+        batches = [agents[i::self.workers] for i in range(self.workers)]
+        futures = [self._pool.submit(self._run, batch, task_market, profiler)
+                   for batch in batches[1:] if batch] if self._pool else []
+        self._run(batches[0], task_market, profiler)
+        for future in futures:
+            future.result()  # relance une exception levée dans un thread
+        self.ticks += 1
+
+    @staticmethod
+    def _run(batch, task_market, profiler):
+        for agent in batch:
+            with profiler.span("agent.update", track=f"agent {agent.id}", agent=agent.id):
+                agent.update(task_market)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
@@ -0,0 +1,301 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+Blackboard en mémoire partagée, lisible depuis plusieurs processus
+
+Même API que Blackboard (AgentCommunicator l'utilise sans changement), sur
+un seul segment multiprocessing.shared_memory:
+- en-tête: numéro du prochain message
+- table des agents à disposition fixe (statut, position, tâche, horodatage),
+  une ligne par agent, écrite par cet agent seul
+- anneau de max_messages cases: en-tête du message + contenu encodé
+  (encode_content / decode_content, JSON compact de taille bornée)
+
+Les lectures se font sans copie: agent_table et ring sont des vues NumPy
+sur le segment; get_messages filtre l'anneau (destinataire, type, date)
+sur ces vues et ne décode que les messages retenus. Chaque ligne et chaque
+case porte un compteur de séquence (seqlock): impair pendant une écriture,
+le lecteur recommence si le compteur a changé. Les écritures de messages
+sont sérialisées par un multiprocessing.Lock partagé.
+
+global_state reste propre à chaque processus.
+"""
+
+import json
+import multiprocessing
+import time
+import weakref
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from multi_agent.coordination.communication import Message, MessageType
+
+MESSAGE_TYPES = list(MessageType)
+STATUSES = (None, 'moving', 'idle', 'busy')
+
+AGENT_DTYPE = np.dtype([
+    ('seq', '<u4'),
+    ('active', 'u1'),
+    ('status', 'u1'),
+    ('has_position', 'u1'),
+    ('x', '<i4'),
+    ('y', '<i4'),
+    ('current_task', '<i4'),     # -1: aucune
+    ('last_update', '<f8'),
+])
+
+HEADER_DTYPE = np.dtype([('next_id', '<i8')])
+
+
+def message_dtype(payload_size: int) -> np.dtype:
+    return np.dtype([
+        ('seq', '<u4'),
+        ('msg_id', '<i8'),           # -1: case vide
+        ('msg_type', 'u1'),
+        ('sender', '<i4'),           # -1: système
+        ('receiver', '<i4'),         # -1: broadcast
+        ('priority', '<i4'),
+        ('timestamp', '<f8'),
+        ('length', '<u2'),
+        ('payload', f'S{payload_size}'),
+    ])
+
+
+def encode_content(content: Dict[str, Any], payload_size: int) -> bytes:
+    """Contenu d'un message en JSON compact (ValueError si trop long)"""
+    data = json.dumps(content, separators=(',', ':')).encode()
+    if len(data) > payload_size:
+        raise ValueError(f"Contenu de message trop long ({len(data)} > {payload_size} octets)")
+    return data
+
+
+def decode_content(data: bytes) -> Dict[str, Any]:
+    return json.loads(data.decode()) if data else {}
+
+
+class SharedBlackboard:
+    """
+    Blackboard sur un segment de mémoire partagée
+
+    name: segment existant à rattacher (create=False), sinon nom du nouveau
+    segment (None: nom aléatoire). Le créateur supprime le segment avec
+    unlink(), ou quand l'objet disparaît. L'objet se transmet à un processus
+    fils (multiprocessing.Process(args=...)): le fils se rattache au segment.
+    """
+
+    def __init__(self, max_messages: int = 1000, max_agents: int = 64, payload_size: int = 120,
+                 name: Optional[str] = None, create: bool = True, lock=None):
+        self.max_messages = max_messages
+        self.max_agents = max_agents
+        self.payload_size = payload_size
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+
+        msg_dtype = message_dtype(payload_size)
+        table_offset = HEADER_DTYPE.itemsize
+        ring_offset = table_offset + max_agents * AGENT_DTYPE.itemsize
+        size = ring_offset + max_messages * msg_dtype.itemsize
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        self.name = self.shm.name
+        # Segment supprimé à la fin du créateur, même sans unlink() explicite
+        self._unlink = weakref.finalize(self, self.shm.unlink) if create else None
+
+        buf = self.shm.buf
+        self._header = np.ndarray(1, HEADER_DTYPE, buf, 0)
+        self.agent_table = np.ndarray(max_agents, AGENT_DTYPE, buf, table_offset)
+        self.ring = np.ndarray(max_messages, msg_dtype, buf, ring_offset)
+        if create:
+            self._header[0] = 0
+            self.agent_table[:] = 0
+            self.ring[:] = 0
+            self.ring['msg_id'] = -1
+
+        self.global_state: Dict[str, Any] = {
+            'total_orders': 0,
+            'completed_orders': 0,
+            'active_agents': set()
+        }
+
+    def __reduce__(self):
+        return (_attach, (self.name, self.max_messages, self.max_agents, self.payload_size, self.lock))
+
+    def close(self):
+        """Détache ce processus du segment (les vues NumPy deviennent invalides)"""
+        if self.ring is None:
+            return
+        self._header = self.agent_table = self.ring = None
+        self.shm.close()
+
+    def unlink(self):
+        """Supprime le segment (processus créateur); les processus rattachés gardent leur vue"""
+        if self._unlink is not None:
+            self._unlink()
+
+    # ----------------------------------------------------------------------
+    # Messages
+    # ----------------------------------------------------------------------
+    @property
+    def message_counter(self) -> int:
+        return int(self._header['next_id'][0])
+
+    def post_message(self, msg_type: MessageType, sender_id: Optional[int],
+                     receiver_id: Optional[int], content: Dict[str, Any],
+                     priority: int = 0) -> Message:
+        """Publie un message dans l'anneau (écrase le plus ancien)"""
+        data = encode_content(content, self.payload_size)
+        timestamp = time.time()
+        code = MESSAGE_TYPES.index(msg_type)
+        sender = -1 if sender_id is None else sender_id
+        receiver = -1 if receiver_id is None else receiver_id
+        with self.lock:
+            msg_id = int(self._header['next_id'][0])
+            i = msg_id % self.max_messages
+            seqs = self.ring['seq']
+            seq = int(seqs[i]) + 1
+            seqs[i] = seq
+            self.ring[i] = (seq, msg_id, code, sender, receiver, priority, timestamp, len(data), data)
+            seqs[i] = seq + 1
+            self._header['next_id'] = msg_id + 1
+        return Message(msg_id, msg_type, sender_id, receiver_id, timestamp, content, priority)
+
+    def _decode(self, i: int) -> Optional[Message]:
+        """Message de la case i, None si elle change pendant la lecture"""
+        seqs = self.ring['seq']
+        seq, msg_id, code, sender, receiver, priority, timestamp, length, payload = self.ring[i].item()
+        if seq & 1 or seqs[i] != seq or msg_id < 0:
+            return None
+        return Message(msg_id, MESSAGE_TYPES[code], None if sender < 0 else sender,
+                       None if receiver < 0 else receiver, timestamp, decode_content(payload[:length]), priority)
+
+    def get_messages(self, receiver_id: Optional[int] = None,
+                     msg_type: Optional[MessageType] = None,
+                     since_timestamp: Optional[float] = None,
+                     limit: int = 100) -> List[Message]:
+        """Mêmes filtres que Blackboard.get_messages, plus récents d'abord"""
+        ring = self.ring
+        keep = ring['msg_id'] >= 0
+        if since_timestamp:
+            keep &= ring['timestamp'] >= since_timestamp
+        if receiver_id is not None:
+            keep &= (ring['receiver'] == receiver_id) | (ring['receiver'] == -1)
+        if msg_type:
+            keep &= ring['msg_type'] == MESSAGE_TYPES.index(msg_type)
+        # Cases du plus récent au plus ancien: l'anneau est rempli dans l'ordre des numéros
+        newest = self.message_counter - 1
+        order = (newest - np.arange(self.max_messages)) % self.max_messages
+        slots = order[keep[order]]
+
+        messages = []
+        for i in slots.tolist():
+            msg = self._decode(i)
+            if msg is not None:
+                messages.append(msg)
+                if len(messages) >= limit:
+                    break
+        return messages
+
+    def get_latest_message(self, receiver_id: Optional[int] = None,
+                           msg_type: Optional[MessageType] = None) -> Optional[Message]:
+        messages = self.get_messages(receiver_id, msg_type, limit=1)
+        return messages[0] if messages else None
+
+    @property
+    def messages(self) -> List[Message]:
+        """Messages présents, du plus ancien au plus récent (copies décodées)"""
+        return self.get_messages(limit=self.max_messages)[::-1]
+
+    def clear_old_messages(self, older_than_seconds: float = 60.0):
+        cutoff_time = time.time() - older_than_seconds
+        with self.lock:
+            old = (self.ring['msg_id'] >= 0) & (self.ring['timestamp'] < cutoff_time)
+            self.ring['msg_id'][old] = -1
+
+    def get_message_stats(self) -> Dict[str, int]:
+        present = self.ring['msg_id'] >= 0
+        counts = np.bincount(self.ring['msg_type'][present], minlength=len(MESSAGE_TYPES))
+        stats = {t.value: int(counts[i]) for i, t in enumerate(MESSAGE_TYPES)}
+        stats['total'] = int(present.sum())
+        return stats
+
+    # ----------------------------------------------------------------------
+    # États des agents
+    # ----------------------------------------------------------------------
+    def update_agent_state(self, agent_id: int, state: Dict[str, Any]):
+        """Écrit la ligne de l'agent (clés: status, position, current_task)"""
+        unknown = set(state) - {'status', 'position', 'current_task'}
+        if unknown:
+            raise ValueError(f"Clés d'état non supportées en mémoire partagée: {sorted(unknown)}")
+        table, seqs = self.agent_table, self.agent_table['seq']
+        seq, _, status, has_position, x, y, task, _ = table[agent_id].item()
+        seq += 1
+        seqs[agent_id] = seq
+        if 'status' in state:
+            status = STATUSES.index(state['status'])
+        if 'position' in state:
+            position = state['position']
+            has_position = position is not None
+            if has_position:
+                x, y = position
+        if 'current_task' in state:
+            task = -1 if state['current_task'] is None else state['current_task']
+        table[agent_id] = (seq, 1, status, has_position, x, y, task, time.time())
+        seqs[agent_id] = seq + 1
+
+    def _row(self, agent_id: int) -> tuple:
+        """Ligne d'un agent en tuple, relue tant qu'elle est en cours d'écriture"""
+        table, seqs = self.agent_table, self.agent_table['seq']
+        while True:
+            row = table[agent_id].item()
+            if not row[0] & 1 and seqs[agent_id] == row[0]:
+                return row
+
+    @staticmethod
+    def _state(row) -> Dict[str, Any]:
+        _, _, status, has_position, x, y, task, last_update = row
+        return {
+            'status': STATUSES[status],
+            'position': (x, y) if has_position else None,
+            'current_task': None if task < 0 else task,
+            'last_update': last_update,
+        }
+
+    def get_agent_state(self, agent_id: int) -> Optional[Dict[str, Any]]:
+        row = self._row(agent_id)
+        return self._state(row) if row[1] else None
+
+    def get_all_agent_states(self) -> Dict[int, Dict[str, Any]]:
+        """Copie les seules lignes actives, relit celles écrites pendant la copie"""
+        table = self.agent_table
+        ids = np.flatnonzero(table['active'])
+        if len(ids) < len(table):
+            table = table[ids]
+        rows = table.tolist()
+        seqs = self.agent_table['seq'][ids].tolist()
+        states = {}
+        for i, row, seq in zip(ids.tolist(), rows, seqs):
+            if seq & 1 or row[0] != seq:
+                row = self._row(i)
+            if row[1]:
+                states[i] = self._state(row)
+        return states
+
+    def update_global_state(self, updates: Dict[str, Any]):
+        self.global_state.update(updates)
+
+    def get_global_state(self) -> Dict[str, Any]:
+        return self.global_state.copy()
+
+    @property
+    def agent_states(self) -> Dict[int, Dict[str, Any]]:
+        return self.get_all_agent_states()
+
+    def __repr__(self) -> str:
+        return (f"SharedBlackboard({self.name}, messages={min(self.message_counter, self.max_messages)}, "
+                f"agents={int(self.agent_table['active'].sum())})")
+
+
+def _attach(name, max_messages, max_agents, payload_size, lock):
+    return SharedBlackboard(max_messages, max_agents, payload_size, name=name, create=False, lock=lock)
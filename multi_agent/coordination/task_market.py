@@ -18,6 +18,7 @@ from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from enum import Enum
 import time
+import threading
 from multi_agent.planning.strips import Action, ActionType, WorldState
 
 
@@ -30,7 +31,7 @@ class TaskStatus(Enum):
     BLOCKED = "blocked"          # Bloquée (dépendances non satisfaites)
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """
     Tâche atomique dans le task market
@@ -54,7 +55,7 @@ class Task:
         return f"Task(id={self.task_id}, type={self.action_type.value}, status={self.status.value})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Bid:
     """
     Enchère d'un agent pour une tâche
@@ -92,6 +93,8 @@ class TaskMarket:
             'stove': set(),
             'assembly': set()
         }
+        # Statuts, verrous et dépendances modifiés ensemble (agents en parallèle)
+        self.lock = threading.RLock()
 
     def add_tasks(self, tasks: List[Dict[str, any]]):
         """Ajoute des tâches au market"""
@@ -198,22 +201,29 @@ class TaskMarket:
     def _lock_resource(self, task_id: int, agent_id: int):
         """Réserve une ressource pour un agent"""
         task = self.tasks[task_id]
-        if task.action_type == ActionType.CUT:
-            self.resource_locks['cutting_board'].add(agent_id)
-        elif task.action_type == ActionType.COOK:
-            self.resource_locks['stove'].add(agent_id)
-        elif task.action_type in [ActionType.BRING_TO_ASSEMBLY, ActionType.DELIVER]:
-            self.resource_locks['assembly'].add(agent_id)
+        with self.lock:
+            if task.action_type == ActionType.CUT:
+                self.resource_locks['cutting_board'].add(agent_id)
+            elif task.action_type == ActionType.COOK:
+                self.resource_locks['stove'].add(agent_id)
+            elif task.action_type in [ActionType.BRING_TO_ASSEMBLY, ActionType.DELIVER]:
+                self.resource_locks['assembly'].add(agent_id)
 
     def _unlock_resource(self, task_id: int):
         """Libère une ressource après utilisation"""
         task = self.tasks[task_id]
-        if task.action_type == ActionType.CUT:
-            self.resource_locks['cutting_board'].discard(task.assigned_agent)
-        elif task.action_type == ActionType.COOK:
-            self.resource_locks['stove'].discard(task.assigned_agent)
-        elif task.action_type in [ActionType.BRING_TO_ASSEMBLY, ActionType.DELIVER]:
-            self.resource_locks['assembly'].discard(task.assigned_agent)
+        with self.lock:
+            if task.action_type == ActionType.CUT:
+                self.resource_locks['cutting_board'].discard(task.assigned_agent)
+            elif task.action_type == ActionType.COOK:
+                self.resource_locks['stove'].discard(task.assigned_agent)
+            elif task.action_type in [ActionType.BRING_TO_ASSEMBLY, ActionType.DELIVER]:
+                self.resource_locks['assembly'].discard(task.assigned_agent)
+
+    def unlock_resource(self, resource_name: str, agent_id: int):
+        """Libère la place d'un agent sur une ressource (DeadlockWatchdog)"""
+        with self.lock:
+            self.resource_locks.get(resource_name, set()).discard(agent_id)
 
     def start_task(self, task_id: int):
         """Marque une tâche comme commencée"""
@@ -224,15 +234,16 @@ class TaskMarket:
     def complete_task(self, task_id: int):
         """Marque une tâche comme terminée et libère les ressources"""
         if task_id in self.tasks:
-            self.tasks[task_id].status = TaskStatus.COMPLETED
-            self.tasks[task_id].completion_time = time.time()
-            self.completed_tasks.add(task_id)
+            with self.lock:
+                self.tasks[task_id].status = TaskStatus.COMPLETED
+                self.tasks[task_id].completion_time = time.time()
+                self.completed_tasks.add(task_id)
 
-            # Libérer les ressources
-            self._unlock_resource(task_id)
+                # Libérer les ressources
+                self._unlock_resource(task_id)
 
-            # Débloquer les tâches dépendantes
-            self._unblock_dependent_tasks(task_id)
+                # Débloquer les tâches dépendantes
+                self._unblock_dependent_tasks(task_id)
 
     def _unblock_dependent_tasks(self, completed_task_id: int):
         """Débloque les tâches qui dépendaient de la tâche complétée"""
@@ -243,9 +254,10 @@ class TaskMarket:
     def cancel_task(self, task_id: int):
         """Annule une tâche et libère les ressources"""
         if task_id in self.tasks:
-            self.tasks[task_id].status = TaskStatus.AVAILABLE
-            self.tasks[task_id].assigned_agent = None
-            self._unlock_resource(task_id)
+            with self.lock:
+                self._unlock_resource(task_id)
+                self.tasks[task_id].status = TaskStatus.AVAILABLE
+                self.tasks[task_id].assigned_agent = None
 
     def get_task_status(self, task_id: int) -> Optional[TaskStatus]:
         """Retourne le statut d'une tâche"""
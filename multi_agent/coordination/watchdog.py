@@ -0,0 +1,288 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+Watchdog de blocages (deadlock / livelock) entre agents coopératifs
+
+Détection, après chaque tick:
+- blocage: un agent veut avancer mais ne peut pas depuis stall_ticks ticks
+  (agent.blocked_ticks); il attend les agents qui occupent son chemin ou
+  toutes les cases d'accès à sa cible
+- attente circulaire: cycle dans le graphe "attend" (positions, ou verrou
+  de ressource du TaskMarket détenu par un agent lui-même bloqué)
+- livelock: l'agent a fait livelock_ticks pas sans se rapprocher de sa cible
+
+Résolution par priorité (tâche en cours > inactif, objet porté > mains
+vides, plus petit id): le moins prioritaire s'écarte hors du chemin de
+l'autre (agent.step_aside), après un voisin inactif s'il est encerclé;
+deux agents mains vides en attente circulaire sur des tâches PICKUP
+échangent leurs tâches; un verrou pris dans un cycle est libéré; parmi des
+agents voisins en livelock, seul le moins prioritaire fait une pause.
+Chaque occurrence est reportée à PerformanceMetrics.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from multi_agent.planning.strips import ActionType
+
+Position = Tuple[int, int]
+
+LOCKED_RESOURCE = {ActionType.CUT: 'cutting_board', ActionType.COOK: 'stove'}
+
+
+class DeadlockWatchdog:
+    """
+    Surveille les agents et débloque les situations sans progrès
+
+    stall_ticks: ticks bloqués avant intervention
+    livelock_ticks: pas sans rapprochement de la cible
+    yield_ticks: attente sur la case de dégagement
+    radius: distance maximale de la case de dégagement
+    """
+
+    def __init__(self, kitchen, metrics=None, stall_ticks: int = 8, livelock_ticks: int = 40,
+                 yield_ticks: int = 3, radius: int = 12):
+        self.kitchen = kitchen
+        self.metrics = metrics
+        self.stall_ticks = stall_ticks
+        self.livelock_ticks = livelock_ticks
+        self.yield_ticks = yield_ticks
+        self.radius = radius
+
+        self.events: List[Dict] = []
+        self._progress: Dict[int, Tuple] = {}  # agent -> (cible, meilleure distance, pas sans progrès, position)
+
+    # ----------------------------------------------------------------------
+    # Outils
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def priority(agent) -> Tuple:
+        """Plus grand = plus prioritaire"""
+        return (agent.current_task is not None, agent.holding is not None, -agent.id)
+
+    def _goals(self, target) -> Set[Position]:
+        x, y = target
+        return {p for p in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)) if self.kitchen.is_walkable(p)}
+
+    def _neighbors(self, p):
+        x, y = p
+        for q in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if self.kitchen.is_walkable(q):
+                yield q
+
+    def _path(self, start: Position, goals: Set[Position]) -> List[Position]:
+        """Plus court chemin en ignorant les agents (cases traversées, arrivée incluse)"""
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            if u in goals:
+                path = []
+                while u != start:
+                    path.append(u)
+                    u = parent[u]
+                return path[::-1]
+            for v in self._neighbors(u):
+                if v not in parent:
+                    parent[v] = u
+                    queue.append(v)
+        return []
+
+    def _refuge(self, agent, avoid: Set[Position], occupied: Dict[Position, object]) -> Optional[Position]:
+        """Case libre la plus proche de agent, hors de avoid"""
+        start = tuple(agent.position)
+        dist = {start: 0}
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            if u != start and u not in avoid:
+                return u
+            if dist[u] >= self.radius:
+                continue
+            for v in self._neighbors(u):
+                if v not in dist and v not in occupied:
+                    dist[v] = dist[u] + 1
+                    queue.append(v)
+        return None
+
+    # ----------------------------------------------------------------------
+    # Graphe d'attente
+    # ----------------------------------------------------------------------
+    def _waits_for(self, agent, occupied: Dict[Position, object]) -> Tuple[List[object], Set[Position]]:
+        """Agents qui bloquent agent, et cases à lui laisser libres"""
+        start = tuple(agent.position)
+        goals = self._goals(agent.move_target)
+        others = {p: a for p, a in occupied.items() if a is not agent}
+        if goals and all(g in others for g in goals):
+            path = self._path(start, goals)
+            return [others[g] for g in sorted(goals)], set(path) | goals
+        path = self._path(start, {g for g in goals if g not in others} or goals)
+        blockers = [others[p] for p in path if p in others]
+        if not blockers:
+            blockers = [others[p] for p in self._neighbors(start) if p in others]
+        return blockers, set(path) | goals
+
+    @staticmethod
+    def _lock_waits(agent, by_id, task_market) -> List[object]:
+        """Agents qui détiennent toutes les places du verrou de ressource attendu par agent"""
+        if task_market is None or agent.current_task is None or agent.holding is None:
+            return []
+        resource = LOCKED_RESOURCE.get(agent.current_task.action_type)
+        if resource is None:
+            return []
+        others = [h for h in task_market.resource_locks[resource] if h != agent.id]
+        if len(others) < task_market.resource_capacity.get(resource, 1):
+            return []
+        return [by_id[h] for h in sorted(others) if h in by_id]
+
+    @staticmethod
+    def _in_cycle(start, edges: Dict[int, List[int]]) -> Optional[List[int]]:
+        """Cycle du graphe d'attente passant par start (ids), ou None"""
+        stack = [(start, [start])]
+        seen = set()
+        while stack:
+            node, path = stack.pop()
+            for nxt in edges.get(node, ()):
+                if nxt == start:
+                    return path
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append((nxt, path + [nxt]))
+        return None
+
+    # ----------------------------------------------------------------------
+    # Boucle
+    # ----------------------------------------------------------------------
+    def update(self, agents, tick: int, task_market=None):
+        """Appelé par le jeu après la mise à jour des agents (task_market: verrous de ressources)"""
+        by_id = {a.id: a for a in agents}
+        occupied = {tuple(a.position): a for a in agents}
+
+        stalled = [a for a in agents if a.yield_ticks == 0 and a.action_timer == 0
+                   and a.current_task is not None and a.move_target is not None
+                   and a.blocked_ticks >= self.stall_ticks]
+        livelocked = [a for a in agents if self._livelocked(a)]
+        if not stalled and not livelocked:
+            return
+
+        edges: Dict[int, List[int]] = {}
+        keep_clear: Dict[int, Set[Position]] = {}
+        blockers_of: Dict[int, List[object]] = {}
+        for agent in stalled:
+            blockers, clear = self._waits_for(agent, occupied)
+            blockers += [b for b in self._lock_waits(agent, by_id, task_market) if b not in blockers]
+            blockers_of[agent.id] = blockers
+            keep_clear[agent.id] = clear
+            edges[agent.id] = [b.id for b in blockers]
+
+        handled: Set[int] = set()
+        for agent in sorted(stalled, key=self.priority, reverse=True):
+            if agent.id in handled:
+                continue
+            blockers = [b for b in blockers_of[agent.id] if b.action_timer == 0]
+            cycle = self._in_cycle(agent.id, edges)
+            kind = 'cyclic_wait' if cycle else 'blocked'
+            group = cycle or [agent.id] + [b.id for b in blockers]
+            if not blockers and not cycle:
+                continue  # bloqué par un agent en cours d'action: attente normale
+
+            resolution = self._resolve(agent, blockers, cycle, by_id, keep_clear, occupied, task_market)
+            handled.update(group)
+            self._report(tick, kind, group, resolution)
+
+        # Livelocks voisins (agents qui s'esquivent en miroir): seul le moins
+        # prioritaire s'arrête, les autres repartent avec un nouveau budget
+        for agent in sorted(livelocked, key=self.priority):
+            if agent.id in handled or agent.yield_ticks:
+                continue
+            group = [a for a in livelocked if a.id not in handled and
+                     abs(a.position[0] - agent.position[0]) + abs(a.position[1] - agent.position[1]) <= 3]
+            agent.step_aside(None, self.stall_ticks)
+            for member in group:
+                self._progress.pop(member.id, None)
+                handled.add(member.id)
+            self._report(tick, 'livelock', [a.id for a in group], 'pause')
+
+    def _resolve(self, agent, blockers, cycle, by_id, keep_clear, occupied, task_market=None) -> str:
+        # Verrou de ressource pris dans le cycle: le moins prioritaire le libère
+        if cycle and task_market is not None:
+            members = [by_id[i] for i in cycle]
+            for member in sorted(members, key=self.priority):
+                for resource, holders in task_market.resource_locks.items():
+                    if member.id in holders and \
+                            any(member in self._lock_waits(m, by_id, task_market) for m in members):
+                        task_market.unlock_resource(resource, member.id)
+                        return 'release_lock'
+
+        # Deux agents mains vides qui vont chercher des ingrédients: échange des tâches
+        if cycle and len(cycle) == 2:
+            a, b = by_id[cycle[0]], by_id[cycle[1]]
+            if self._swappable(a) and self._swappable(b):
+                a.current_task, b.current_task = b.current_task, a.current_task
+                a.current_task.assigned_agent, b.current_task.assigned_agent = a.id, b.id
+                for member in (a, b):
+                    member.move_target = None
+                    member.joint_route = None
+                    member.blocked_ticks = 0
+                return 'task_swap'
+
+        # Le moins prioritaire cède le passage au plus prioritaire
+        if not blockers:
+            blockers = [by_id[i] for i in cycle if i != agent.id]
+        candidates = blockers + [agent]
+        yielder = min(candidates, key=self.priority)
+        beneficiary = agent if yielder is not agent else max(blockers, key=self.priority)
+        avoid = keep_clear.get(beneficiary.id)
+        if avoid is None:
+            avoid = {tuple(beneficiary.position)}
+            if beneficiary.move_target is not None:
+                goals = self._goals(beneficiary.move_target)
+                avoid |= set(self._path(tuple(beneficiary.position), goals)) | goals
+        refuge = self._refuge(yielder, avoid, occupied)
+        if refuge is None:
+            # Encerclé: un voisin inactif s'écarte d'abord, le yielder prend sa place
+            here = tuple(yielder.position)
+            for cell in self._neighbors(here):
+                neighbor = occupied.get(cell)
+                if neighbor is None or neighbor is beneficiary or cell in avoid \
+                        or neighbor.current_task is not None or neighbor.action_timer or neighbor.yield_ticks:
+                    continue
+                chained = self._refuge(neighbor, avoid | {here}, occupied)
+                if chained is not None:
+                    distance = abs(chained[0] - cell[0]) + abs(chained[1] - cell[1])
+                    neighbor.step_aside(chained, 2 * distance + self.yield_ticks)
+                    yielder.step_aside(cell, 2 * distance + 2 + self.yield_ticks)
+                    return 'yield'
+            yielder.step_aside(None, self.yield_ticks)
+            return 'wait'
+        distance = abs(refuge[0] - yielder.position[0]) + abs(refuge[1] - yielder.position[1])
+        yielder.step_aside(refuge, 2 * distance + self.yield_ticks)
+        return 'yield'
+
+    @staticmethod
+    def _swappable(agent) -> bool:
+        return (agent.holding is None and agent.current_task is not None
+                and agent.current_task.action_type == ActionType.PICKUP)
+
+    def _livelocked(self, agent) -> bool:
+        """livelock_ticks pas sans se rapprocher de la cible"""
+        if agent.current_task is None or agent.move_target is None or agent.yield_ticks:
+            self._progress.pop(agent.id, None)
+            return False
+        target, position = tuple(agent.move_target), tuple(agent.position)
+        d = abs(position[0] - target[0]) + abs(position[1] - target[1])
+        previous = self._progress.get(agent.id)
+        if previous is None or previous[0] != target or d < previous[1]:
+            self._progress[agent.id] = (target, d, 0, position)
+            return False
+        # Seuls les ticks où l'agent s'est déplacé comptent (attente à un outil: pas de livelock)
+        stale = previous[2] + (position != previous[3])
+        self._progress[agent.id] = (target, previous[1], stale, position)
+        return stale >= self.livelock_ticks
+
+    def _report(self, tick: int, kind: str, agents: List[int], resolution: str):
+        self.events.append({'tick': tick, 'kind': kind, 'agents': list(agents), 'resolution': resolution})
+        if self.metrics is not None:
+            self.metrics.record_deadlock(tick, kind, agents, resolution)
@@ -8,6 +8,7 @@ import os
 import pygame
 import random
 import math
+import threading
 
 # Permet d'importer depuis le dossier parent (common.*)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,9 +28,12 @@ SCORE_GREEN = (20, 140, 60)
 
 
 class Kitchen(KitchenBase):
-    def __init__(self, width=16, height=16, cell_size=50):
-        super().__init__(width, height, cell_size)
+    def __init__(self, width=16, height=16, cell_size=50, headless=False, layout=None):
+        super().__init__(width, height, cell_size, headless=headless, layout=layout)
 
+        # Verrou des états partagés (ressources, table d'assemblage, comptoir,
+        # observateurs) quand les agents sont mis à jour en parallèle
+        self.lock = threading.RLock()
         self.resource_locks = {
             'cutting_board': set(),
             'stove': set(),
@@ -43,6 +47,8 @@ class Kitchen(KitchenBase):
             'counter': 1
         }
         self.shared_assembly_table = []
+        # Observateurs notifiés à chaque mutation (voir notify)
+        self.observers = []
 
         if hasattr(self, "colors"):
             self.colors.setdefault("floor", GRID_BG)
@@ -55,11 +61,13 @@ class Kitchen(KitchenBase):
     # 1. Génération Robustifiée
     # ------------------------------------------------------------------
 
-    def generate_dynamic_kitchen(self, nb_assembly=1, nb_stoves=2, nb_cutting_boards=2):
+    def generate_dynamic_kitchen(self, nb_assembly=1, nb_stoves=2, nb_cutting_boards=2, rng=None):
         """
         Génération qui force la présence des outils même si la map de base est vide.
         Garantit 1 seule table de livraison (counter).
+        rng: random.Random utilisé pour le placement (défaut: module random global).
         """
+        rng = rng or random
         # 1. Identifier les candidats (Comptoirs ou vides sur les bords)
         candidates = []
         existing_tools = {
@@ -108,14 +116,14 @@ class Kitchen(KitchenBase):
                 candidates.append((x, 0))  # Haut
                 candidates.append((x, self.height - 1))  # Bas
 
-        random.shuffle(candidates)
+        rng.shuffle(candidates)
 
         # 2. Fonction de placement
         def place_items(type_name, count, current_list, is_tool_obj=True):
             # Enlever le surplus
             while len(current_list) > count:
                 cx, cy = current_list.pop()
-                self.grid[cy][cx] = None  # Revert to floor (was 'counter')
+                self.set_cell(cx, cy, None)  # Revert to floor (was 'counter')
 
             # Ajouter le manquant
             while len(current_list) < count and candidates:
@@ -127,9 +135,9 @@ class Kitchen(KitchenBase):
                         actual_tool_type = 'planche'
                     elif type_name == 'stove':
                         actual_tool_type = 'poele'
-                    self.grid[cy][cx] = Tool(actual_tool_type, (cx, cy))
+                    self.set_cell(cx, cy, Tool(actual_tool_type, (cx, cy)))
                 else:
-                    self.grid[cy][cx] = type_name  # String (ex: assembly_table)
+                    self.set_cell(cx, cy, type_name)  # String (ex: assembly_table)
                 current_list.append((cx, cy))
 
         # 3. Application
@@ -144,6 +152,8 @@ class Kitchen(KitchenBase):
         # Les candidats non utilisés restent tels quels (None/Vide ou ce qu'ils étaient).
 
         self._compute_resource_capacity()
+        self.invalidate_static_layer()
+        self.notify('layout_changed')
         print(f"🏗️ Cuisine générée: {nb_stoves} poêles, {nb_cutting_boards} planches, 1 comptoir.")
 
     def _compute_resource_capacity(self):
@@ -175,6 +185,43 @@ class Kitchen(KitchenBase):
     # 2. Intelligence Artificielle (CORRECTION ICI)
     # ------------------------------------------------------------------
 
+    # ------------------------------------------------------------------
+    # Notifications de mutation (encodeur d'observations, etc.)
+    # ------------------------------------------------------------------
+
+    def add_observer(self, observer):
+        """
+        Enregistre un observateur. Événements -> méthodes appelées:
+        layout_changed(), tool_changed(pos), assembly_changed(),
+        agent_moved(agent, old_position), holding_changed(agent, old_item)
+        """
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def notify(self, event, *args):
+        with self.lock:
+            for observer in self.observers:
+                getattr(observer, f"on_{event}")(*args)
+
+    # ------------------------------------------------------------------
+    # Table d'assemblage partagée
+    # ------------------------------------------------------------------
+
+    def add_to_assembly(self, item):
+        with self.lock:
+            self.shared_assembly_table.append(item)
+            self.notify('assembly_changed')
+
+    def take_assembly(self):
+        """Vide la table d'assemblage et renvoie son contenu"""
+        with self.lock:
+            items, self.shared_assembly_table = self.shared_assembly_table, []
+            self.notify('assembly_changed')
+        return items
+
     def get_best_available_resource(self, resource_type, agent_pos):
         """
         Recherche tolérante de ressources.
@@ -228,20 +275,23 @@ class Kitchen(KitchenBase):
     # ------------------------------------------------------------------
 
     def try_lock_resource(self, resource_name: str, agent_id: int) -> bool:
+        """Compare-and-set: prend une place si la capacité le permet"""
         if resource_name not in self.resource_locks: 
             return True
         capacity = self.resource_capacity.get(resource_name, 1)
-        holders = self.resource_locks[resource_name]
-        if agent_id in holders:
-            return True
-        if len(holders) < capacity:
-            holders.add(agent_id)
-            return True
+        with self.lock:
+            holders = self.resource_locks[resource_name]
+            if agent_id in holders:
+                return True
+            if len(holders) < capacity:
+                holders.add(agent_id)
+                return True
         return False
 
     def unlock_resource(self, resource_name: str, agent_id: int):
         if resource_name in self.resource_locks:
-            self.resource_locks[resource_name].discard(agent_id)
+            with self.lock:
+                self.resource_locks[resource_name].discard(agent_id)
 
     def is_resource_available(self, resource_name: str) -> bool:
         """Retourne True si la ressource n'est pas verrouillée"""
@@ -261,26 +311,27 @@ class Kitchen(KitchenBase):
             return next(iter(holders))
         return holders
 
-    def _draw_background(self):
-        self.screen.fill(GRID_BG)
+    def _draw_background(self, surface):
+        surface.fill(GRID_BG)
         for y in range(self.height):
             for x in range(self.width):
                 if (x + y) % 2 != 0:
                     r = pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
-                    pygame.draw.rect(self.screen, GRID_ALT_BG, r)
+                    pygame.draw.rect(surface, GRID_ALT_BG, r)
 
         w_px = self.width * self.cell_size
         h_px = self.height * self.cell_size
         for x in range(self.width + 1):
             px = x * self.cell_size
-            pygame.draw.line(self.screen, GRID_LINE, (px, 0), (px, h_px), 1)
+            pygame.draw.line(surface, GRID_LINE, (px, 0), (px, h_px), 1)
         for y in range(self.height + 1):
             py = y * self.cell_size
-            pygame.draw.line(self.screen, GRID_LINE, (0, py), (w_px, py), 1)
+            pygame.draw.line(surface, GRID_LINE, (0, py), (w_px, py), 1)
 
-    def draw(self, agents=None, current_order=None, score=0, show_buttons=False):
-        if agents and not isinstance(agents, list): agents = [agents]
-        self._draw_background()
+    def _render_static_layer(self):
+        """Fond + murs, caisses et stations, rendus une fois par layout"""
+        layer = pygame.Surface((self.width * self.cell_size, self.height * self.cell_size))
+        self._draw_background(layer)
 
         # Grille
         for y in range(self.height):
@@ -293,26 +344,26 @@ class Kitchen(KitchenBase):
                 if isinstance(cell, str):
                     img = self.images.get(cell)
                     if img:
-                        self.screen.blit(img, img.get_rect(center=rect.center))
+                        layer.blit(img, img.get_rect(center=rect.center))
                     else:
-                        c = (200, 190, 180) if cell == 'counter' else (200, 180, 100)
-                        pygame.draw.rect(self.screen, c, rect.inflate(-4, -4), border_radius=4)
+                        c = {'counter': (200, 190, 180), 'wall': (175, 165, 150)}.get(cell, (200, 180, 100))
+                        pygame.draw.rect(layer, c, rect.inflate(-4, -4), border_radius=4)
 
                 elif isinstance(cell, Tool):
-                    pygame.draw.rect(self.screen, (220, 215, 210), rect.inflate(-2, -2), border_radius=4)
+                    pygame.draw.rect(layer, (220, 215, 210), rect.inflate(-2, -2), border_radius=4)
                     # Essayer le nom anglais ET français pour l'image
                     img = self.images.get(cell.tool_type)
                     if not img and cell.tool_type == 'cutting_board': img = self.images.get('planche')
                     if not img and cell.tool_type == 'stove': img = self.images.get('poele')
 
                     if img:
-                        self.screen.blit(img, img.get_rect(center=rect.center))
+                        layer.blit(img, img.get_rect(center=rect.center))
                     else:
                         # Debug visuel : Carré rouge si image manquante
-                        pygame.draw.rect(self.screen, (200, 100, 100), rect.inflate(-10, -10))
+                        pygame.draw.rect(layer, (200, 100, 100), rect.inflate(-10, -10))
 
                 elif isinstance(cell, Ingredient):
-                    pygame.draw.rect(self.screen, (230, 230, 230), rect.inflate(-8, -8), border_radius=6)
+                    pygame.draw.rect(layer, (230, 230, 230), rect.inflate(-8, -8), border_radius=6)
                     
                     # Mapping des états STRIPS vers les suffixes de fichiers (FR)
                     state_map = {
@@ -327,11 +378,23 @@ class Kitchen(KitchenBase):
                     k = f"{cell.name}_{suffix}"
                     
                     img = self.images.get(k)
-                    if img: self.screen.blit(img, img.get_rect(center=rect.center))
+                    if img: layer.blit(img, img.get_rect(center=rect.center))
+        return layer
+
+    def draw(self, agents=None, current_order=None, score=0, show_buttons=False,
+             assembly=None, counter_dishes=None):
+        """
+        Dessine la frame. `assembly` et `counter_dishes` permettent de dessiner
+        depuis un instantané (FrameSnapshot) plutôt que depuis l'état courant.
+        """
+        if agents and not isinstance(agents, (list, tuple)): agents = [agents]
+        if assembly is None: assembly = self.shared_assembly_table
+        if counter_dishes is None: counter_dishes = self.counter_dishes
+        self._begin_frame()
 
         # Shared Assembly
-        if self.shared_assembly_table:
-            for idx, ing in enumerate(self.shared_assembly_table):
+        if assembly:
+            for idx, ing in enumerate(assembly):
                 if ing.position:
                     ix, iy = ing.position
                     
@@ -341,15 +404,15 @@ class Kitchen(KitchenBase):
                     
                     img = self.images.get(k)
                     if img:
-                        small = pygame.transform.smoothscale(img, (25, 25))
+                        small = self.sprites.scaled(img, k, "table", (25, 25))
                         dest = (ix * self.cell_size + 12 + (idx % 2) * 5, iy * self.cell_size + 12 + (idx // 2) * 5)
-                        self.screen.blit(small, dest)
+                        self._blit(small, dest)
 
         # Plats comptoir
-        for d in self.counter_dishes:
+        for d in counter_dishes:
             dx, dy = d['position']
             r = pygame.Rect(dx * self.cell_size, dy * self.cell_size, self.cell_size, self.cell_size)
-            if d['image']: self.screen.blit(d['image'], d['image'].get_rect(center=r.center))
+            if d['image']: self._blit(d['image'], d['image'].get_rect(center=r.center))
 
         # Agents
         if agents:
@@ -361,14 +424,14 @@ class Kitchen(KitchenBase):
                 # Ombre
                 s = pygame.Rect(0, 0, int(self.cell_size * 0.6), 10)
                 s.center = (rect.centerx, rect.bottom - 5)
-                pygame.draw.ellipse(self.screen, (100, 100, 100, 100), s)
+                self._dynamic_rects.append(pygame.draw.ellipse(self.screen, (100, 100, 100, 100), s))
 
                 img_k = f"agent_{ag.direction}"
                 img = self.images.get(img_k)
                 if img:
-                    self.screen.blit(img, img.get_rect(center=rect.center))
+                    self._blit(img, img.get_rect(center=rect.center))
                 else:
-                    pygame.draw.circle(self.screen, colors[idx % 4], rect.center, 20)
+                    self._dynamic_rects.append(pygame.draw.circle(self.screen, colors[idx % 4], rect.center, 20))
 
                 # Holding
                 if hasattr(ag, 'holding') and ag.holding:
@@ -379,18 +442,19 @@ class Kitchen(KitchenBase):
                         
                         i_img = self.images.get(k)
                         if i_img:
-                            s = pygame.transform.smoothscale(i_img, (30, 30))
-                            self.screen.blit(s, s.get_rect(midbottom=(rect.centerx, rect.top + 5)))
+                            s = self.sprites.scaled(i_img, k, "held", (30, 30))
+                            self._blit(s, s.get_rect(midbottom=(rect.centerx, rect.top + 5)))
                     elif isinstance(ag.holding, Tool):  # Plat
                         p = self.images.get("plate")
-                        if p: self.screen.blit(p, p.get_rect(midbottom=(rect.centerx, rect.top + 5)))
+                        if p: self._blit(p, p.get_rect(midbottom=(rect.centerx, rect.top + 5)))
 
         # UI Bas
         ui_y = self.height * self.cell_size
-        pygame.draw.rect(self.screen, UI_BG, (0, ui_y, self.width * self.cell_size, 200))
+        ui_rect = pygame.Rect(0, ui_y, self.width * self.cell_size, 200)
+        pygame.draw.rect(self.screen, UI_BG, ui_rect)
         pygame.draw.line(self.screen, UI_BORDER, (0, ui_y), (self.width * self.cell_size, ui_y), 2)
 
-        sc = self.font.render(f"Score: {score}", True, SCORE_GREEN)
+        sc = self.texts.render(self.font, f"Score: {score}", SCORE_GREEN)
         self.screen.blit(sc, (15, ui_y + 15))
 
         # Commande actuelle (à droite de Score)
@@ -399,21 +463,23 @@ class Kitchen(KitchenBase):
                 order_text = current_order
             else:
                 order_text = f"Commande: {current_order}"
-            text_order = self.font.render(order_text, True, (30, 60, 160))
+            text_order = self.texts.render(self.font, order_text, (30, 60, 160))
             self.screen.blit(text_order, (350, ui_y + 10))
 
         # Actions des agents (juste en dessous)
         if agents:
             action_y = ui_y + 40   # 2e ligne
             for idx, agent in enumerate(agents):
-                txt = self.small_font.render(
+                txt = self.texts.render(
+                    self.small_font,
                     f"Agent {idx + 1}: {getattr(agent, 'current_action', 'En attente')}",
-                    True,
                     TEXT_MAIN,
                 )
                 self.screen.blit(txt, (10, action_y + idx * 20))
 
-        # IMPORTANT : plus de show_buttons ici, plus de flip ici
+        self._end_frame(ui_rect)
+
+        # IMPORTANT : plus de show_buttons ici, plus de flip ici (voir present())
         return []
 
 
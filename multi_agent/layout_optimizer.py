@@ -0,0 +1,329 @@
+"""
+multi_agent/layout_optimizer.py
+Recherche du placement des stations (poêles, planches, tables, comptoir)
+
+Recherche locale parallèle: à chaque itération, `batch` voisins du meilleur
+placement (une station déplacée vers un emplacement libre, ou deux stations
+de types différents échangées) sont évalués par des simulations headless du
+mélange de commandes, répartis sur le pool de processus de sweep.py. Le
+meilleur voisin est retenu s'il améliore l'objectif; la recherche s'arrête
+après `patience` itérations sans amélioration.
+
+Objectifs:
+- throughput : commandes livrées par minute (temps simulé, 10 ticks/s)
+- latency    : ticks moyens par commande (commande non livrée = max_ticks)
+
+Usage:
+    python multi_agent/layout_optimizer.py --base classic --agents 2 \\
+        --orders burger,pizza --stoves 2 --boards 2 --output layouts/optimized.txt
+"""
+
+import argparse
+import dataclasses
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.layouts import (CompiledLayout, compile_layout, load_layout, resolve_layout, to_ascii,
+                            FLOOR, WALL, BOARD, STOVE, ASSEMBLY, COUNTER)
+from common.recipes import recipes
+from multi_agent.sweep import run_scenario
+
+TICKS_PER_MINUTE = 600  # sim_tps par défaut: 10 ticks/s
+STATION_CODES = {'stove': STOVE, 'cutting_board': BOARD, 'assembly_table': ASSEMBLY, 'counter': COUNTER}
+
+Position = Tuple[int, int]
+Placement = Dict[str, Tuple[Position, ...]]
+
+
+def strip_stations(base: CompiledLayout) -> np.ndarray:
+    """Types de case du layout de base, stations retirées (remplacées par du sol)"""
+    cells = base.cells.copy()
+    cells[np.isin(cells, list(STATION_CODES.values()))] = FLOOR
+    return cells
+
+
+def candidate_positions(base: CompiledLayout) -> List[Position]:
+    """
+    Emplacements possibles d'une station: plans de travail (murs) bordant le sol
+    et cases de sol en bordure (hors coins), comme generate_dynamic_kitchen
+    """
+    cells = strip_stations(base)
+    h, w = cells.shape
+    starts = set(base.starts)
+    candidates = []
+    for y in range(h):
+        for x in range(w):
+            if (x, y) in starts:
+                continue
+            if cells[y, x] == WALL:
+                if any(0 <= nx < w and 0 <= ny < h and cells[ny, nx] == FLOOR
+                       for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))):
+                    candidates.append((x, y))
+            elif cells[y, x] == FLOOR:
+                on_edge = x in (0, w - 1) or y in (0, h - 1)
+                corner = x in (0, w - 1) and y in (0, h - 1)
+                if on_edge and not corner:
+                    candidates.append((x, y))
+    return candidates
+
+
+def build_layout(base: CompiledLayout, placement: Placement, name: str = "optimized") -> CompiledLayout:
+    """Layout compilé: base (caisses, murs, départs) + stations du placement"""
+    cells = strip_stations(base)
+    for station, positions in placement.items():
+        for x, y in positions:
+            cells[y, x] = STATION_CODES[station]
+    rows = to_ascii(dataclasses.replace(base, cells=cells), with_starts=False)
+    return compile_layout(rows, name=name, starts=list(base.starts))
+
+
+def is_reachable(layout: CompiledLayout) -> bool:
+    """Chaque caisse et station est voisine d'une case de sol accessible depuis le premier départ"""
+    walkable = layout.walkable
+    h, w = walkable.shape
+    start = layout.starts[0]
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < w and 0 <= ny < h and walkable[ny, nx] and (nx, ny) not in seen:
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    if any(start not in seen for start in layout.starts):
+        return False
+    ys, xs = np.nonzero(~walkable)
+    for x, y in zip(xs.tolist(), ys.tolist()):
+        if layout.cells[y, x] == WALL:
+            continue
+        if not any((nx, ny) in seen for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))):
+            return False
+    return True
+
+
+def placement_key(placement: Placement) -> Tuple:
+    return tuple((station, tuple(sorted(positions))) for station, positions in sorted(placement.items()))
+
+
+class LayoutOptimizer:
+    """
+    Recherche locale du placement des stations pour un mélange de commandes
+
+    Usage:
+        opt = LayoutOptimizer(load_layout(resolve_layout('classic')), nb_agents=2,
+                              orders=['burger', 'pizza'], nb_stoves=2, nb_boards=2)
+        best = opt.run(iterations=20)
+        print(best['score'], best['layout'])
+    """
+
+    def __init__(self, base: CompiledLayout, nb_agents: int = 2, orders: Sequence[str] = ('burger',),
+                 nb_stoves: int = 2, nb_boards: int = 2, nb_assembly: int = 1,
+                 seeds: Sequence[int] = (0,), objective: str = 'throughput', max_ticks: int = 3000,
+                 workers: Optional[int] = None, rng: Optional[random.Random] = None):
+        if objective not in ('throughput', 'latency'):
+            raise ValueError(f"Objectif inconnu: {objective}")
+        for recipe in orders:
+            if recipe not in recipes:
+                raise ValueError(f"Recette inconnue: {recipe}")
+        if not base.starts:
+            raise ValueError(f"Layout {base.name}: aucun départ d'agent défini")
+        self.base = base
+        self.nb_agents = nb_agents
+        self.orders = list(orders)
+        self.counts = {'stove': nb_stoves, 'cutting_board': nb_boards,
+                       'assembly_table': nb_assembly, 'counter': 1}
+        self.seeds = list(seeds)
+        self.objective = objective
+        self.max_ticks = max_ticks
+        self.workers = workers
+        self.rng = rng or random.Random(0)
+        self.candidates = candidate_positions(base)
+        if len(self.candidates) < sum(self.counts.values()):
+            raise ValueError(f"Layout {base.name}: pas assez d'emplacements pour les stations")
+        self.evaluations: Dict[Tuple, Dict] = {}
+        self.history: List[float] = []
+
+    # ----------------------------------------------------------------------
+    # Placements
+    # ----------------------------------------------------------------------
+
+    def random_placement(self) -> Placement:
+        """Placement aléatoire valide"""
+        for _ in range(1000):
+            free = list(self.candidates)
+            self.rng.shuffle(free)
+            placement = {station: tuple(free.pop() for _ in range(count))
+                         for station, count in self.counts.items()}
+            if is_reachable(build_layout(self.base, placement)):
+                return placement
+        raise ValueError(f"Layout {self.base.name}: aucun placement accessible trouvé")
+
+    def neighbor(self, placement: Placement) -> Placement:
+        """Déplace une station vers un emplacement libre, ou échange deux stations"""
+        for _ in range(100):
+            new = {station: list(positions) for station, positions in placement.items()}
+            stations = [(s, i) for s, positions in new.items() for i in range(len(positions))]
+            station, i = self.rng.choice(stations)
+            used = {pos for positions in new.values() for pos in positions}
+            if self.rng.random() < 0.3:
+                other, j = self.rng.choice(stations)
+                if other == station:
+                    continue
+                new[station][i], new[other][j] = new[other][j], new[station][i]
+            else:
+                free = [pos for pos in self.candidates if pos not in used]
+                if not free:
+                    continue
+                new[station][i] = self.rng.choice(free)
+            new = {s: tuple(p) for s, p in new.items()}
+            if placement_key(new) not in self.evaluations and is_reachable(build_layout(self.base, new)):
+                return new
+        return placement
+
+    # ----------------------------------------------------------------------
+    # Évaluation
+    # ----------------------------------------------------------------------
+
+    def _scenarios(self, placement: Placement) -> List[Dict]:
+        layout = build_layout(self.base, placement)
+        return [{'nb_agents': self.nb_agents, 'nb_stoves': self.counts['stove'],
+                 'nb_boards': self.counts['cutting_board'], 'nb_assembly': self.counts['assembly_table'],
+                 'layout': layout, 'seed': seed, 'random_starts': len(self.seeds) > 1,
+                 'orders': self.orders, 'max_ticks': self.max_ticks}
+                for seed in self.seeds]
+
+    def score(self, results: List[Dict]) -> Dict:
+        """Agrège les runs d'un placement; `score` est à maximiser"""
+        completed = sum(r['completed'] for r in results)
+        ticks = sum(r['ticks'] for r in results)
+        throughput = TICKS_PER_MINUTE * completed / ticks if ticks else 0.0
+        per_order = []
+        for r in results:
+            per_order += [r['ticks_per_order']] * r['completed']
+            per_order += [self.max_ticks] * (r['total'] - r['completed'])
+        latency = sum(per_order) / len(per_order)
+        return {'throughput': throughput, 'latency': latency, 'completed': completed,
+                'total': sum(r['total'] for r in results),
+                'score': throughput if self.objective == 'throughput' else -latency}
+
+    def evaluate(self, placements: List[Placement], pool=None) -> List[Dict]:
+        """Évalue des placements (résultats mis en cache par placement)"""
+        todo = list({placement_key(p): p for p in placements if placement_key(p) not in self.evaluations}.values())
+        jobs = [(p, s) for p in todo for s in self._scenarios(p)]
+        if pool is None:
+            outputs = [run_scenario(scenario) for _, scenario in jobs]
+        else:
+            outputs = list(pool.map(run_scenario, [scenario for _, scenario in jobs]))
+        by_placement: Dict[Tuple, List[Dict]] = {}
+        for (p, _), result in zip(jobs, outputs):
+            by_placement.setdefault(placement_key(p), []).append(result)
+        for p in todo:
+            key = placement_key(p)
+            self.evaluations[key] = dict(self.score(by_placement[key]), placement=p)
+        return [self.evaluations[placement_key(p)] for p in placements]
+
+    # ----------------------------------------------------------------------
+    # Recherche
+    # ----------------------------------------------------------------------
+
+    def run(self, iterations: int = 20, batch: int = 8, patience: int = 5,
+            initial: Optional[Placement] = None, verbose: bool = True) -> Dict:
+        """Recherche locale; retourne le meilleur placement évalué et son layout"""
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers != 1 else None
+        try:
+            current = initial or self.random_placement()
+            best = self.evaluate([current], pool)[0]
+            self.history = [best['score']]
+            if verbose:
+                print(f"  départ: {self._describe(best)}")
+            stale = 0
+            for it in range(1, iterations + 1):
+                neighbors = [self.neighbor(best['placement']) for _ in range(batch)]
+                challenger = max(self.evaluate(neighbors, pool), key=lambda e: e['score'])
+                if challenger['score'] > best['score']:
+                    best, stale = challenger, 0
+                    if verbose:
+                        print(f"  [{it}/{iterations}] ✅ {self._describe(best)}")
+                else:
+                    stale += 1
+                    if verbose:
+                        print(f"  [{it}/{iterations}] = {self._describe(best)}")
+                self.history.append(best['score'])
+                if stale >= patience:
+                    break
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return dict(best, layout=build_layout(self.base, best['placement'], name=f"{self.base.name}_optimized"))
+
+    def _describe(self, evaluation: Dict) -> str:
+        return (f"{evaluation['throughput']:.2f} cmd/min, {evaluation['latency']:.0f} ticks/cmd "
+                f"({evaluation['completed']}/{evaluation['total']} livrées)")
+
+
+def write_layout(path: str, layout: CompiledLayout, comment: str = ""):
+    """Écrit un layout au format ASCII (relisible par load_layout)"""
+    with open(path, 'w') as f:
+        if comment:
+            f.write(f"# {comment}\n")
+        f.write("\n".join(to_ascii(layout)) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimisation du placement des stations")
+    parser.add_argument('--base', default='classic', help="layout de base (caisses, murs, départs)")
+    parser.add_argument('--agents', type=int, default=2)
+    parser.add_argument('--orders', default='burger', help="recettes séparées par des virgules")
+    parser.add_argument('--stoves', type=int, default=2)
+    parser.add_argument('--boards', type=int, default=2)
+    parser.add_argument('--assembly', type=int, default=1)
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0],
+                        help="plusieurs graines: départs des agents tirés au hasard")
+    parser.add_argument('--objective', choices=['throughput', 'latency'], default='throughput')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--batch', type=int, default=8, help="voisins évalués par itération")
+    parser.add_argument('--patience', type=int, default=5)
+    parser.add_argument('--max-ticks', type=int, default=3000)
+    parser.add_argument('--workers', type=int, default=None, help="processus (défaut: nombre de CPU)")
+    parser.add_argument('--search-seed', type=int, default=0)
+    parser.add_argument('--output', help="écrit le meilleur layout (format ASCII)")
+    args = parser.parse_args(argv)
+
+    base = load_layout(resolve_layout(args.base))
+    optimizer = LayoutOptimizer(base, nb_agents=args.agents, orders=args.orders.split(','),
+                                nb_stoves=args.stoves, nb_boards=args.boards, nb_assembly=args.assembly,
+                                seeds=args.seeds, objective=args.objective, max_ticks=args.max_ticks,
+                                workers=args.workers, rng=random.Random(args.search_seed))
+    print(f"🏗️ Optimisation de {base.name}: {len(optimizer.candidates)} emplacements, "
+          f"objectif {args.objective}")
+
+    start = time.perf_counter()
+    best = optimizer.run(iterations=args.iterations, batch=args.batch, patience=args.patience)
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {len(optimizer.evaluations)} placements évalués en {elapsed:.1f}s")
+    print(f"🏆 {optimizer._describe(best)}\n")
+    print("\n".join(to_ascii(best['layout'])))
+
+    if args.output:
+        write_layout(args.output, best['layout'],
+                     f"{args.orders} / {args.agents} agents: {optimizer._describe(best)}")
+        print(f"\n✅ Layout écrit dans {args.output}")
+    return best
+
+
+if __name__ == "__main__":
+    main()
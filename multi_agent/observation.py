@@ -0,0 +1,202 @@
+"""
+multi_agent/observation.py
+Encodeur d'observations tensorielles (uint8, canaux × hauteur × largeur)
+
+Le tenseur est maintenu de façon incrémentale: l'encodeur est observateur
+de la Kitchen (voir Kitchen.add_observer) et ne réécrit que les cases
+touchées par chaque mutation (déplacement, objet pris/posé, outil occupé,
+table d'assemblage). observation() retourne une vue en lecture seule sur le
+même buffer: aucune copie ni reconstruction par tick.
+
+Canaux:
+- obstacle                   case non marchable
+- crate_<ingrédient>         caisses
+- board, board_busy, stove, stove_busy
+- assembly_table, counter
+- agent_<i>                  position de chaque agent
+- held_<ingrédient>, held_cut, held_cooked, held_dish
+                             objet porté (sur la case de l'agent)
+- assembly_<ingrédient>      contenu de la table (quantité, sur chaque table)
+"""
+
+import sys
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.objects import Ingredient, Tool, Dish
+from common.recipes import ingredient_config
+
+INGREDIENTS = tuple(ingredient_config)
+CUT_STATES = ("coupe", "cut")
+COOKED_STATES = ("cuit", "cooked")
+
+
+def channel_names(num_agents: int) -> List[str]:
+    names = ["obstacle"]
+    names += [f"crate_{name}" for name in INGREDIENTS]
+    names += ["board", "board_busy", "stove", "stove_busy", "assembly_table", "counter"]
+    names += [f"agent_{i}" for i in range(num_agents)]
+    names += [f"held_{name}" for name in INGREDIENTS]
+    names += ["held_cut", "held_cooked", "held_dish"]
+    names += [f"assembly_{name}" for name in INGREDIENTS]
+    return names
+
+
+class ObservationEncoder:
+    """
+    Tenseur d'observation d'une Kitchen multi-agent, mis à jour à chaque mutation
+
+    Usage:
+        encoder = ObservationEncoder(kitchen, agents)   # s'enregistre comme observateur
+        obs = encoder.observation()                     # vue (C, H, W), sans copie
+    """
+
+    def __init__(self, kitchen, agents, attach: bool = True):
+        self.kitchen = kitchen
+        self.agents = list(agents)
+        self.names = channel_names(len(self.agents))
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.tensor = np.zeros((len(self.names), kitchen.height, kitchen.width), dtype=np.uint8)
+        self._view = self.tensor.view()
+        self._view.flags.writeable = False
+
+        i = self.index
+        self._static = slice(i["obstacle"], i["counter"] + 1)
+        self._crate = {name: i[f"crate_{name}"] for name in INGREDIENTS}
+        self._held = {name: i[f"held_{name}"] for name in INGREDIENTS}
+        self._assembly = {name: i[f"assembly_{name}"] for name in INGREDIENTS}
+        self._assembly_channels = slice(i[f"assembly_{INGREDIENTS[0]}"], i[f"assembly_{INGREDIENTS[-1]}"] + 1)
+        self._agent_slot = {agent.id: slot for slot, agent in enumerate(self.agents)}
+
+        # Dernier état écrit par agent: (x, y) et canaux "held" allumés
+        self._agent_cell: Dict[int, Tuple[int, int]] = {}
+        self._agent_held: Dict[int, Tuple[int, ...]] = {}
+        self._assembly_cells: List[Tuple[int, int]] = []
+
+        self.rebuild()
+        if attach:
+            kitchen.add_observer(self)
+
+    # ----------------------------------------------------------------------
+    # Accès
+    # ----------------------------------------------------------------------
+
+    def observation(self) -> np.ndarray:
+        """Vue en lecture seule (C, H, W) sur le tenseur courant"""
+        return self._view
+
+    def channel(self, name: str) -> np.ndarray:
+        return self._view[self.index[name]]
+
+    def detach(self):
+        self.kitchen.remove_observer(self)
+
+    # ----------------------------------------------------------------------
+    # Encodage
+    # ----------------------------------------------------------------------
+
+    def rebuild(self):
+        """Reconstruction complète (initialisation, changement de layout)"""
+        self.tensor[:] = 0
+        self._assembly_cells = []
+        for y in range(self.kitchen.height):
+            for x in range(self.kitchen.width):
+                self._encode_cell(x, y)
+                if self.kitchen.grid[y][x] == 'assembly_table':
+                    self._assembly_cells.append((x, y))
+        self._agent_cell.clear()
+        self._agent_held.clear()
+        for agent in self.agents:
+            self._place_agent(agent)
+        self._encode_assembly()
+
+    def _encode_cell(self, x: int, y: int):
+        t, i = self.tensor, self.index
+        t[self._static, y, x] = 0
+        cell = self.kitchen.grid[y][x]
+        if cell is None:
+            return
+        t[i["obstacle"], y, x] = 1
+        if isinstance(cell, Ingredient):
+            if cell.name in self._crate:
+                t[self._crate[cell.name], y, x] = 1
+        elif isinstance(cell, Tool):
+            kind = "board" if cell.tool_type in ("planche", "cutting_board") else "stove"
+            t[i[kind], y, x] = 1
+            t[i[f"{kind}_busy"], y, x] = 1 if cell.occupied else 0
+        elif cell == 'assembly_table':
+            t[i["assembly_table"], y, x] = 1
+        elif cell == 'counter':
+            t[i["counter"], y, x] = 1
+
+    def _held_channels(self, item) -> Tuple[int, ...]:
+        if item is None:
+            return ()
+        if isinstance(item, Dish):
+            return (self.index["held_dish"],)
+        if isinstance(item, Ingredient):
+            channels = []
+            if item.name in self._held:
+                channels.append(self._held[item.name])
+            if item.state in CUT_STATES:
+                channels.append(self.index["held_cut"])
+            elif item.state in COOKED_STATES:
+                channels.append(self.index["held_cooked"])
+            return tuple(channels)
+        return ()
+
+    def _place_agent(self, agent):
+        x, y = agent.position
+        held = self._held_channels(agent.holding)
+        self.tensor[self.index[f"agent_{self._agent_slot[agent.id]}"], y, x] = 1
+        for c in held:
+            self.tensor[c, y, x] += 1
+        self._agent_cell[agent.id] = (x, y)
+        self._agent_held[agent.id] = held
+
+    def _remove_agent(self, agent_id: int):
+        x, y = self._agent_cell.pop(agent_id)
+        self.tensor[self.index[f"agent_{self._agent_slot[agent_id]}"], y, x] = 0
+        for c in self._agent_held.pop(agent_id):
+            self.tensor[c, y, x] -= 1
+
+    def _encode_assembly(self):
+        counts = np.zeros(len(INGREDIENTS), dtype=np.uint8)
+        for item in self.kitchen.shared_assembly_table:
+            name = getattr(item, 'name', None)
+            if name in self._assembly:
+                counts[INGREDIENTS.index(name)] += 1
+        for x, y in self._assembly_cells:
+            self.tensor[self._assembly_channels, y, x] = counts
+
+    # ----------------------------------------------------------------------
+    # Notifications de la Kitchen
+    # ----------------------------------------------------------------------
+
+    def on_layout_changed(self):
+        self.rebuild()
+
+    def on_tool_changed(self, pos):
+        self._encode_cell(pos[0], pos[1])
+
+    def on_assembly_changed(self):
+        self._encode_assembly()
+
+    def on_agent_moved(self, agent, old_position):
+        if agent.id in self._agent_slot:
+            self._remove_agent(agent.id)
+            self._place_agent(agent)
+
+    def on_holding_changed(self, agent, old_item):
+        if agent.id in self._agent_slot:
+            self._remove_agent(agent.id)
+            self._place_agent(agent)
+
+    def __repr__(self) -> str:
+        c, h, w = self.tensor.shape
+        return f"ObservationEncoder({c} canaux, {w}x{h})"
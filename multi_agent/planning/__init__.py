@@ -1,4 +1,5 @@
 """
 Planning modules for multi-agent system
 STRIPS-based formal planning
+Conflict-Based Search (CBS) for joint agent routes
 """
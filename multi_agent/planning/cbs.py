@@ -0,0 +1,279 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+"""
+cbs.py
+Conflict-Based Search (CBS): chemins conjointement sans collision
+pour les agents en déplacement
+
+Niveau bas: A* espace-temps (attente autorisée) sous contraintes (case, instant).
+Niveau haut: arbre de contraintes ordonné par somme des coûts; au premier
+conflit entre deux agents, deux branches interdisent la situation à l'un
+puis à l'autre. Conflits détectés:
+- sommet: deux agents sur la même case au même instant
+- suivi: un agent entre dans une case qu'un autre occupait à l'instant
+  précédent (les agents voient les positions du début de tick; couvre
+  aussi les échanges de cases)
+
+Un agent arrivé reste sur sa case d'arrivée. La recherche est bornée
+(time_budget secondes, max_nodes noeuds): au-delà, plan() renvoie None et
+les agents reviennent à leur planification individuelle.
+"""
+
+import heapq
+import time
+from collections import deque
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+Position = Tuple[int, int]
+
+
+class CBSPlanner:
+    """
+    Planificateur CBS sur le masque de cases marchables (kitchen.walkable)
+
+    time_budget: secondes par appel à plan() (None: pas de limite de temps)
+    max_nodes: noeuds de l'arbre de contraintes développés au maximum
+    """
+
+    def __init__(self, mask, time_budget: Optional[float] = 0.005, max_nodes: int = 256):
+        self.mask = mask
+        self.time_budget = time_budget
+        self.max_nodes = max_nodes
+
+        # Statistiques
+        self.calls = 0
+        self.solved = 0
+        self.fallbacks = 0
+        self.nodes_expanded = 0
+        self.last_time = 0.0
+
+    # ----------------------------------------------------------------------
+    # Niveau bas
+    # ----------------------------------------------------------------------
+    def _distances(self, goals: Set[int], static: Set[int]) -> Dict[int, int]:
+        """Distances exactes vers l'arrivée la plus proche (heuristique du niveau bas)"""
+        cells, offsets = self.mask.cells, self.mask.offsets
+        dist = {g: 0 for g in goals}
+        queue = deque(goals)
+        while queue:
+            u = queue.popleft()
+            du = dist[u] + 1
+            for d in offsets:
+                v = u + d
+                if cells[v] and v not in dist and v not in static:
+                    dist[v] = du
+                    queue.append(v)
+        return dist
+
+    def _low_level(self, start: int, goals: Set[int], dist: Dict[int, int],
+                   forbidden: FrozenSet[Tuple[int, int]], static: Set[int]) -> Optional[List[int]]:
+        """A* espace-temps: chemin (start inclus) qui respecte les contraintes (case, instant)"""
+        if start not in dist or (start, 0) in forbidden:
+            return None
+        cells, offsets = self.mask.cells, self.mask.offsets
+        moves = (0,) + tuple(offsets)
+
+        # Rester sur l'arrivée n'est possible qu'après sa dernière contrainte
+        last_forbidden: Dict[int, int] = {}
+        for cell, t in forbidden:
+            if cell in goals and t > last_forbidden.get(cell, -1):
+                last_forbidden[cell] = t
+        horizon = dist[start] + 2 * len(forbidden) + 4
+
+        parent = {(start, 0): None}
+        open_set = [(dist[start], 0, start)]
+        while open_set:
+            _, neg_t, u = heapq.heappop(open_set)
+            t = -neg_t
+            if u in goals and t > last_forbidden.get(u, -1):
+                path, node = [], (u, t)
+                while node is not None:
+                    path.append(node[0])
+                    node = parent[node]
+                return path[::-1]
+            if t >= horizon:
+                continue
+            for d in moves:
+                v = u + d
+                if d and (not cells[v] or v in static):
+                    continue
+                state = (v, t + 1)
+                if state in parent or state in forbidden or v not in dist:
+                    continue
+                parent[state] = (u, t)
+                heapq.heappush(open_set, (t + 1 + dist[v], -(t + 1), v))
+        return None
+
+    # ----------------------------------------------------------------------
+    # Niveau haut
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _first_conflict(paths: Dict[int, List[int]]):
+        """(agent, case, instant) à interdire pour chaque branche, ou None"""
+        horizon = max(len(p) for p in paths.values())
+        for t in range(1, horizon):
+            here: Dict[int, int] = {}
+            before: Dict[int, int] = {}
+            for a, p in paths.items():
+                v = p[min(t, len(p) - 1)]
+                if v in here:
+                    return [(here[v], v, t), (a, v, t)]
+                here[v] = a
+                before[p[min(t - 1, len(p) - 1)]] = a
+            for a, p in paths.items():
+                v, u = p[min(t, len(p) - 1)], p[min(t - 1, len(p) - 1)]
+                b = before.get(v)
+                if v != u and b is not None and b != a:
+                    return [(a, v, t), (b, v, t - 1)]
+        return None
+
+    def plan(self, starts: Dict[int, Position], goals: Dict[int, Set[Position]],
+             static: Set[Position] = frozenset()) -> Optional[Dict[int, List[Position]]]:
+        """
+        Chemins sans conflit (positions à partir de t=1, attentes incluses) pour chaque agent
+        starts: agent -> position; goals: agent -> cases d'arrivée; static: cases bloquées
+        None si aucune solution dans le budget
+        """
+        self.calls += 1
+        t0 = time.perf_counter()
+        try:
+            paths = self._search(starts, goals, static, t0)
+        finally:
+            self.last_time = time.perf_counter() - t0
+        if paths is None:
+            self.fallbacks += 1
+            return None
+        self.solved += 1
+        position = self.mask.position
+        return {a: [position(i) for i in p[1:]] for a, p in paths.items()}
+
+    def _search(self, starts, goals, static, t0) -> Optional[Dict[int, List[int]]]:
+        index = self.mask.index
+        blocked = {index(x, y) for x, y in static}
+        start_of = {a: index(*p) for a, p in starts.items()}
+        goals_of = {a: {index(*g) for g in gs} - blocked for a, gs in goals.items()}
+        dist = {a: self._distances(goals_of[a], blocked) for a in starts}
+
+        constraints: Dict[int, FrozenSet[Tuple[int, int]]] = {a: frozenset() for a in starts}
+        paths = {}
+        for a in starts:
+            path = self._low_level(start_of[a], goals_of[a], dist[a], constraints[a], blocked)
+            if path is None:
+                return None
+            paths[a] = path
+
+        counter = 0
+        open_set = [(sum(len(p) - 1 for p in paths.values()), counter, constraints, paths)]
+        expanded = 0
+        while open_set:
+            if expanded >= self.max_nodes:
+                return None
+            if self.time_budget is not None and time.perf_counter() - t0 > self.time_budget:
+                return None
+            _, _, constraints, paths = heapq.heappop(open_set)
+            expanded += 1
+            self.nodes_expanded += 1
+
+            conflict = self._first_conflict(paths)
+            if conflict is None:
+                return paths
+
+            for agent, cell, t in conflict:
+                child = dict(constraints)
+                child[agent] = constraints[agent] | {(cell, t)}
+                path = self._low_level(start_of[agent], goals_of[agent], dist[agent], child[agent], blocked)
+                if path is None:
+                    continue
+                child_paths = dict(paths)
+                child_paths[agent] = path
+                counter += 1
+                cost = sum(len(p) - 1 for p in child_paths.values())
+                heapq.heappush(open_set, (cost, counter, child, child_paths))
+        return None
+
+
+class CBSCoordinator:
+    """
+    Planification jointe des agents en déplacement, appelée par le jeu avant
+    agent.update() à chaque tick
+
+    Les agents qui marchent vers une cible (agent.move_target) reçoivent un
+    chemin (agent.joint_route) qu'ils suivent un pas par tick. Un nouveau
+    plan n'est calculé que si l'ensemble des agents en déplacement, leurs
+    cibles, ou leur position attendue changent. Sans solution dans le
+    budget, les agents utilisent leur planificateur individuel (jusqu'au
+    prochain changement de situation).
+    """
+
+    def __init__(self, kitchen, time_budget: Optional[float] = 0.005, max_nodes: int = 256):
+        self.kitchen = kitchen
+        self.planner = CBSPlanner(kitchen.walkable, time_budget, max_nodes)
+        self.plans: Dict[int, Tuple[Position, List[Position]]] = {}
+        self.plan_tick = 0
+        self._starts: Dict[int, Position] = {}
+        self._failed = None
+        self.replans = 0
+
+    def _goals(self, target) -> Set[Position]:
+        x, y = target
+        return {p for p in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)) if self.kitchen.is_walkable(p)}
+
+    def _is_moving(self, agent) -> bool:
+        return (agent.current_task is not None and agent.action_timer == 0
+                and agent.move_target is not None and not agent._is_adjacent(agent.move_target))
+
+    def _still_valid(self, moving, tick) -> bool:
+        if {a.id for a in moving} - set(self.plans):
+            return False
+        k = tick - self.plan_tick
+        for agent in moving:
+            target, path = self.plans[agent.id]
+            if target != tuple(agent.move_target) or k > len(path):
+                return False
+            expected = path[k - 1] if k > 0 else self._starts[agent.id]
+            if tuple(agent.position) != expected:
+                return False
+        return True
+
+    def update(self, agents, tick: int):
+        moving = [a for a in agents if self._is_moving(a)]
+        if not moving:
+            self.plans = {}
+            return
+        if self.plans and self._still_valid(moving, tick):
+            return
+
+        moving_ids = {a.id for a in moving}
+        starts = {a.id: tuple(a.position) for a in moving}
+        static = {tuple(a.position) for a in agents if a.id not in moving_ids}
+        situation = (frozenset((a.id, starts[a.id], tuple(a.move_target)) for a in moving), frozenset(static))
+        if situation == self._failed:
+            return  # même situation que le dernier échec: planification individuelle
+
+        self.replans += 1
+        goals = {a.id: self._goals(a.move_target) for a in moving}
+        paths = self.planner.plan(starts, goals, static)
+
+        self.plan_tick = tick
+        self._starts = starts
+        if paths is None:
+            self._failed = situation
+            self.plans = {}
+            for agent in moving:
+                agent.joint_route = None
+            return
+        self._failed = None
+        self.plans = {a.id: (tuple(a.move_target), paths[a.id]) for a in moving}
+        for agent in moving:
+            agent.joint_route = (tuple(agent.move_target), deque(paths[agent.id]))
+
+    def stats(self) -> Dict[str, float]:
+        p = self.planner
+        return {
+            'replans': self.replans,
+            'solved': p.solved,
+            'fallbacks': p.fallbacks,
+            'nodes_expanded': p.nodes_expanded,
+        }
@@ -0,0 +1,203 @@
+"""
+multi_agent/render_loop.py
+Découplage simulation / rendu
+
+La simulation tourne dans un thread dédié à son propre rythme (ticks/s) et
+publie après chaque tick un instantané immuable de ce qui est affiché
+(positions, objets portés, état des outils, contenu de la table d'assemblage).
+Le thread principal (Pygame) dessine au rythme de l'écran le plus récent
+instantané disponible: les frames intermédiaires sont simplement ignorées.
+"""
+
+import sys
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.objects import Ingredient, Tool
+
+
+def _copy_item(item):
+    """Copie indépendante d'un objet porté (l'original reste à la simulation)"""
+    if isinstance(item, Ingredient):
+        position = tuple(item.position) if item.position else None
+        return Ingredient(item.name, item.state, position)
+    if isinstance(item, Tool):
+        copy = Tool(item.tool_type, item.position)
+        copy.occupied = item.occupied
+        return copy
+    return item
+
+
+@dataclass(frozen=True)
+class AgentView:
+    """État affichable d'un agent"""
+    id: int
+    position: Tuple[int, int]
+    direction: str
+    holding: Any
+    current_action: str
+
+
+@dataclass(frozen=True)
+class ToolView:
+    """État d'un outil de la grille"""
+    tool_type: str
+    position: Tuple[int, int]
+    occupied: bool
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    """
+    Instantané immuable d'un tick de simulation
+
+    Ne partage aucun objet mutable avec la simulation: le rendu peut le
+    lire sans verrou pendant que le tick suivant est calculé.
+    """
+    seq: int
+    tick: int
+    agents: Tuple[AgentView, ...]
+    tools: Tuple[ToolView, ...]
+    assembly: Tuple[Ingredient, ...]
+    counter_dishes: Tuple[Dict[str, Any], ...]
+    score: int
+    current_order: Optional[str]
+    order_queue_len: int
+    pending_orders: Tuple[str, ...]
+    awaiting_recipe_choice: bool
+    traffic: Any = None  # copie de la carte de chaleur (overlay affiché), sinon None
+
+    @classmethod
+    def capture(cls, game, seq: int = 0,
+                tool_positions: Optional[List[Tuple[int, int]]] = None) -> "FrameSnapshot":
+        """Copie l'état affichable du jeu (à appeler sous game.state_lock)"""
+        kitchen = game.kitchen
+        if tool_positions is None:
+            tool_positions = [(x, y) for y in range(kitchen.height) for x in range(kitchen.width)
+                              if isinstance(kitchen.grid[y][x], Tool)]
+        tools = []
+        for x, y in tool_positions:
+            cell = kitchen.grid[y][x]
+            if isinstance(cell, Tool):
+                tools.append(ToolView(cell.tool_type, (x, y), cell.occupied))
+
+        return cls(
+            seq=seq,
+            tick=game.tick,
+            agents=tuple(
+                AgentView(agent.id, tuple(agent.position), agent.direction,
+                          _copy_item(agent.holding), agent.current_action)
+                for agent in game.agents
+            ),
+            tools=tuple(tools),
+            assembly=tuple(_copy_item(ing) for ing in kitchen.shared_assembly_table),
+            counter_dishes=tuple(dict(d) for d in kitchen.counter_dishes),
+            score=game.score,
+            current_order=game.current_order,
+            order_queue_len=len(game.order_queue),
+            pending_orders=tuple(game.pending_orders),
+            awaiting_recipe_choice=game.awaiting_recipe_choice,
+            traffic=game.traffic.as_array().copy()
+            if game.traffic is not None and game.traffic.show_overlay else None,
+        )
+
+
+class FrameMailbox:
+    """
+    Boîte aux lettres à une place: ne conserve que le dernier instantané
+
+    Un instantané remplacé avant d'avoir été lu est compté comme ignoré.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame: Optional[FrameSnapshot] = None
+        self._taken = True
+        self.published = 0
+        self.rendered = 0
+        self.dropped = 0
+
+    def publish(self, frame: FrameSnapshot):
+        with self._lock:
+            if not self._taken:
+                self.dropped += 1
+            self._frame = frame
+            self._taken = False
+            self.published += 1
+
+    def take(self) -> Optional[FrameSnapshot]:
+        """Retourne le dernier instantané s'il n'a pas encore été lu, sinon None"""
+        with self._lock:
+            if self._taken:
+                return None
+            self._taken = True
+            self.rendered += 1
+            return self._frame
+
+    def peek(self) -> Optional[FrameSnapshot]:
+        """Dernier instantané publié (lu ou non)"""
+        with self._lock:
+            return self._frame
+
+
+class SimulationThread(threading.Thread):
+    """
+    Fait avancer la simulation à `ticks_per_second` (0 = aussi vite que possible)
+    et publie un instantané après chaque tick
+    """
+
+    def __init__(self, game, ticks_per_second: float = 10.0,
+                 mailbox: Optional[FrameMailbox] = None, idle_interval: float = 1 / 30):
+        super().__init__(name="simulation", daemon=True)
+        self.game = game
+        self.ticks_per_second = ticks_per_second
+        self.mailbox = mailbox or FrameMailbox()
+        self.idle_interval = idle_interval
+        self._stop_event = threading.Event()
+        self._seq = 0
+        self._last_idle_key = None
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _publish(self):
+        self.mailbox.publish(self.game.snapshot(self._seq))
+        self._seq += 1
+
+    def run(self):
+        game = self.game
+        period = 1.0 / self.ticks_per_second if self.ticks_per_second > 0 else 0.0
+        next_tick = time.perf_counter()
+
+        while not self._stop_event.is_set() and game.running:
+            with game.state_lock:
+                if game.awaiting_recipe_choice:
+                    # En attente de commande: republie seulement si l'interface a changé
+                    key = (game.tick, tuple(game.pending_orders))
+                    if key != self._last_idle_key:
+                        self._last_idle_key = key
+                        self._publish()
+                    idle = True
+                else:
+                    game.update()
+                    self._publish()
+                    idle = False
+
+            if idle:
+                self._stop_event.wait(self.idle_interval)
+                next_tick = time.perf_counter()
+            elif period:
+                next_tick += period
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                else:
+                    next_tick = time.perf_counter()  # en retard: pas de rattrapage en rafale
+            else:
+                time.sleep(0)  # laisse le thread de rendu prendre le verrou
@@ -0,0 +1,283 @@
+"""
+multi_agent/sweep.py
+Balayage headless de configurations de cuisine (planification de capacité)
+
+Chaque combinaison (agents × poêles × planches × tables × graine × commandes)
+est simulée sans affichage dans un processus du pool; les rapports de
+PerformanceMetrics sont agrégés dans un seul tableau.
+
+Usage:
+    python multi_agent/sweep.py --agents 1 2 3 4 --stoves 1 2 --boards 1 2 \\
+        --seeds 0 1 2 --orders burger burger,pizza --csv sweep.csv
+
+    --check-determinism N : chaque scénario est joué deux fois, l'état est haché
+    tous les N ticks et toute divergence entre les deux runs est signalée.
+
+    --layouts classic food_court_32 ... : cartes fixes (dossier layouts/) à la
+    place des cuisines générées; poêles, planches et tables viennent de la carte.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.recipes import recipes
+from common.layouts import list_layouts, load_layout, resolve_layout
+
+CONFIG_KEYS = ('nb_agents', 'nb_stoves', 'nb_boards', 'nb_assembly')
+
+
+def build_scenarios(agents: Sequence[int], stoves: Sequence[int], boards: Sequence[int],
+                    assembly: Sequence[int], seeds: Sequence[int],
+                    order_mixes: Sequence[Sequence[str]], max_ticks: int = 5000,
+                    hash_every: Optional[int] = None,
+                    layouts: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Produit cartésien des paramètres -> liste de scénarios
+    layouts: cartes fixes (remplacent le produit poêles × planches × tables)
+    """
+    for mix in order_mixes:
+        for recipe in mix:
+            if recipe not in recipes:
+                raise ValueError(f"Recette inconnue: {recipe}")
+    if layouts:
+        kitchens = []
+        for name in layouts:
+            path = resolve_layout(name)
+            layout = load_layout(path)
+            kitchens.append((layout.count('stove'), layout.count('cutting_board'),
+                             layout.count('assembly_table'), path))
+    else:
+        kitchens = [(s, b, t, None) for s, b, t in itertools.product(stoves, boards, assembly)]
+    return [
+        {'nb_agents': a, 'nb_stoves': s, 'nb_boards': b, 'nb_assembly': t, 'layout': layout,
+         'seed': seed, 'orders': list(mix), 'max_ticks': max_ticks, 'hash_every': hash_every}
+        for a, (s, b, t, layout), seed, mix in itertools.product(agents, kitchens, seeds, order_mixes)
+    ]
+
+
+def _layout_name(layout) -> Optional[str]:
+    """Nom d'un layout donné par chemin ou déjà compilé"""
+    if not layout:
+        return None
+    if isinstance(layout, str):
+        return os.path.splitext(os.path.basename(layout))[0]
+    return layout.name
+
+
+def run_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Simule un scénario sans affichage (exécuté dans un processus du pool)"""
+    from multi_agent.main import MultiAgentOvercookedGame
+
+    config = {key: scenario[key] for key in CONFIG_KEYS}
+    config.update(headless=True, profile=False, seed=scenario['seed'],
+                  hash_every=scenario.get('hash_every'), layout=scenario.get('layout'),
+                  random_starts=scenario.get('random_starts', False))
+
+    wall_start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame(config)
+        for recipe in scenario['orders']:
+            game.add_recipe_to_order(recipe)
+        game.send_orders()
+
+        order_ticks = []
+        last_score, last_tick = 0, 0
+        while not game.awaiting_recipe_choice and game.tick < scenario['max_ticks']:
+            game.update()
+            if game.score != last_score:
+                order_ticks.append(game.tick - last_tick)
+                last_score, last_tick = game.score, game.tick
+        report = game.metrics.generate_report()
+    wall = time.perf_counter() - wall_start
+
+    completed = len(order_ticks)
+    return {
+        **{key: scenario[key] for key in CONFIG_KEYS},
+        'layout': _layout_name(scenario.get('layout')),
+        'seed': scenario['seed'],
+        'orders': '+'.join(scenario['orders']),
+        'completed': completed,
+        'total': len(scenario['orders']),
+        'ticks': game.tick,
+        'ticks_per_order': sum(order_ticks) / completed if completed else None,
+        'distance': report['performance']['total_distance'],
+        'idle_time': report['performance']['total_idle_time'],
+        'workload_balance': report['workload_balance'],
+        'deadlocks': report['deadlocks']['count'],
+        'wall_s': wall,
+        'ticks_per_s': game.tick / wall if wall > 0 else 0.0,
+        'state_digest': game.state_hasher.digest() if game.state_hasher else None,
+        'state_hashes': game.state_hasher.hashes if game.state_hasher else None,
+        'report': report,
+    }
+
+
+def run_sweep(scenarios: List[Dict[str, Any]], workers: Optional[int] = None,
+              verbose: bool = True) -> List[Dict[str, Any]]:
+    """Répartit les scénarios sur un ProcessPoolExecutor (workers=1: en série)"""
+    results = []
+    if workers == 1:
+        for i, scenario in enumerate(scenarios, 1):
+            results.append(run_scenario(scenario))
+            if verbose:
+                print(f"  [{i}/{len(scenarios)}] {_describe(results[-1])}")
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_scenario, scenario) for scenario in scenarios]
+            for i, future in enumerate(as_completed(futures), 1):
+                results.append(future.result())
+                if verbose:
+                    print(f"  [{i}/{len(scenarios)}] {_describe(results[-1])}")
+    results.sort(key=lambda r: (r['layout'] or '',) + tuple(r[k] for k in CONFIG_KEYS) + (r['orders'], r['seed']))
+    return results
+
+
+def check_determinism(scenarios: List[Dict[str, Any]], hash_every: int = 10,
+                      workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Joue chaque scénario deux fois et retourne ceux dont les hachages divergent"""
+    from multi_agent.analytics.determinism import first_divergence
+
+    scenarios = [dict(s, hash_every=hash_every) for s in scenarios]
+    first = run_sweep(scenarios, workers=workers, verbose=False)
+    second = run_sweep(scenarios, workers=workers, verbose=False)
+    mismatches = []
+    for a, b in zip(first, second):
+        if a['state_digest'] != b['state_digest']:
+            mismatches.append(dict(a, diverged_at=first_divergence(a['state_hashes'], b['state_hashes'])))
+    return mismatches
+
+
+def _describe(row: Dict[str, Any]) -> str:
+    layout = f"{row['layout']} " if row.get('layout') else ""
+    return (f"{layout}{row['nb_agents']}a/{row['nb_stoves']}p/{row['nb_boards']}b/{row['nb_assembly']}t "
+            f"seed={row['seed']} {row['orders']}: {row['completed']}/{row['total']} en {row['ticks']} ticks")
+
+
+def aggregate(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Moyenne des runs par (configuration, commandes) sur l'ensemble des graines"""
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in results:
+        key = (row.get('layout'),) + tuple(row[k] for k in CONFIG_KEYS) + (row['orders'],)
+        groups.setdefault(key, []).append(row)
+
+    def mean(values):
+        values = [v for v in values if v is not None]
+        return sum(values) / len(values) if values else None
+
+    table = []
+    for key, rows in groups.items():
+        table.append({
+            **dict(zip(('layout',) + CONFIG_KEYS + ('orders',), key)),
+            'runs': len(rows),
+            'success_rate': sum(r['completed'] == r['total'] for r in rows) / len(rows),
+            'ticks': mean(r['ticks'] for r in rows),
+            'ticks_per_order': mean(r['ticks_per_order'] for r in rows),
+            'distance': mean(r['distance'] for r in rows),
+            'idle_time': mean(r['idle_time'] for r in rows),
+            'workload_balance': mean(r['workload_balance'] for r in rows),
+            'deadlocks': mean(r['deadlocks'] for r in rows),
+        })
+    return table
+
+
+def format_table(table: List[Dict[str, Any]]) -> str:
+    """Tableau texte du résultat agrégé (colonne layout si des cartes fixes sont utilisées)"""
+    width = max([len(row['layout'] or '') for row in table] + [0])
+    layout_col = lambda v: f"{v or '-':<{width}}  " if width else ""
+    header = (f"{layout_col('layout')}{'agents':>6} {'poêles':>6} {'planches':>8} {'tables':>6}  {'commandes':<20} "
+              f"{'runs':>4} {'succès':>7} {'ticks':>7} {'ticks/cmd':>9} {'distance':>8} "
+              f"{'inactif':>8} {'équilibre':>9}")
+    lines = [header, "-" * len(header)]
+    fmt = lambda v, spec: format(v, spec) if v is not None else "-".rjust(int(spec.split('.')[0]))
+    for row in table:
+        lines.append(
+            f"{layout_col(row['layout'])}{row['nb_agents']:>6} {row['nb_stoves']:>6} {row['nb_boards']:>8} {row['nb_assembly']:>6}  "
+            f"{row['orders']:<20} {row['runs']:>4} {row['success_rate'] * 100:>6.0f}% "
+            f"{fmt(row['ticks'], '7.0f')} {fmt(row['ticks_per_order'], '9.1f')} "
+            f"{fmt(row['distance'], '8.1f')} {fmt(row['idle_time'], '8.1f')} "
+            f"{fmt(row['workload_balance'], '9.2f')}"
+        )
+    return "\n".join(lines)
+
+
+def write_csv(filename: str, results: List[Dict[str, Any]]):
+    """Exporte un run par ligne (sans le rapport détaillé)"""
+    fields = [k for k in results[0] if k not in ('report', 'state_hashes')]
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Balayage headless de configurations de cuisine")
+    parser.add_argument('--agents', type=int, nargs='+', default=[1, 2, 3, 4])
+    parser.add_argument('--stoves', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--boards', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--assembly', type=int, nargs='+', default=[1])
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0])
+    parser.add_argument('--orders', nargs='+', default=['burger'],
+                        help="mélanges de commandes, recettes séparées par des virgules (ex: burger,pizza)")
+    parser.add_argument('--max-ticks', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=None, help="processus (défaut: nombre de CPU)")
+    parser.add_argument('--csv', help="export CSV d'un run par ligne")
+    parser.add_argument('--json', help="export JSON des rapports complets")
+    parser.add_argument('--check-determinism', type=int, metavar='N',
+                        help="rejoue chaque scénario et compare l'état haché tous les N ticks")
+    parser.add_argument('--layouts', nargs='*',
+                        help="cartes fixes (noms dans layouts/ ou chemins); sans valeur: toute la bibliothèque")
+    args = parser.parse_args(argv)
+
+    order_mixes = [mix.split(',') for mix in args.orders]
+    layouts = args.layouts
+    if layouts is not None and not layouts:
+        layouts = list_layouts()
+    scenarios = build_scenarios(args.agents, args.stoves, args.boards, args.assembly,
+                                args.seeds, order_mixes, args.max_ticks, layouts=layouts)
+
+    if args.check_determinism:
+        print(f"🔁 Vérification du déterminisme: {len(scenarios)} scénarios × 2 runs")
+        mismatches = check_determinism(scenarios, args.check_determinism, workers=args.workers)
+        for row in mismatches:
+            print(f"  ❌ {_describe(row)} — divergence au tick {row['diverged_at']}")
+        if not mismatches:
+            print("  ✅ Tous les runs sont reproductibles")
+        return mismatches
+
+    print(f"🧪 Balayage: {len(scenarios)} scénarios")
+
+    start = time.perf_counter()
+    results = run_sweep(scenarios, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    total_ticks = sum(r['ticks'] for r in results)
+    print(f"\n✅ {len(results)} scénarios en {elapsed:.1f}s ({total_ticks / elapsed:.0f} ticks/s au total)\n")
+    print(format_table(aggregate(results)))
+
+    if args.csv:
+        write_csv(args.csv, results)
+        print(f"\n✅ Résultats exportés vers {args.csv}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"✅ Rapports exportés vers {args.json}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,11 @@ from common.recipes import recipes
 from multi_agent.planning.strips import STRIPSPlanner, create_initial_world_state
 from multi_agent.coordination.task_market import TaskMarket
 from multi_agent.coordination.communication import Blackboard, AgentCommunicator, MessageType
-from multi_agent.analytics.metrics import PerformanceMetrics
+from multi_agent.analytics.metrics import PerformanceMetrics, OrderMetrics
+from multi_agent.coordination.task_market import Task, Bid
+from multi_agent.coordination.communication import Message
+from multi_agent.planning.strips import ActionType
+from common.objects import Ingredient, Tool, Dish, Station
 
 
 def test_basic_cooperation():
@@ -141,12 +145,31 @@ def test_resource_locking():
     print("="*60 + "\n")
 
 
+def test_hot_objects_are_slotted():
+    """Objets créés en masse (messages, enchères, ingrédients...): pas de __dict__ par instance"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Objets compacts (__slots__)")
+    print("="*60)
+
+    objects = [
+        Ingredient('tomato'), Tool('stove', (1, 1)), Dish('burger', []), Station('counter', (0, 0)),
+        Task(0, ActionType.PICKUP, {}, [], 1.0, 0), Bid(0, 0, 1.0, 0.0),
+        Message(0, MessageType.POSITION_UPDATE, 0, None, 0.0, {}), OrderMetrics(0, 'burger', 0.0),
+    ]
+    for obj in objects:
+        assert not hasattr(obj, '__dict__'), type(obj).__name__
+    # Les dataclasses gardent comparaison et tri
+    assert Bid(0, 1, 1.0, 0.0) == Bid(0, 1, 1.0, 0.0) and Bid(0, 1, 1.0, 0.0) < Bid(1, 1, 2.0, 0.0)
+    print(f"   ✅ {len(objects)} classes sans __dict__")
+
+
 if __name__ == "__main__":
     print("\n🚀 SUITE DE TESTS MULTI-AGENTS\n")
 
     try:
         test_resource_locking()
         test_basic_cooperation()
+        test_hot_objects_are_slotted()
 
         print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
 
@@ -0,0 +1,68 @@
+"""Test de la reproductibilité des runs à graine fixée"""
+
+import os
+import sys
+import io
+import contextlib
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from multi_agent.main import MultiAgentOvercookedGame
+from multi_agent.analytics.determinism import first_divergence
+
+
+def _run(seed, ticks=400, **extra):
+    config = {'nb_agents': 3, 'nb_stoves': 2, 'nb_boards': 2, 'nb_assembly': 1,
+              'headless': True, 'seed': seed, 'hash_every': 10, **extra}
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame(config)
+        for recipe in ("burger", "pizza"):
+            game.add_recipe_to_order(recipe)
+        game.send_orders()
+        for _ in range(ticks):
+            game.update()
+    return game
+
+
+def _tool_layout(game):
+    kitchen = game.kitchen
+    return [(x, y, str(kitchen.grid[y][x])) for y in range(kitchen.height) for x in range(kitchen.width)
+            if kitchen.grid[y][x] is not None]
+
+
+def test_same_seed_same_run():
+    """Même graine => même cuisine et même suite d'états"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Déterminisme")
+    print("="*60)
+
+    a, b = _run(seed=7), _run(seed=7)
+    assert _tool_layout(a) == _tool_layout(b)
+    assert a.state_hasher.hashes, "Des hachages auraient dû être enregistrés"
+    assert first_divergence(a.state_hasher.hashes, b.state_hasher.hashes) is None
+    assert a.state_hasher.digest() == b.state_hasher.digest()
+    print(f"   ✅ {a.state_hasher} identiques")
+
+
+def test_seed_changes_layout():
+    """Des graines différentes placent les outils différemment"""
+    layouts = {tuple(_tool_layout(_run(seed=s, ticks=0))) for s in range(4)}
+    assert len(layouts) > 1
+
+
+def test_divergence_is_located():
+    """La première divergence est reportée au bon tick"""
+    a = [(10, "x"), (20, "y"), (30, "z")]
+    assert first_divergence(a, a) is None
+    assert first_divergence(a, [(10, "x"), (20, "?"), (30, "z")]) == 20
+    assert first_divergence(a, a[:2]) == 21
+
+
+if __name__ == "__main__":
+    test_same_seed_same_run()
+    test_seed_changes_layout()
+    test_divergence_is_located()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
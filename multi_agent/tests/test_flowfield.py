@@ -0,0 +1,107 @@
+"""Test des champs de flux partagés par les agents qui vont vers la même cible"""
+
+import os
+import sys
+import io
+import contextlib
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.flowfield import FlowFieldPlanner, shared_flow_fields
+from common.layouts import load_layout, resolve_layout
+from common.pathfinding import DStarLite, PathPlanner, make_planner
+from common.walkability import WalkabilityMask
+from multi_agent.main import MultiAgentOvercookedGame
+
+
+def _mask(name):
+    layout = load_layout(resolve_layout(name))
+    mask = WalkabilityMask(layout.width, layout.height)
+    for y in range(layout.height):
+        for x in range(layout.width):
+            mask.set(x, y, bool(layout.walkable[y, x]))
+    return layout, mask
+
+
+def test_field_matches_shortest_paths():
+    """Le champ suit les plus courts chemins, les mêmes pas que D* Lite sans trafic"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Champs de flux")
+    print("="*60)
+
+    layout, mask = _mask('food_court_32')
+    free = [(x, y) for y in range(layout.height) for x in range(layout.width) if layout.walkable[y, x]]
+    target = next((x, y) for y in range(layout.height) for x in range(layout.width)
+                  if not layout.walkable[y, x] and any(mask.is_walkable(p) for p in
+                                                       ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))))
+    flow, dstar = make_planner(mask, 'flow'), make_planner(mask, 'dstar')
+    assert isinstance(flow, FlowFieldPlanner)
+    field = flow.fields.get(target)
+    t = mask.index(*target)
+    goals = [t + d for d in mask.offsets if mask.cells[t + d]]
+    for start in free[::37]:
+        position, steps = start, 0
+        while True:
+            step = flow.next_step(position, target)
+            assert step == dstar.next_step(position, target)
+            if step is None:
+                break
+            position, steps = step, steps + 1
+        s = mask.index(*start)
+        assert steps == field.dist[s] == len(DStarLite(mask, s, goals).path())
+    assert flow.fields.built == 1  # un seul champ pour tous les départs
+    print(f"  ✅ {flow.lookups} pas lus dans un seul champ")
+
+
+def test_fields_shared_and_rebuilt():
+    """Un champ par cible partagé par les planificateurs, oublié quand la grille change"""
+    layout, mask = _mask('classic')
+    a, b = FlowFieldPlanner(mask, PathPlanner(mask)), FlowFieldPlanner(mask, PathPlanner(mask))
+    assert a.fields is b.fields is shared_flow_fields(mask)
+    target = (8, 8)
+    a.next_step((1, 1), target)
+    b.next_step((14, 14), target)
+    assert a.fields.built == 1
+
+    # Mur sur le chemin: nouveau champ, qui le contourne
+    field = a.fields.get(target)
+    step = mask.position(mask.index(1, 1) + field.step[mask.index(1, 1)])
+    mask.set(step[0], step[1], False)
+    assert a.next_step((1, 1), target) != step
+    assert a.fields.built == 2 and a.fields.get(target) is not field
+
+
+def test_blocked_step_and_game():
+    """Case suivante occupée: autre voisin ou contournement D* Lite; le jeu termine"""
+    mask = WalkabilityMask(5, 3, walkable=True)
+    planner = FlowFieldPlanner(mask, PathPlanner(mask))
+    assert planner.next_step((0, 1), (4, 1), adjacent=False) == (1, 1)
+    detour = planner.next_step((0, 1), (4, 1), {(1, 1)}, adjacent=False)
+    assert detour in {(0, 0), (0, 2)} and planner.repairs == 1
+    assert planner.next_step(detour, (4, 1), {(1, 1)}, adjacent=False) == (1, detour[1])
+    assert planner.fallback.searches == 1  # le contournement garde son chemin D* Lite
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame({'nb_agents': 4, 'headless': True, 'seed': 0,
+                                         'layout': 'classic', 'pathfinding': 'flow'})
+        for recipe in ['burger', 'pizza']:
+            game.add_recipe_to_order(recipe)
+        game.send_orders()
+        while not game.awaiting_recipe_choice and game.tick < 1500:
+            game.update()
+
+    assert game.awaiting_recipe_choice
+    planners = [agent.path_planner for agent in game.agents]
+    lookups = sum(p.lookups for p in planners)
+    assert lookups > 10 * planners[0].fields.built
+    print(f"  ✅ {game.tick} ticks, {lookups} lectures, {planners[0].fields.built} champs calculés")
+
+
+if __name__ == "__main__":
+    test_field_matches_shortest_paths()
+    test_fields_shared_and_rebuilt()
+    test_blocked_step_and_game()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
@@ -0,0 +1,118 @@
+"""Test de la recherche de chemin hiérarchique (HPA*) pour les grandes cuisines"""
+
+import os
+import sys
+import io
+import random
+import contextlib
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.hpa import ClusterGraph, HierarchicalPlanner
+from common.layouts import load_layout, resolve_layout
+from common.pathfinding import DStarLite, PathPlanner, make_planner
+from common.walkability import WalkabilityMask
+from multi_agent.main import MultiAgentOvercookedGame
+
+
+def _mask(name):
+    layout = load_layout(resolve_layout(name))
+    mask = WalkabilityMask(layout.width, layout.height)
+    for y in range(layout.height):
+        for x in range(layout.width):
+            mask.set(x, y, bool(layout.walkable[y, x]))
+    return layout, mask
+
+
+def _edges(graph):
+    return graph.nodes, graph.intra, {n: m for n, m in graph.inter.items() if m}
+
+
+def test_routes_reach_goal():
+    """Les chemins HPA* atteignent la cible, proches du plus court chemin"""
+    print("\n" + "="*60)
+    print("🧪 TEST: HPA* sur restaurant_64")
+    print("="*60)
+
+    layout, mask = _mask('restaurant_64')
+    rng = random.Random(0)
+    free = [(x, y) for y in range(layout.height) for x in range(layout.width) if layout.walkable[y, x]]
+    total, optimal = 0, 0
+    for _ in range(20):
+        a, b = rng.sample(free, 2)
+        planner = HierarchicalPlanner(mask)
+        position, steps = a, 0
+        while True:
+            step = planner.next_step(position, b, adjacent=False)
+            if step is None:
+                break
+            assert abs(step[0] - position[0]) + abs(step[1] - position[1]) == 1
+            assert mask.is_walkable(step)
+            position, steps = step, steps + 1
+        assert position == b
+        total += steps
+        optimal += len(DStarLite(mask, mask.index(*a), [mask.index(*b)]).path())
+    assert total <= 1.15 * optimal
+    print(f"  ✅ {total} pas (optimal: {optimal})")
+
+
+def test_lazy_cluster_rebuild():
+    """Une modification du masque ne reconstruit que les clusters touchés"""
+    layout, mask = _mask('restaurant_64')
+    graph = ClusterGraph(mask)
+    rebuilt = graph.rebuilt_clusters
+
+    inner = next((x, y) for y in range(18, 22) for x in range(18, 22)
+                 if mask.is_walkable((x, y)) and mask.is_walkable((x + 1, y)))
+    mask.set(inner[0], inner[1], False)
+    mask.set(inner[0] + 1, inner[1], False)
+    assert graph.version != mask.version  # rien n'est recalculé avant la requête suivante
+    graph.refresh()
+    assert 0 < graph.rebuilt_clusters - rebuilt <= 5
+    assert _edges(graph) == _edges(ClusterGraph(mask))
+
+    # Frontière entre deux clusters: entrée fermée puis rouverte
+    y = next(y for y in range(layout.height) if mask.is_walkable((7, y)) and mask.is_walkable((8, y)))
+    mask.set(7, y, False)
+    mask.set(8, y, False)
+    graph.refresh()
+    assert _edges(graph) == _edges(ClusterGraph(mask))
+    mask.set(7, y, True)
+    graph.refresh()
+    assert _edges(graph) == _edges(ClusterGraph(mask))
+
+
+def test_planner_selection_and_game():
+    """make_planner choisit HPA* sur les grandes cartes; les agents terminent leurs commandes"""
+    assert isinstance(make_planner(_mask('classic')[1]), PathPlanner)
+    assert isinstance(make_planner(_mask('banquet_128')[1]), HierarchicalPlanner)
+    assert isinstance(make_planner(_mask('classic')[1], 'hpa'), HierarchicalPlanner)
+    try:
+        make_planner(_mask('classic')[1], 'dijkstra')
+        assert False, "mode inconnu accepté"
+    except ValueError:
+        pass
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame({'nb_agents': 4, 'headless': True, 'seed': 0,
+                                         'layout': 'restaurant_64', 'pathfinding': 'hpa'})
+        for recipe in ['burger', 'pizza']:
+            game.add_recipe_to_order(recipe)
+        game.send_orders()
+        while not game.awaiting_recipe_choice and game.tick < 3000:
+            game.update()
+
+    assert game.awaiting_recipe_choice
+    graphs = {id(agent.path_planner.graph) for agent in game.agents}
+    assert len(graphs) == 1  # graphe abstrait partagé par les agents
+    print(f"  ✅ commandes terminées en {game.tick} ticks")
+
+
+if __name__ == "__main__":
+    test_routes_reach_goal()
+    test_lazy_cluster_rebuild()
+    test_planner_selection_and_game()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
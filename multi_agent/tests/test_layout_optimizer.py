@@ -0,0 +1,61 @@
+"""Test de l'optimiseur de placement des stations"""
+
+import os
+import sys
+import random
+import tempfile
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.layouts import load_layout, resolve_layout
+from multi_agent.layout_optimizer import (LayoutOptimizer, build_layout, candidate_positions,
+                                          is_reachable, write_layout)
+
+
+def test_candidates_and_build():
+    """Les stations sont posées sur les emplacements candidats, caisses et départs conservés"""
+    base = load_layout(resolve_layout('cramped_room'))
+    candidates = candidate_positions(base)
+    assert (4, 5) in candidates and (0, 3) in candidates  # comptoir et planche d'origine
+    assert all(pos not in candidates for pos in base.starts)
+
+    placement = {'stove': ((0, 2),), 'cutting_board': ((8, 2),), 'assembly_table': ((1, 5),),
+                 'counter': ((7, 5),)}
+    layout = build_layout(base, placement)
+    assert layout.resources['stove'] == ((0, 2),) and layout.resources['counter'] == ((7, 5),)
+    assert (layout.crates == base.crates).all() and layout.starts == base.starts
+    assert layout.walkable[3, 0]  # ancienne planche redevenue du sol
+    assert is_reachable(layout)
+
+
+def test_local_search_improves():
+    """La recherche locale ne dégrade jamais le meilleur placement"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Optimisation du placement des stations")
+    print("="*60)
+
+    base = load_layout(resolve_layout('classic'))
+    optimizer = LayoutOptimizer(base, nb_agents=2, orders=['sandwich'], nb_stoves=1, nb_boards=1,
+                                max_ticks=1500, workers=1, rng=random.Random(1))
+    best = optimizer.run(iterations=3, batch=3, patience=3)
+
+    assert optimizer.history == sorted(optimizer.history)
+    assert best['score'] == max(e['score'] for e in optimizer.evaluations.values())
+    assert best['completed'] == best['total'] == 1
+    assert best['layout'].count('stove') == 1 and best['layout'].count('counter') == 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "best.txt")
+        write_layout(path, best['layout'], "test")
+        reloaded = load_layout(path)
+    assert (reloaded.cells == best['layout'].cells).all() and reloaded.starts == base.starts
+    print(f"  ✅ {len(optimizer.evaluations)} placements, meilleur: {best['throughput']:.2f} cmd/min")
+
+
+if __name__ == "__main__":
+    test_candidates_and_build()
+    test_local_search_improves()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
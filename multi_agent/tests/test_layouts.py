@@ -0,0 +1,122 @@
+"""Test des layouts en fichiers (ASCII / JSON) et de leur cache compilé"""
+
+import os
+import sys
+import io
+import contextlib
+import tempfile
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.layouts import (parse_layout, load_layout, list_layouts, clear_layout_cache, cache_stats,
+                            FLOOR, WALL, CRATE, BOARD, ASSEMBLY, INGREDIENTS)
+from common.objects import Ingredient, Tool
+from multi_agent.kitchen import Kitchen
+from multi_agent.main import MultiAgentOvercookedGame
+from multi_agent.vec_env import VecKitchenEnv
+
+SMALL = """# commentaire ignoré
+XXstX
+B1..S
+X.A2X
+XXCXX
+"""
+
+
+def test_compile_ascii_layout():
+    """La grille ASCII est compilée en tableaux, index de ressources et départs"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Compilation d'un layout ASCII")
+    print("="*60)
+
+    layout = parse_layout(SMALL, name="small")
+    assert (layout.width, layout.height) == (5, 4)
+    assert layout.cells[0, 0] == WALL and layout.cells[0, 2] == CRATE and layout.cells[1, 0] == BOARD
+    assert layout.crates[0, 3] == 1 + INGREDIENTS.index("tomate")
+    assert layout.cells[2, 2] == ASSEMBLY and layout.cells[1, 1] == FLOOR
+    assert layout.starts == ((1, 1), (3, 2))
+    assert layout.resources['counter'] == ((2, 3),)
+    assert layout.crate_positions['salade'] == ((2, 0),)
+    assert layout.walkable.sum() == 5
+    assert not layout.walkable.flags.writeable
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        kitchen = Kitchen(headless=True, layout=layout)
+    assert (kitchen.width, kitchen.height) == (5, 4)
+    assert isinstance(kitchen.grid[0][2], Ingredient) and isinstance(kitchen.grid[1][4], Tool)
+    assert kitchen.grid[0][0] == 'wall' and kitchen.grid[2][2] == 'assembly_table'
+    assert kitchen.resource_capacity['stove'] == 1
+    assert kitchen.get_best_available_resource('counter', (1, 1)) == (2, 3)
+    assert [kitchen.is_walkable((x, y)) for y in range(4) for x in range(5)] == layout.walkable.ravel().tolist()
+
+    for bad, fmt in (("XXX\nX?X\n", "txt"), ("XA.\n...\n", "txt"),
+                     ('{"grid": ["XC.", "XA."], "starts": [[0, 0]]}', "json")):
+        try:
+            parse_layout(bad, fmt=fmt)
+        except ValueError as e:
+            print(f"  ✅ Rejeté: {e}")
+        else:
+            raise AssertionError(f"Layout invalide accepté: {bad!r}")
+
+
+def test_cache_keyed_by_content():
+    """Un fichier n'est recompilé que si son contenu change"""
+    clear_layout_cache()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "small.txt")
+        with open(path, "w") as f:
+            f.write(SMALL)
+        first = load_layout(path)
+        assert load_layout(path) is first
+        assert cache_stats == {"hits": 1, "misses": 1}
+
+        with open(path, "w") as f:
+            f.write(SMALL.replace("XXstX", "XXsfX"))
+        changed = load_layout(path)
+        assert changed is not first and changed.source_hash != first.source_hash
+        assert 'fromage' in changed.crate_positions
+
+        # Même contenu sous un autre nom: compilé à part, avec son propre nom
+        twin = os.path.join(tmp, "twin.txt")
+        with open(twin, "w") as f:
+            f.write(SMALL.replace("XXstX", "XXsfX"))
+        assert load_layout(twin).name == "twin" and changed.name == "small"
+
+
+def test_layout_library_games():
+    """Chaque layout de la bibliothèque se joue; les grandes cartes restent jouables"""
+    paths = list_layouts()
+    names = [os.path.splitext(os.path.basename(p))[0] for p in paths]
+    assert {'classic', 'cramped_room', 'ring_kitchen', 'restaurant_64'} <= set(names)
+
+    big = load_layout(paths[names.index('restaurant_64')])
+    assert (big.width, big.height) == (64, 64) and len(big.starts) >= 4
+
+    ring = load_layout(paths[names.index('ring_kitchen')])
+    assert ring.starts[1] == (10, 6) and ring.count('stove') == 2
+
+    for name in ('cramped_room', 'ring_kitchen'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = MultiAgentOvercookedGame({'nb_agents': 2, 'nb_stoves': 1, 'nb_boards': 1, 'nb_assembly': 1,
+                                             'headless': True, 'profile': False, 'seed': 0, 'layout': name})
+            game.add_recipe_to_order('burger')
+            game.send_orders()
+            while not game.awaiting_recipe_choice and game.tick < 2000:
+                game.update()
+        assert game.score > 0, f"{name}: burger non livré"
+        print(f"  ✅ {name}: burger livré en {game.tick} ticks")
+
+    env = VecKitchenEnv.from_layout(big, num_envs=4, num_agents=2)
+    env.reset()
+    assert env.cell.shape == (4, 64, 64)
+    assert tuple(env.pos[0, 1]) == big.starts[1]
+
+
+if __name__ == "__main__":
+    test_compile_ascii_layout()
+    test_cache_keyed_by_content()
+    test_layout_library_games()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
@@ -0,0 +1,99 @@
+"""Test de la résolution simultanée des déplacements (conflits de sommet et d'échange)"""
+
+import os
+import sys
+import io
+import contextlib
+from types import SimpleNamespace
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from multi_agent.coordination.moves import MoveResolver
+from multi_agent.main import MultiAgentOvercookedGame
+
+
+def _agent(aid, position, move=None, task=None, holding=None):
+    return SimpleNamespace(id=aid, position=list(position), intended_move=move,
+                           current_task=task, holding=holding)
+
+
+def _ids(agents):
+    return [a.id for a in agents]
+
+
+def test_vertex_and_swap_conflicts():
+    """Même case visée: le plus prioritaire passe; échange de cases: aucun ne passe"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Déplacements simultanés")
+    print("="*60)
+
+    resolver = MoveResolver()
+    a = _agent(0, (1, 1), (2, 1))
+    b = _agent(1, (3, 1), (2, 1), task='task')
+    movers, refused = resolver.plan([a, b])
+    assert _ids(movers) == [1] and _ids(refused) == [0]
+    assert resolver.vertex_conflicts == 1
+
+    a = _agent(0, (1, 1), (2, 1), task='task', holding='tomato')
+    b = _agent(1, (2, 1), (1, 1), task='task', holding='tomato')
+    movers, refused = resolver.plan([a, b])
+    assert movers == [] and _ids(refused) == [0, 1]
+    assert resolver.swap_conflicts == 1
+    print(f"  ✅ {resolver.stats()}")
+
+
+def test_follow_cycle_and_cascade():
+    """Suivre un agent qui avance est permis; un refus se propage à la file derrière lui"""
+    resolver = MoveResolver()
+    line = [_agent(0, (1, 1), (2, 1)), _agent(1, (2, 1), (3, 1)), _agent(2, (3, 1), (4, 1))]
+    movers, refused = resolver.plan(line)
+    assert _ids(movers) == [0, 1, 2] and refused == []
+
+    cycle = [_agent(0, (1, 1), (2, 1)), _agent(1, (2, 1), (2, 2)),
+             _agent(2, (2, 2), (1, 2)), _agent(3, (1, 2), (1, 1))]
+    movers, refused = resolver.plan(cycle)
+    assert _ids(movers) == [0, 1, 2, 3]
+
+    # La tête de file est refusée (conflit avec un agent prioritaire): toute la file s'arrête
+    line.append(_agent(3, (5, 1), (4, 1), task='task'))
+    movers, refused = resolver.plan(line)
+    assert _ids(movers) == [3] and _ids(refused) == [0, 1, 2]
+    assert resolver.blocked_moves == 2
+
+    # Même résultat quel que soit l'ordre des agents
+    assert [_ids(r) for r in resolver.plan(line[::-1])] == [[3], [0, 1, 2]]
+
+
+def test_game_moves_without_collisions():
+    """En jeu: aucun pas vers une case occupée, aucun agent qui en traverse un autre"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame({'nb_agents': 6, 'headless': True, 'seed': 0,
+                                         'layout': 'cramped_room', 'simultaneous_moves': True})
+        for recipe in ['burger', 'pizza']:
+            game.add_recipe_to_order(recipe)
+        game.send_orders()
+        while not game.awaiting_recipe_choice and game.tick < 1500:
+            before = {a.id: tuple(a.position) for a in game.agents}
+            game.update()
+            after = {a.id: tuple(a.position) for a in game.agents}
+            # Les agents qui partagent la case d'apparition en sortent un par un
+            for i in after:
+                if after[i] != before[i]:
+                    assert all(after[j] != after[i] for j in after if j != i)
+            for i in before:
+                for j in before:
+                    assert i == j or not (after[i] == before[j] and after[j] == before[i] != after[i])
+            assert all(a.intended_move is None for a in game.agents)
+
+    assert game.awaiting_recipe_choice
+    print(f"  ✅ {game.tick} ticks, {game.move_resolver.stats()}")
+
+
+if __name__ == "__main__":
+    test_vertex_and_swap_conflicts()
+    test_follow_cycle_and_cascade()
+    test_game_moves_without_collisions()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
@@ -0,0 +1,127 @@
+"""Test du blackboard en réseau (serveur TCP / socket Unix, lots d'écritures, encodage binaire)"""
+
+import os
+import sys
+import io
+import time
+import socket
+import tempfile
+import contextlib
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from multi_agent.coordination.communication import AgentCommunicator, Blackboard, Message, MessageType
+from multi_agent.coordination.net_blackboard import (BlackboardServer, RemoteBlackboard,
+                                                     pack_message, unpack_message)
+from multi_agent.main import MultiAgentOvercookedGame
+
+
+def _key(messages):
+    return [(m.msg_type, m.sender_id, m.receiver_id, m.content, m.priority) for m in messages]
+
+
+def _exchange(blackboard):
+    agents = [AgentCommunicator(i, blackboard) for i in range(3)]
+    for step in range(5):
+        for c in agents:
+            c.update_position(c.agent_id, step)
+    agents[1].notify_busy(7)
+    agents[0].send_message(MessageType.RESOURCE_REQUEST, 2, {'resource': 'stove'})
+    agents[2].notify_task_completed(7)
+    return agents
+
+
+def test_codec_roundtrip():
+    """Message encodé en binaire puis relu à l'identique"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Blackboard en réseau")
+    print("="*60)
+
+    msg = Message(42, MessageType.ORDER_RECEIVED, None, 3, 1.5e9, {
+        'recipe': 'crêpe', 'x': -7, 'ratio': 0.25, 'task': None, 'ingredients': ['tomato', 'salad'], 'ok': True
+    }, priority=5)
+    data = b'xx' + pack_message(msg)
+    decoded, end = unpack_message(data, 2)
+    assert end == len(data) and decoded == msg
+    position = pack_message(Message(1, MessageType.POSITION_UPDATE, 0, None, 0.0, {'x': 1, 'y': 2, 'agent_id': 0}))
+    assert len(position) < 56
+    print(f"  ✅ position_update: {len(position)} octets")
+
+
+def test_remote_matches_blackboard():
+    """Mêmes lectures qu'un Blackboard local, sur TCP et sur socket Unix"""
+    local = Blackboard()
+    expected = _exchange(local)
+    addresses = [('127.0.0.1', 0)]
+    if hasattr(socket, 'AF_UNIX'):
+        addresses.append(os.path.join(tempfile.mkdtemp(), 'blackboard.sock'))
+    for address in addresses:
+        server = BlackboardServer(address)
+        remote = RemoteBlackboard(server.address)
+        try:
+            agents = _exchange(remote)
+            for kwargs in [{}, {'receiver_id': 2}, {'msg_type': MessageType.POSITION_UPDATE, 'limit': 4}]:
+                assert _key(remote.get_messages(**kwargs)) == _key(local.get_messages(**kwargs))
+            assert agents[0].get_other_agents_positions() == expected[0].get_other_agents_positions()
+            assert remote.message_counter == local.message_counter
+            assert remote.get_message_stats() == local.get_message_stats()
+
+            # Un second client (autre hôte) voit les écritures du premier
+            other = RemoteBlackboard(server.address)
+            assert other.get_agent_state(1)['current_task'] == 7
+            other.close()
+
+            stats = remote.transport_stats()
+            assert stats['position_update']['count'] == 15 and stats['position_update']['mean_ms'] > 0
+            assert remote._batch < stats['position_update']['count']  # écritures groupées en lots
+        finally:
+            remote.close()
+            server.close()
+    print(f"  ✅ {len(addresses)} transports, lectures identiques")
+
+
+def test_latency_degrades_gracefully():
+    """Réseau lent: les lectures rendent le dernier instantané sans bloquer la partie"""
+    server = BlackboardServer(latency_ms=50)
+    remote = RemoteBlackboard(server.address, read_timeout=0.002, latency_window=8)
+    try:
+        agents = [AgentCommunicator(i, remote) for i in range(2)]
+        start = time.perf_counter()
+        for step in range(20):
+            for c in agents:
+                c.update_position(c.agent_id, step)
+            positions = agents[0].get_other_agents_positions()
+        assert time.perf_counter() - start < 0.05 * 20 / 2
+        assert remote.stale_reads > 0
+        assert positions == {1: (1, 19)}  # écritures locales visibles tout de suite
+        remote.refresh(timeout=1.0)
+        # Latences gardées sur une fenêtre bornée, le compteur reste exact
+        assert remote.transport_stats()['position_update']['count'] == 40
+        assert 0 < max(len(latencies) for latencies in remote._latencies.values()) <= 8
+    finally:
+        remote.close()
+        server.close()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame({'nb_agents': 4, 'headless': True, 'seed': 0, 'layout': 'classic',
+                                         'blackboard': 'socket', 'blackboard_latency_ms': 20,
+                                         'blackboard_timeout_ms': 1})
+        for recipe in ['burger', 'pizza']:
+            game.add_recipe_to_order(recipe)
+        game.send_orders()
+        while not game.awaiting_recipe_choice and game.tick < 1500:
+            game.update()
+        stale = game.blackboard.stale_reads
+        game.close_blackboard()
+    assert game.awaiting_recipe_choice and stale > 0
+    print(f"  ✅ partie terminée en {game.tick} ticks malgré 20 ms de latence ({stale} lectures en retard)")
+
+
+if __name__ == "__main__":
+    test_codec_roundtrip()
+    test_remote_matches_blackboard()
+    test_latency_degrades_gracefully()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
@@ -0,0 +1,71 @@
+"""Test de l'encodeur d'observations incrémental"""
+
+import os
+import sys
+import io
+import contextlib
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from multi_agent.main import MultiAgentOvercookedGame
+from multi_agent.observation import ObservationEncoder
+
+
+def test_incremental_matches_rebuild():
+    """Après chaque tick, le tenseur incrémental égale une reconstruction complète"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Encodeur d'observations")
+    print("="*60)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame({'nb_agents': 3, 'nb_stoves': 2, 'nb_boards': 2, 'nb_assembly': 1,
+                                         'headless': True, 'seed': 1, 'observation': True})
+        game.add_recipe_to_order("burger")
+        game.add_recipe_to_order("pizza")
+        game.send_orders()
+
+        obs = game.observation()
+        seen = set()
+        for _ in range(600):
+            game.update()
+            assert game.observation() is obs, "La vue doit être stable (aucune copie)"
+            fresh = ObservationEncoder(game.kitchen, game.agents, attach=False).tensor
+            assert np.array_equal(obs, fresh), f"Tick {game.tick}: divergence avec la reconstruction"
+            for name in ("board_busy", "stove_busy", "held_cut", "held_cooked", "held_dish"):
+                if game.observation_encoder.channel(name).any():
+                    seen.add(name)
+            seen.update(n for n in game.observation_encoder.names
+                        if n.startswith("assembly_") and game.observation_encoder.channel(n).any())
+
+    assert game.score == 20
+    assert {"board_busy", "stove_busy", "held_cut", "held_cooked", "held_dish"} <= seen
+    assert any(n.startswith("assembly_") for n in seen)
+    assert not obs.flags.writeable
+    print(f"   ✅ {game.observation_encoder}, canaux actifs: {len(seen)}")
+
+
+def test_agent_channels():
+    """Chaque agent occupe exactement une case de son canal"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame({'nb_agents': 2, 'nb_stoves': 1, 'nb_boards': 1, 'nb_assembly': 1,
+                                         'headless': True, 'seed': 0, 'observation': True})
+    enc = game.observation_encoder
+    for agent in game.agents:
+        x, y = agent.position
+        channel = enc.channel(f"agent_{agent.id}")
+        assert channel.sum() == 1 and channel[y, x] == 1
+    agent = game.agents[0]
+    agent.position = [agent.position[0] + 1, agent.position[1]]
+    assert enc.channel("agent_0")[agent.position[1], agent.position[0]] == 1
+    assert enc.channel("agent_0").sum() == 1
+
+
+if __name__ == "__main__":
+    test_incremental_matches_rebuild()
+    test_agent_channels()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
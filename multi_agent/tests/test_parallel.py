@@ -0,0 +1,110 @@
+"""Test de la mise à jour parallèle des agents (outils attribués après le tick, verrous atomiques)"""
+
+import os
+import sys
+import io
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.objects import Ingredient, Tool
+from multi_agent.kitchen import Kitchen
+from multi_agent.coordination.claims import ClaimResolver
+from multi_agent.main import MultiAgentOvercookedGame
+
+THREADS = 8
+
+
+def _race(fn):
+    """Appelle fn(i) depuis THREADS threads lâchés en même temps"""
+    barrier = threading.Barrier(THREADS)
+
+    def call(i):
+        barrier.wait()
+        return fn(i)
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        return list(pool.map(call, range(THREADS)))
+
+
+def test_tool_and_resource_compare_and_set():
+    """Un seul agent prend l'outil; jamais plus de détenteurs que la capacité"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Mise à jour parallèle")
+    print("="*60)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(20):
+            tool = Tool('planche', (0, 0))
+            wins = _race(lambda i: tool.use(Ingredient('tomato', 'cru')))
+            assert wins.count(True) == 1 and tool.occupied
+            assert tool.release() is not None and not tool.occupied
+
+        kitchen = Kitchen(headless=True)
+    capacity = kitchen.resource_capacity['stove']
+    for _ in range(20):
+        granted = _race(lambda i: kitchen.try_lock_resource('stove', i))
+        assert granted.count(True) == capacity == len(kitchen.resource_locks['stove'])
+        _race(lambda i: kitchen.unlock_resource('stove', i))
+        assert not kitchen.resource_locks['stove']
+    print(f"  ✅ compare-and-set sur outils et ressources ({THREADS} threads)")
+
+
+def test_tool_claims_granted_by_priority():
+    """Outil demandé par plusieurs agents: le plus prioritaire l'obtient, quel que soit l'ordre"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        kitchen = Kitchen(headless=True)
+    tools = [(x, y) for y in range(kitchen.height) for x in range(kitchen.width)
+             if isinstance(kitchen.grid[y][x], Tool)]
+    free, busy = tools[0], tools[1]
+    kitchen.grid[busy[1]][busy[0]].occupied = True
+
+    def agent(aid, tool, task=None, holding=None):
+        return SimpleNamespace(id=aid, kitchen=kitchen, intended_use=(tool, 'cut', 20),
+                               current_task=task, holding=holding)
+
+    agents = [agent(0, free), agent(1, free, 'task', 'tomato'), agent(2, free, 'task', 'salad'), agent(3, busy)]
+    resolver = ClaimResolver()
+    for order in (agents, agents[::-1]):
+        granted, refused = resolver.plan(order)
+        assert [a.id for a in granted] == [1] and [a.id for a in refused] == [0, 2, 3]
+    print("  ✅ outil libre au plus prioritaire, outil occupé refusé")
+
+
+def test_parallel_game_matches_sequential():
+    """Avec un pool de threads, la partie est identique tick pour tick au mode séquentiel"""
+    results = {}
+    for workers in (0, 2, 4):
+        config = {'nb_agents': 6, 'headless': True, 'seed': 0, 'layout': 'cramped_room',
+                  'simultaneous_moves': True, 'parallel_workers': workers, 'hash_every': 1}
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = MultiAgentOvercookedGame(config)
+            for recipe in ['burger', 'pizza']:
+                game.add_recipe_to_order(recipe)
+            game.send_orders()
+            positions = []
+            while not game.awaiting_recipe_choice and game.tick < 1500:
+                game.update()
+                positions.append(tuple(tuple(a.position) for a in game.agents))
+        assert game.awaiting_recipe_choice and game.claim_resolver is not None
+        results[workers] = (game.tick, positions, game.state_hasher.hashes, game.score)
+        if workers:
+            assert game.parallel.ticks == game.tick
+            assert all(f"agent {a.id}" in game.profiler.tracks for a in game.agents)
+            game.parallel.close()
+
+    assert results[0] == results[2] == results[4]
+    print(f"  ✅ {results[0][0]} ticks identiques (positions et état) avec 0, 2 et 4 threads")
+
+
+if __name__ == "__main__":
+    test_tool_and_resource_compare_and_set()
+    test_tool_claims_granted_by_priority()
+    test_parallel_game_matches_sequential()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
@@ -0,0 +1,120 @@
+"""Test du chemin conservé et réparé (D* Lite) utilisé par les agents"""
+
+import os
+import sys
+import io
+import contextlib
+from collections import deque
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.layouts import load_layout, resolve_layout
+from common.pathfinding import DStarLite, PathPlanner
+from common.walkability import WalkabilityMask
+from multi_agent.main import MultiAgentOvercookedGame
+
+
+def _bfs_length(mask, start, goal):
+    seen, queue = {start: 0}, deque([start])
+    while queue:
+        i = queue.popleft()
+        if i == goal:
+            return seen[i]
+        for d in mask.offsets:
+            if mask.cells[i + d] and i + d not in seen:
+                seen[i + d] = seen[i] + 1
+                queue.append(i + d)
+    return None
+
+
+def test_shortest_path_and_repair():
+    """Chemins de longueur BFS, réparation locale quand une case est bloquée"""
+    print("\n" + "="*60)
+    print("🧪 TEST: D* Lite sur le masque marchable")
+    print("="*60)
+
+    layout = load_layout(resolve_layout('restaurant_64'))
+    mask = WalkabilityMask(layout.width, layout.height)
+    for y in range(layout.height):
+        for x in range(layout.width):
+            mask.set(x, y, bool(layout.walkable[y, x]))
+
+    free = [mask.index(x, y) for y in range(layout.height) for x in range(layout.width) if mask.cells[mask.index(x, y)]]
+    for start, goal in [(free[0], free[-1]), (free[10], free[len(free) // 2]), (free[-3], free[7])]:
+        search = DStarLite(mask, start, [goal])
+        assert len(search.path()) == _bfs_length(mask, start, goal)
+
+    # Bloquer une case du chemin: la réparation coûte moins qu'une nouvelle recherche
+    search = DStarLite(mask, free[0], [free[-1]])
+    initial = search.expansions
+    path = search.path()
+    search.start = path[5]
+    search.set_blocked({path[6]})
+    repaired = search.path()
+    assert path[6] not in repaired and repaired[-1] == free[-1]
+    assert len(repaired) == len(DStarLite(mask, path[5], [free[-1]], {path[6]}).path())
+    assert search.expansions - initial < initial
+    print(f"  ✅ recherche: {initial} expansions, réparation: {search.expansions - initial}")
+
+
+def test_planner_reuses_path():
+    """Aucune expansion tant que la cible et la grille ne changent pas"""
+    mask = WalkabilityMask(12, 12, walkable=True)
+    mask.set(11, 5, False)  # station non marchable: arrivée sur une case voisine
+    planner = PathPlanner(mask)
+
+    position = (0, 0)
+    step = planner.next_step(position, (11, 5))
+    after_search = planner.expansions
+    steps = 0
+    while step is not None:
+        position = step
+        step = planner.next_step(position, (11, 5))
+        steps += 1
+    assert abs(position[0] - 11) + abs(position[1] - 5) == 1
+    assert steps == 15 and planner.searches == 1
+    assert planner.expansions == after_search and planner.repairs == 0
+
+    # Un agent devant: réparation; un mur posé: nouvelle recherche
+    planner.reset()
+    planner.next_step((0, 5), (11, 5))
+    assert planner.next_step((0, 5), (11, 5), obstacles={(1, 5)}) != (1, 5)
+    assert planner.repairs == 1
+    searches = planner.searches
+    mask.set(5, 5, False)
+    planner.next_step((0, 5), (11, 5))
+    assert planner.searches == searches + 1
+
+    # Cible inaccessible: None (l'agent utilise alors l'A* best-effort)
+    for y in range(12):
+        mask.set(6, y, False)
+    assert planner.next_step((0, 0), (11, 5)) is None
+
+
+def test_agents_complete_orders():
+    """Les agents utilisent le chemin conservé et terminent leurs commandes"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame({'nb_agents': 3, 'nb_stoves': 2, 'nb_boards': 2, 'nb_assembly': 1,
+                                         'headless': True, 'seed': 1})
+        for recipe in ['burger', 'pizza']:
+            game.add_recipe_to_order(recipe)
+        game.send_orders()
+        while not game.awaiting_recipe_choice and game.tick < 3000:
+            game.update()
+
+    assert game.awaiting_recipe_choice
+    planners = [agent.path_planner for agent in game.agents]
+    moves = sum(agent.total_distance_traveled for agent in game.agents)
+    assert sum(p.searches for p in planners) < moves
+    print(f"  ✅ {moves} pas, {sum(p.searches for p in planners)} recherches, "
+          f"{sum(p.repairs for p in planners)} réparations")
+
+
+if __name__ == "__main__":
+    test_shortest_path_and_repair()
+    test_planner_reuses_path()
+    test_agents_complete_orders()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
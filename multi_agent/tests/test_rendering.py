@@ -0,0 +1,140 @@
+"""Test du rendu incrémental de la cuisine (fond statique en cache + dirty rects)"""
+
+import os
+import sys
+import io
+import contextlib
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import pygame
+
+from multi_agent.main import MultiAgentOvercookedGame
+
+
+def _make_game(nb_agents=3):
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame({'nb_agents': nb_agents, 'nb_stoves': 2,
+                                         'nb_boards': 2, 'nb_assembly': 1})
+    game.add_recipe_to_order("burger")
+    game.send_orders()
+    return game
+
+
+def test_incremental_frames_match_full_redraw():
+    """Chaque frame incrémentale est identique à un rendu complet"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Rendu incrémental")
+    print("="*60)
+
+    game = _make_game()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame in range(60):
+            game.update()
+            game.draw_game()
+            if frame % 15 == 14:
+                incremental = pygame.image.tostring(game.kitchen.screen, 'RGB')
+                game.kitchen.invalidate_static_layer()
+                game.draw_game()
+                full = pygame.image.tostring(game.kitchen.screen, 'RGB')
+                assert incremental == full, f"Frame {frame}: rendu incrémental différent"
+    print("   ✅ Frames identiques au rendu complet")
+
+
+def test_dirty_rects_are_local():
+    """Hors invalidation, seules de petites zones sont envoyées à l'écran"""
+    game = _make_game()
+    kitchen = game.kitchen
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.draw_game()
+        game.update()
+        kitchen.draw(agents=game.agents, current_order="burger", score=0)
+
+    assert kitchen._dirty_rects is not None, "Le fond statique ne devrait pas être re-rendu"
+    grid_area = kitchen.width * kitchen.cell_size * kitchen.height * kitchen.cell_size
+    grid_rect = pygame.Rect(0, 0, kitchen.width * kitchen.cell_size, kitchen.height * kitchen.cell_size)
+    dirty_area = sum(r.clip(grid_rect).width * r.clip(grid_rect).height for r in kitchen._dirty_rects)
+    assert dirty_area < grid_area * 0.1
+    print(f"   ✅ {len(kitchen._dirty_rects)} zones, {dirty_area}px² sur {grid_area}px²")
+
+
+def test_sprite_and_text_caches():
+    """Sprites et textes sont rendus une fois puis réutilisés, avec éviction LRU"""
+    from common.sprite_cache import SpriteCache, TextCache
+
+    game = _make_game()
+    kitchen = game.kitchen
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(100):
+            game.update()
+            game.draw_game()
+    assert kitchen.texts.hits > kitchen.texts.misses
+    print(f"   ✅ {kitchen.texts}")
+    print(f"   ✅ {kitchen.sprites}")
+
+    sprites = SpriteCache(max_entries=2)
+    image = pygame.Surface((40, 40))
+    a = sprites.scaled(image, "tomate", "coupe", (25, 25))
+    assert sprites.scaled(image, "tomate", "coupe", (25, 25)) is a
+    sprites.scaled(image, "tomate", "coupe", (30, 30))
+    sprites.scaled(image, "salade", "crue", (25, 25))
+    assert ("tomate", "coupe", (25, 25), True) not in sprites
+    assert sprites.evictions == 1 and len(sprites) == 2
+
+    texts = TextCache()
+    font = pygame.font.Font(None, 20)
+    assert texts.render(font, "Score: 10", (0, 0, 0)) is texts.render(font, "Score: 10", (0, 0, 0))
+    assert texts.render(font, "Score: 10", (0, 0, 0)) is not texts.render(font, "Score: 20", (0, 0, 0))
+
+
+def test_threaded_simulation_publishes_snapshots():
+    """La simulation tourne dans son thread, le rendu lit des instantanés immuables"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Simulation et rendu découplés")
+    print("="*60)
+
+    import time
+    import dataclasses
+    from multi_agent.render_loop import SimulationThread
+
+    game = _make_game(nb_agents=2)
+    sim = SimulationThread(game, ticks_per_second=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.start()
+        deadline = time.time() + 20
+        drawn = 0
+        while game.score < 10 and time.time() < deadline:
+            frame = sim.mailbox.take()
+            if frame is not None:
+                game.draw_game(frame)
+                drawn += 1
+            time.sleep(0.01)
+        sim.stop()
+        sim.join()
+
+    assert game.score == 10, "La commande aurait dû être livrée"
+    mailbox = sim.mailbox
+    assert drawn == mailbox.rendered and drawn > 0
+    assert mailbox.published == mailbox.rendered + mailbox.dropped + (sim.mailbox.take() is not None)
+    assert mailbox.dropped > 0, "Une simulation sans limite devrait dépasser le rendu"
+
+    frame = game.snapshot()
+    assert frame.tick == game.tick and len(frame.agents) == 2
+    assert len(frame.tools) == 4 and all(not t.occupied for t in frame.tools)
+    try:
+        frame.agents[0].position = (0, 0)
+        assert False, "L'instantané devrait être immuable"
+    except dataclasses.FrozenInstanceError:
+        pass
+    print(f"   ✅ {mailbox.published} instantanés, {mailbox.rendered} dessinés, {mailbox.dropped} ignorés")
+
+
+if __name__ == "__main__":
+    test_incremental_frames_match_full_redraw()
+    test_dirty_rects_are_local()
+    test_sprite_and_text_caches()
+    test_threaded_simulation_publishes_snapshots()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
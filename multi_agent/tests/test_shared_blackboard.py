@@ -0,0 +1,134 @@
+"""Test du blackboard en mémoire partagée (mêmes résultats que Blackboard, lisible entre processus)"""
+
+import os
+import sys
+import io
+import contextlib
+import multiprocessing
+from multiprocessing import shared_memory
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from multi_agent.coordination.communication import AgentCommunicator, Blackboard, MessageType
+from multi_agent.coordination.shared_blackboard import SharedBlackboard
+from multi_agent.main import MultiAgentOvercookedGame
+
+
+def _exchange(blackboard):
+    """Même suite de messages et d'états sur les deux backends"""
+    agents = [AgentCommunicator(i, blackboard) for i in range(3)]
+    for step in range(6):
+        for c in agents:
+            c.update_position(c.agent_id, step)
+    agents[1].notify_busy(7)
+    agents[0].send_message(MessageType.RESOURCE_REQUEST, 2, {'resource': 'stove'})
+    agents[2].notify_task_completed(7)
+    blackboard.post_message(MessageType.ORDER_RECEIVED, None, None, {'recipe': 'burger'})
+    return agents
+
+
+def _key(messages):
+    return [(m.msg_type, m.sender_id, m.receiver_id, m.content, m.priority) for m in messages]
+
+
+def test_same_results_as_blackboard():
+    """Filtres, états et statistiques identiques au Blackboard en mémoire"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Blackboard en mémoire partagée")
+    print("="*60)
+
+    local, shared = Blackboard(max_messages=16), SharedBlackboard(max_messages=16, max_agents=4)
+    try:
+        agents = _exchange(local)
+        _exchange(shared)
+        for kwargs in [{}, {'receiver_id': 2}, {'receiver_id': 1}, {'msg_type': MessageType.POSITION_UPDATE},
+                       {'limit': 3}]:
+            assert _key(shared.get_messages(**kwargs)) == _key(local.get_messages(**kwargs))
+        assert shared.message_counter == local.message_counter == 22
+        assert len(shared.messages) == len(local.messages) == 16  # anneau plein: les plus anciens écrasés
+        assert shared.get_message_stats() == local.get_message_stats()
+
+        drop = lambda states: {i: {k: v for k, v in s.items() if k != 'last_update'} for i, s in states.items()}
+        assert drop(shared.get_all_agent_states()) == drop(local.get_all_agent_states())
+        assert AgentCommunicator(0, shared).get_other_agents_positions() == agents[0].get_other_agents_positions()
+        assert shared.get_agent_state(3) is None
+
+        try:
+            shared.post_message(MessageType.ORDER_RECEIVED, None, None, {'recipe': 'x' * 200})
+            assert False, "contenu trop long accepté"
+        except ValueError:
+            pass
+    finally:
+        shared.close()
+        shared.unlink()
+    print(f"  ✅ {local.message_counter} messages, mêmes lectures que Blackboard")
+
+
+def _child(blackboard, agent_id, steps):
+    comm = AgentCommunicator(agent_id, blackboard)
+    for step in range(steps):
+        comm.update_position(agent_id, step)
+        comm.notify_task_completed(step)
+    blackboard.close()
+
+
+def test_processes_share_the_blackboard():
+    """Des processus agents écrivent, le processus parent lit sans copie du segment"""
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        print("  ⏭️ fork indisponible")
+        return
+    ctx = multiprocessing.get_context('fork')
+    blackboard = SharedBlackboard(max_messages=64, max_agents=4, lock=ctx.Lock())
+    try:
+        processes = [ctx.Process(target=_child, args=(blackboard, i, 40)) for i in range(4)]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+            assert p.exitcode == 0
+
+        assert blackboard.message_counter == 4 * 40 * 2
+        ids = [m.msg_id for m in blackboard.messages]
+        assert ids == list(range(4 * 40 * 2 - 64, 4 * 40 * 2))  # numéros uniques malgré 4 écrivains
+        positions = AgentCommunicator(9, blackboard).get_other_agents_positions()
+        assert positions == {i: (i, 39) for i in range(4)}
+        assert blackboard.agent_table['x'].base is not None  # vue sur le segment
+    finally:
+        blackboard.close()
+        blackboard.unlink()
+    print(f"  ✅ 4 processus, {len(ids)} messages relus")
+
+
+def test_game_with_shared_blackboard():
+    """Le jeu donne le même résultat avec le backend partagé"""
+    results = []
+    for backend in (None, 'shared'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = MultiAgentOvercookedGame({'nb_agents': 4, 'headless': True, 'seed': 0,
+                                             'layout': 'classic', 'blackboard': backend})
+            for recipe in ['burger', 'pizza']:
+                game.add_recipe_to_order(recipe)
+            game.send_orders()
+            while not game.awaiting_recipe_choice and game.tick < 1500:
+                game.update()
+        results.append((game.tick, game.score))
+    assert isinstance(game.blackboard, SharedBlackboard)
+    assert results[0] == results[1] and game.awaiting_recipe_choice
+    name = game.blackboard.name
+    game.close_blackboard()
+    try:
+        shared_memory.SharedMemory(name=name)
+        assert False, "segment non supprimé"
+    except FileNotFoundError:
+        pass
+    print(f"  ✅ {results[1][0]} ticks dans les deux cas")
+
+
+if __name__ == "__main__":
+    test_same_results_as_blackboard()
+    test_processes_share_the_blackboard()
+    test_game_with_shared_blackboard()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
@@ -0,0 +1,45 @@
+"""Test du balayage headless de configurations"""
+
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from multi_agent.sweep import build_scenarios, run_sweep, aggregate, format_table
+
+
+def test_headless_kitchen():
+    """Une cuisine headless n'ouvre pas de fenêtre et ne charge aucune image"""
+    from multi_agent.kitchen import Kitchen
+    kitchen = Kitchen(headless=True)
+    assert kitchen.screen is None
+    assert all(img is None for img in kitchen.images.values())
+
+
+def test_sweep_process_pool():
+    """Les scénarios sont simulés dans le pool et agrégés en un tableau"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Balayage de configurations")
+    print("="*60)
+
+    scenarios = build_scenarios(agents=[1, 2], stoves=[1], boards=[1], assembly=[1],
+                                seeds=[0, 1], order_mixes=[["burger"]])
+    assert len(scenarios) == 4
+
+    results = run_sweep(scenarios, workers=2, verbose=False)
+    assert len(results) == 4
+    assert all(r['completed'] == r['total'] == 1 for r in results)
+    assert all(r['report']['session']['completed_orders'] == 1 for r in results)
+
+    table = aggregate(results)
+    assert len(table) == 2 and all(row['runs'] == 2 for row in table)
+    print(format_table(table))
+
+
+if __name__ == "__main__":
+    test_headless_kitchen()
+    test_sweep_process_pool()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
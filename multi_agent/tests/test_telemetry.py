@@ -0,0 +1,87 @@
+"""Test de l'enregistreur de télémétrie par tick"""
+
+import os
+import sys
+import tempfile
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from multi_agent.kitchen import Kitchen
+from multi_agent.agent import CooperativeAgent
+from multi_agent.coordination.communication import Blackboard, AgentCommunicator
+from multi_agent.analytics.telemetry import TelemetryRecorder, load_telemetry
+from common.objects import Ingredient
+
+
+def _make_agents(kitchen, count=2):
+    blackboard = Blackboard()
+    return [
+        CooperativeAgent(i, [(1, 1), (14, 14)][i], kitchen, AgentCommunicator(i, blackboard))
+        for i in range(count)
+    ]
+
+
+def test_recorder_grows_in_chunks():
+    """Les colonnes s'étendent par blocs sans perte de ticks"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Télémétrie par blocs")
+    print("="*60)
+
+    kitchen = Kitchen(width=16, height=16, cell_size=50)
+    agents = _make_agents(kitchen)
+    recorder = TelemetryRecorder.for_kitchen(kitchen, len(agents), chunk_size=8)
+
+    agents[0].holding = Ingredient("tomate", "coupe")
+    for tick in range(20):
+        agents[1].position = [14, 14 - (tick % 3)]
+        recorder.record(tick, agents, kitchen.grid, order_queue_len=tick % 2)
+
+    assert len(recorder) == 20
+    ticks = recorder.column('tick')
+    assert ticks.tolist() == list(range(20))
+    assert recorder.column('agent_y')[:4, 1].tolist() == [14, 13, 12, 14]
+    holding = recorder.column('agent_holding')
+    assert recorder.vocab[holding[0, 0]] == "tomate_coupe"
+    assert recorder.vocab[holding[0, 1]] == ""
+    assert recorder.column('tool_occupied').shape == (20, recorder.num_tools)
+    print(f"   ✅ {recorder}")
+
+
+def test_recorder_export_roundtrip():
+    """Export .npz et memmap relisibles à l'identique"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Export télémétrie")
+    print("="*60)
+
+    kitchen = Kitchen(width=16, height=16, cell_size=50)
+    agents = _make_agents(kitchen)
+    recorder = TelemetryRecorder.for_kitchen(kitchen, len(agents), chunk_size=4)
+    for tick in range(10):
+        agents[0].position = [1 + tick % 5, 1]
+        recorder.record(tick, agents, kitchen.grid)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        npz_path = os.path.join(tmp, "run.npz")
+        recorder.save_npz(npz_path)
+        data = load_telemetry(npz_path)
+        assert data['agent_x'][:, 0].tolist() == [1, 2, 3, 4, 5, 1, 2, 3, 4, 5]
+        assert data['vocab'] == recorder.vocab
+
+        mm_dir = os.path.join(tmp, "run_mm")
+        recorder.save_memmap(mm_dir)
+        data = load_telemetry(mm_dir)
+        assert data['length'] == 10
+        assert data['agent_x'].shape == (10, 2)
+        assert (data['agent_x'] == recorder.column('agent_x')).all()
+        del data
+
+    print("   ✅ Export .npz et memmap OK")
+
+
+if __name__ == "__main__":
+    test_recorder_grows_in_chunks()
+    test_recorder_export_roundtrip()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
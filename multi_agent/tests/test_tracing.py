@@ -0,0 +1,145 @@
+"""Test du profilage par phase, du traçage des tâches et de l'export Chrome Trace"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from multi_agent.analytics.profiler import TickProfiler
+from multi_agent.analytics.tracing import TaskTracer
+
+
+def test_profiler_spans_and_export():
+    """Spans imbriqués, statistiques glissantes et trace JSON"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Profileur par phase")
+    print("="*60)
+
+    profiler = TickProfiler(window=50)
+    for _ in range(10):
+        profiler.begin_tick()
+        with profiler.span("update"):
+            with profiler.span("allocate_tasks"):
+                sum(range(1000))
+            for agent_id in range(2):
+                with profiler.span("agent.update", track=f"agent {agent_id}"):
+                    sum(range(500))
+
+    summary = profiler.summary()
+    assert summary['update']['calls'] == 10
+    assert summary['agent.update']['calls'] == 20
+    assert summary['update']['mean_ms'] >= summary['allocate_tasks']['mean_ms']
+    assert sum(profiler.phases['update'].histogram()) == 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.json")
+        profiler.export_chrome_trace(path)
+        with open(path) as f:
+            trace = json.load(f)
+
+    spans = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+    names = {e['args']['name'] for e in trace['traceEvents'] if e['name'] == 'thread_name'}
+    assert len(spans) == 40
+    assert {"main", "agent 0", "agent 1"} <= names
+    print(f"   ✅ {profiler}")
+
+
+def test_profiler_disabled_is_noop():
+    """Un profileur désactivé n'enregistre rien"""
+    profiler = TickProfiler(enabled=False)
+    with profiler.span("update"):
+        pass
+    assert not profiler.phases and not profiler.events
+
+
+def test_overlay_while_recording():
+    """Overlay dessiné (thread de rendu) pendant que la simulation enregistre des spans"""
+    import pygame
+
+    pygame.init()
+    screen = pygame.Surface((480, 320))
+    font = pygame.font.Font(None, 16)
+    profiler = TickProfiler(window=300)
+    profiler.toggle_overlay()
+    stop = threading.Event()
+    errors = []
+
+    def simulate():
+        try:
+            while not stop.is_set():
+                profiler.begin_tick()
+                for i in range(20):
+                    profiler.record(f"phase {i % 8}", 0, 1000 * (i + 1))
+        except Exception as e:
+            errors.append(e)
+
+    profiler.record("phase 0", 0, 1000)
+    worker = threading.Thread(target=simulate)
+    worker.start()
+    try:
+        for _ in range(300):
+            assert profiler.draw_overlay(screen, font) is not None
+            profiler.summary()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert not errors, errors
+    assert len(profiler.summary()) == 8
+    print(f"   ✅ 300 overlays pendant {profiler.tick} ticks enregistrés")
+
+
+def test_task_tracer_timeline():
+    """Une commande complète produit des spans de tâches, d'activité et d'outils"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Timeline des tâches")
+    print("="*60)
+
+    from multi_agent.main import MultiAgentOvercookedGame
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        game = MultiAgentOvercookedGame({'nb_agents': 2, 'nb_stoves': 1, 'nb_boards': 1,
+                                         'nb_assembly': 1, 'task_trace_path': path})
+        game.add_recipe_to_order("burger")
+        game.send_orders()
+        for _ in range(2000):
+            if game.awaiting_recipe_choice:
+                break
+            game.update()
+        assert game.score == 10, "La commande aurait dû être livrée"
+
+        game.tracer.export_perfetto(path)
+        with open(path) as f:
+            trace = json.load(f)
+
+    tracks = {e['tid']: e['args']['name'] for e in trace['traceEvents'] if e['name'] == 'thread_name'}
+    spans = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+    by_cat = {}
+    for e in spans:
+        by_cat.setdefault(e['cat'], []).append(e)
+
+    # 5 pickups + 3 découpes + 1 cuisson + 5 apports + 1 livraison = 15 tâches
+    assert len(by_cat['task']) == 15
+    assert len(by_cat['order']) == 1
+    assert by_cat['tool'], "Les outils auraient dû être utilisés"
+    assert all(tracks[e['tid']].startswith(('planche', 'poele')) for e in by_cat['tool'])
+
+    summary = game.tracer.summary()
+    for fractions in summary['agents'].values():
+        assert abs(sum(fractions.values()) - 1.0) < 1e-9
+    print(f"   ✅ {game.tracer}, utilisation outils: {summary['tools']}")
+
+
+if __name__ == "__main__":
+    test_profiler_spans_and_export()
+    test_profiler_disabled_is_noop()
+    test_overlay_while_recording()
+    test_task_tracer_timeline()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
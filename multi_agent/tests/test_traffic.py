@@ -0,0 +1,104 @@
+"""Test de la carte de chaleur du trafic et des coûts de congestion"""
+
+import os
+import sys
+import io
+import contextlib
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.pathfinding import PathPlanner
+from common.traffic import TrafficHeatmap
+from common.walkability import WalkabilityMask
+from multi_agent.main import MultiAgentOvercookedGame
+
+
+def _two_routes():
+    """Deux couloirs parallèles (y=0 et y=2) reliés aux extrémités"""
+    mask = WalkabilityMask(7, 3)
+    for x in range(7):
+        mask.set(x, 0, True)
+        mask.set(x, 2, True)
+    mask.set(0, 1, True)
+    mask.set(6, 1, True)
+    return mask
+
+
+def test_heat_decay_and_costs():
+    """La chaleur décroît à chaque tick, le coût est plafonné"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Carte de chaleur du trafic")
+    print("="*60)
+
+    mask = _two_routes()
+    traffic = TrafficHeatmap(mask, decay=0.5, weight=1.0, max_cost=2.0)
+    traffic.observe([(3, 0), (3, 0)])
+    assert traffic.as_array()[0, 3] == 2.0
+    costs = traffic.costs()
+    assert costs[mask.index(3, 0)] == 3.0 and costs[mask.index(3, 2)] == 1.0
+    assert traffic.costs() is costs  # recalculé au plus une fois par tick
+
+    traffic.observe([])
+    assert traffic.as_array()[0, 3] == 1.0
+    assert traffic.costs()[mask.index(3, 0)] == 2.0
+    for _ in range(4):
+        traffic.observe([(3, 0), (3, 0)])
+    assert traffic.costs()[mask.index(3, 0)] == 3.0  # plafond max_cost
+
+
+def test_paths_avoid_congestion():
+    """Le chemin passe par le couloir parallèle quand l'autre est encombré"""
+    mask = _two_routes()
+    start, target = (0, 1), (6, 1)
+
+    path = []
+    planner = PathPlanner(mask)
+    position = start
+    while position != target:
+        position = planner.next_step(position, target, adjacent=False)
+        path.append(position)
+    assert path[0] == (0, 2)  # sans trafic: le premier voisin testé (bas)
+
+    traffic = TrafficHeatmap(mask)
+    for _ in range(5):
+        traffic.observe([(2, 2), (4, 2)])
+    planner = PathPlanner(mask, traffic)
+    assert planner.next_step(start, target, adjacent=False) == (0, 0)
+    print("  ✅ le couloir encombré est évité")
+
+
+def test_game_overlay():
+    """Le jeu tient la carte à jour et la dessine en overlay (touche H)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame({'nb_agents': 3, 'nb_stoves': 2, 'nb_boards': 2, 'nb_assembly': 1,
+                                         'traffic': True})
+        game.add_recipe_to_order("burger")
+        game.send_orders()
+        for _ in range(30):
+            game.update()
+    assert game.traffic.ticks == 30
+    assert all(game.traffic.as_array()[y, x] > 0 for x, y in (a.position for a in game.agents))
+    assert game.snapshot().traffic is None
+
+    game.traffic.toggle_overlay()
+    frame = game.snapshot()
+    assert frame.traffic is not None and frame.traffic is not game.traffic.heat
+    game.draw_game(frame)
+    x, y = game.agents[0].position
+    size = game.kitchen.cell_size
+    red, green, _ = game.kitchen.screen.get_at((x * size + 1, y * size + 1))[:3]
+    assert red > green
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        plain = MultiAgentOvercookedGame({'nb_agents': 2, 'headless': True, 'layout': 'classic'})
+    assert plain.traffic is None and plain.agents[0].path_planner.traffic is None
+
+
+if __name__ == "__main__":
+    test_heat_decay_and_costs()
+    test_paths_avoid_congestion()
+    test_game_overlay()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
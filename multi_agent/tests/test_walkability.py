@@ -0,0 +1,75 @@
+"""Test du masque de cases marchables tenu à jour par la Kitchen"""
+
+import os
+import sys
+import io
+import random
+import contextlib
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.layouts import load_layout, resolve_layout
+from common.walkability import WalkabilityMask
+from multi_agent.kitchen import Kitchen
+
+
+def _expected(kitchen):
+    return [[kitchen.grid[y][x] is None for x in range(kitchen.width)] for y in range(kitchen.height)]
+
+
+def test_mask_follows_grid_mutations():
+    """Le masque reflète la grille après génération, layout et set_cell"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Masque de cases marchables")
+    print("="*60)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        kitchen = Kitchen(headless=True)
+        kitchen.generate_dynamic_kitchen(nb_assembly=2, nb_stoves=3, nb_cutting_boards=3, rng=random.Random(4))
+        layout_kitchen = Kitchen(headless=True, layout=load_layout(resolve_layout('ring_kitchen')))
+
+    for k in (kitchen, layout_kitchen):
+        assert k.walkable.as_array().astype(bool).tolist() == _expected(k)
+
+    version = kitchen.walkable.version
+    kitchen.set_cell(5, 5, 'counter')
+    assert not kitchen.is_walkable((5, 5)) and kitchen.walkable.version == version + 1
+    kitchen.set_cell(5, 5, None)
+    assert kitchen.is_walkable((5, 5))
+    kitchen.set_cell(5, 5, None)
+    assert kitchen.walkable.version == version + 2  # pas de changement, pas de nouvelle version
+
+    # Écriture directe dans la grille: rebuild_walkability resynchronise
+    kitchen.grid[6][6] = 'wall'
+    kitchen.rebuild_walkability()
+    assert kitchen.walkable.as_array().astype(bool).tolist() == _expected(kitchen)
+    print(f"  ✅ {kitchen.walkable}")
+
+
+def test_padded_border():
+    """La bordure n'est jamais marchable: pas de test de bornes pour les voisins"""
+    mask = WalkabilityMask(4, 3, walkable=True)
+    padded = mask.as_array(padded=True)
+    assert padded.shape == (5, 6)
+    assert not padded[0].any() and not padded[-1].any()
+    assert not padded[:, 0].any() and not padded[:, -1].any()
+    assert padded[1:-1, 1:-1].all()
+
+    for x, y in [(0, 0), (3, 0), (0, 2), (3, 2)]:
+        i = mask.index(x, y)
+        assert mask.position(i) == (x, y)
+        outside = [mask.position(i + d) for d in mask.offsets if not mask.cells[i + d]]
+        assert len(outside) == 2 and all(not mask.is_walkable(p) for p in outside)
+
+    assert not mask.is_walkable((-1, 0)) and not mask.is_walkable((4, 0)) and not mask.is_walkable((20, 20))
+    mask.set(1, 1, False)
+    assert padded[2, 2] == 0  # vue NumPy sur le même buffer
+
+
+if __name__ == "__main__":
+    test_mask_follows_grid_mutations()
+    test_padded_border()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
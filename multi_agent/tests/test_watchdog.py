@@ -0,0 +1,140 @@
+"""Test du watchdog de blocages (deadlock / livelock) entre agents"""
+
+import os
+import sys
+import io
+import contextlib
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.layouts import parse_layout
+from common.objects import Ingredient
+from multi_agent.coordination.task_market import Bid, Task, TaskMarket
+from multi_agent.coordination.watchdog import DeadlockWatchdog
+from multi_agent.main import MultiAgentOvercookedGame
+from multi_agent.planning.strips import ActionType, create_initial_world_state
+
+CORRIDOR = """
+XXXXXXXXXX
+s1......2t
+XXXXCAXXXX
+"""
+
+STOVE_CORRIDOR = """
+XXXXXXXXXX
+S1......2t
+XXXXCAXXXX
+"""
+
+
+def _run(config, orders, max_ticks=1500):
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame(config)
+        for recipe in orders:
+            game.add_recipe_to_order(recipe)
+        game.send_orders()
+        while not game.awaiting_recipe_choice and game.tick < max_ticks:
+            game.update()
+    return game
+
+
+def test_crowded_kitchen_completes():
+    """6 agents dans cramped_room: sans watchdog tout se bloque, avec il termine"""
+    print("\n" + "="*60)
+    print("🧪 TEST: Watchdog de blocages")
+    print("="*60)
+
+    config = {'nb_agents': 6, 'headless': True, 'seed': 1, 'layout': 'cramped_room'}
+    orders = ['burger', 'pizza']
+
+    stuck = _run(dict(config, watchdog=False), orders, max_ticks=600)
+    assert stuck.score == 0
+
+    game = _run(config, orders)
+    assert game.awaiting_recipe_choice and game.score == 20
+    summary = game.metrics.generate_report()['deadlocks']
+    assert summary['count'] > 0 and summary['count'] == len(game.watchdog.events)
+    assert summary['by_resolution'].get('yield', 0) > 0
+    print(f"  ✅ terminé en {game.tick} ticks, blocages: {summary}")
+
+
+def test_corridor_task_swap():
+    """Deux agents mains vides face à face dans un couloir échangent leurs tâches"""
+    layout = parse_layout(CORRIDOR, name="corridor")
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame({'nb_agents': 2, 'headless': True, 'layout': layout})
+    a, b = game.agents
+    tomato = Task(100, ActionType.PICKUP, {'ingredient': 'tomate'}, [], 1.0, 1)
+    salad = Task(101, ActionType.PICKUP, {'ingredient': 'salade'}, [], 1.0, 1)
+    a.assign_task(tomato)
+    b.assign_task(salad)
+
+    # Face à face au milieu du couloir, chacun bloqué par l'autre
+    a.position, b.position = [4, 1], [5, 1]
+    a.move_target, b.move_target = (9, 1), (0, 1)
+    a.blocked_ticks = b.blocked_ticks = game.watchdog.stall_ticks
+    game.watchdog.update(game.agents, 0)
+
+    for tick in range(1, 40):
+        if a.holding and b.holding:
+            break
+        for agent in game.agents:
+            agent.update()
+        game.watchdog.update(game.agents, tick)
+
+    assert [e['resolution'] for e in game.watchdog.events] == ['task_swap']
+    assert game.watchdog.events[0]['kind'] == 'cyclic_wait'
+    assert a.holding.name == 'salade' and b.holding.name == 'tomate'
+    assert (salad.assigned_agent, tomato.assigned_agent) == (a.id, b.id)
+
+
+def test_stove_lock_released():
+    """Le détenteur du verrou de poêle attend l'agent qui attend ce verrou: il le rend au TaskMarket"""
+    layout = parse_layout(STOVE_CORRIDOR, name="stove_corridor")
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = MultiAgentOvercookedGame({'nb_agents': 2, 'headless': True, 'layout': layout})
+    a, b = game.agents
+    market = TaskMarket(create_initial_world_state(game.kitchen, game.agents))
+    market.add_tasks([{'task_id': i, 'action_type': ActionType.COOK, 'ingredient': 'steak',
+                       'estimated_duration': 40, 'priority': 1} for i in (0, 1)])
+    market.allocate_tasks([Bid(a.id, 0, 1.0, 0)])
+    assert market.resource_locks['stove'] == {a.id} and not market.get_available_tasks()
+    a.assign_task(market.tasks[0])
+    b.assign_task(market.tasks[1])
+
+    # a (verrou) est derrière b dans le couloir; b, sans verrou, attend celui de a
+    a.position, b.position = [4, 1], [2, 1]
+    a.holding, b.holding = Ingredient('steak', 'coupé'), Ingredient('steak', 'coupé')
+    a.move_target = b.move_target = (0, 1)
+    a.blocked_ticks = b.blocked_ticks = game.watchdog.stall_ticks
+
+    # Sans les verrous, b n'attend personne: a est seulement bloqué
+    game.watchdog.update(game.agents, 0)
+    assert [e['kind'] for e in game.watchdog.events] == ['blocked']
+
+    a.yield_ticks = b.yield_ticks = 0
+    a.blocked_ticks = b.blocked_ticks = game.watchdog.stall_ticks
+    game.watchdog.update(game.agents, 1, market)
+    event = game.watchdog.events[-1]
+    assert (event['kind'], event['resolution']) == ('cyclic_wait', 'release_lock')
+    assert sorted(event['agents']) == [a.id, b.id]
+    assert market.resource_locks['stove'] == set()
+    assert game.metrics.generate_report()['deadlocks']['by_resolution'].get('release_lock') == 1
+
+
+def test_wait_graph_cycles():
+    """Détection d'un cycle dans le graphe d'attente"""
+    edges = {0: [1], 1: [2], 2: [0], 3: [0]}
+    assert sorted(DeadlockWatchdog._in_cycle(0, edges)) == [0, 1, 2]
+    assert DeadlockWatchdog._in_cycle(3, edges) is None
+
+
+if __name__ == "__main__":
+    test_crowded_kitchen_completes()
+    test_corridor_task_swap()
+    test_stove_lock_released()
+    test_wait_graph_cycles()
+    print("\n🎉 TOUS LES TESTS SONT PASSÉS!")
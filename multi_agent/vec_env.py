@@ -0,0 +1,358 @@
+"""
+multi_agent/vec_env.py
+Environnement vectorisé: N cuisines avancées en parallèle (recherche de politiques)
+
+Au lieu d'un graphe d'objets Kitchen / CooperativeAgent mis à jour un par un,
+l'état de N cuisines est stocké dans des tableaux NumPy:
+- cell      (N, H, W)     type de case (sol, caisse, planche, poêle, table, comptoir)
+- crate     (N, H, W)     ingrédient fourni par chaque caisse
+- tool_busy (N, H, W)     outil en cours d'utilisation
+- pos       (N, A, 2)     positions (x, y) des agents
+- facing    (N, A, 2)     orientation (case visée par l'interaction)
+- holding   (N, A)        objet porté (code d'objet, 0 = rien)
+- timer     (N, A)        ticks restants d'une découpe / cuisson
+- assembly  (N, ITEMS)    contenu de la table d'assemblage (comptes par objet)
+
+API façon gym: reset() -> obs ; step(actions) -> obs, reward, done, info.
+Actions par agent: 0 rien, 1 haut, 2 bas, 3 gauche, 4 droite, 5 interagir.
+Les règles reprennent celles du jeu: caisses -> ingrédient cru, planche et
+poêle selon common.recipes.ingredient_config (20 / 40 ticks comme
+CooperativeAgent), table d'assemblage partagée, livraison au comptoir.
+"""
+
+import sys
+import os
+import random
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.objects import Ingredient, Tool
+from common.recipes import recipes, ingredient_config, parse_ingredient_requirement
+
+# === Types de case ===
+FLOOR, CRATE, BOARD, STOVE, ASSEMBLY, COUNTER = range(6)
+CELL_NAMES = ("floor", "crate", "board", "stove", "assembly", "counter")
+
+# === Codes d'objets: 0 = rien, 1 + 3 * ingrédient + état, puis le plat ===
+INGREDIENTS = tuple(ingredient_config)
+STATES = ("cru", "coupe", "cuit")
+DISH = 1 + len(INGREDIENTS) * len(STATES)
+NUM_ITEMS = DISH + 1
+
+# === Actions ===
+NOOP, UP, DOWN, LEFT, RIGHT, INTERACT = range(6)
+NUM_ACTIONS = 6
+MOVES = np.array([[0, 0], [0, -1], [0, 1], [-1, 0], [1, 0], [0, 0]], dtype=np.int16)
+
+# Durées identiques à CooperativeAgent (_do_tool_action)
+CUT_TICKS = 20
+COOK_TICKS = 40
+DELIVERY_REWARD = 10.0
+
+DEFAULT_STARTS = [(1, 1), (14, 14), (1, 14), (14, 1)]
+
+
+def item_code(name: str, state: str = "cru") -> int:
+    """Code d'un ingrédient dans un état donné"""
+    return 1 + INGREDIENTS.index(name) * len(STATES) + STATES.index(state)
+
+
+def item_name(code: int) -> str:
+    """Nom lisible d'un code d'objet (inverse de item_code)"""
+    if code == 0:
+        return ""
+    if code == DISH:
+        return "plat"
+    name = INGREDIENTS[(code - 1) // len(STATES)]
+    state = STATES[(code - 1) % len(STATES)]
+    return name if state == "cru" else f"{name}_{state}"
+
+
+def _transform_table(flag: str, state: str) -> np.ndarray:
+    """Table code -> code transformé (0 si la transformation est impossible)"""
+    table = np.zeros(NUM_ITEMS, dtype=np.int16)
+    for name in INGREDIENTS:
+        if ingredient_config[name].get(flag):
+            table[item_code(name, "cru")] = item_code(name, state)
+    return table
+
+
+CUT_RESULT = _transform_table("needs_cutting", "coupe")
+COOK_RESULT = _transform_table("needs_cooking", "cuit")
+
+
+def recipe_requirements(recipe_names: Sequence[str]) -> np.ndarray:
+    """Matrice (recettes, NUM_ITEMS) des quantités requises sur la table"""
+    req = np.zeros((len(recipe_names), NUM_ITEMS), dtype=np.int16)
+    for r, recipe_name in enumerate(recipe_names):
+        for requirement in recipes[recipe_name]["ingredients"]:
+            name, state = parse_ingredient_requirement(requirement)
+            req[r, item_code(name, state)] += 1
+    return req
+
+
+def encode_kitchen(kitchen):
+    """Convertit la grille d'une Kitchen en tableaux (cell, crate)"""
+    cell = np.zeros((kitchen.height, kitchen.width), dtype=np.int8)
+    crate = np.zeros((kitchen.height, kitchen.width), dtype=np.int16)
+    for y in range(kitchen.height):
+        for x in range(kitchen.width):
+            obj = kitchen.grid[y][x]
+            if obj is None:
+                continue
+            if isinstance(obj, Ingredient):
+                cell[y, x] = CRATE
+                crate[y, x] = item_code(obj.name, "cru")
+            elif isinstance(obj, Tool):
+                cell[y, x] = BOARD if obj.tool_type in ("planche", "cutting_board") else STOVE
+            elif obj == "assembly_table":
+                cell[y, x] = ASSEMBLY
+            elif obj == "counter":
+                cell[y, x] = COUNTER
+            else:
+                cell[y, x] = COUNTER  # autre station: bloquante, sans interaction utile
+    return cell, crate
+
+
+class VecKitchenEnv:
+    """
+    N cuisines avancées en lockstep par opérations sur tableaux
+
+    Les observations retournées sont des vues sur l'état interne (pas de
+    copie): elles sont écrasées au step suivant.
+    Une cuisine terminée (commandes livrées ou max_steps atteint) est
+    réinitialisée automatiquement; info['episode_return'] donne son score.
+    """
+
+    def __init__(self, cells: np.ndarray, crates: np.ndarray, num_agents: int = 2,
+                 order_recipes: Sequence[str] = ("burger",), orders_per_episode: int = 1,
+                 max_steps: int = 2000, starts: Optional[List[tuple]] = None):
+        self.num_envs, self.height, self.width = cells.shape
+        self.num_agents = num_agents
+        self.order_recipes = list(order_recipes)
+        self.orders_per_episode = orders_per_episode
+        self.max_steps = max_steps
+
+        self.cell = cells.astype(np.int8)
+        self.crate = crates.astype(np.int16)
+        self.requirements = recipe_requirements(self.order_recipes)
+
+        starts = list(starts or DEFAULT_STARTS)
+        start_pos = np.array([starts[i % len(starts)] for i in range(num_agents)], dtype=np.int16)
+        self.start_pos = np.broadcast_to(start_pos, (self.num_envs, num_agents, 2)).copy()
+        sx, sy = self.start_pos[..., 0], self.start_pos[..., 1]
+        env_idx = np.arange(self.num_envs)[:, None]
+        if (self.cell[env_idx, sy, sx] != FLOOR).any():
+            raise ValueError("Une position de départ n'est pas une case de sol")
+
+        N, A = self.num_envs, num_agents
+        self.pos = np.zeros((N, A, 2), dtype=np.int16)
+        self.facing = np.zeros((N, A, 2), dtype=np.int16)
+        self.holding = np.zeros((N, A), dtype=np.int16)
+        self.timer = np.zeros((N, A), dtype=np.int16)
+        self.busy_tool = np.zeros((N, A, 2), dtype=np.int16)
+        self.tool_busy = np.zeros((N, self.height, self.width), dtype=bool)
+        self.assembly = np.zeros((N, NUM_ITEMS), dtype=np.int16)
+        self.order = np.zeros(N, dtype=np.int16)
+        self.delivered = np.zeros(N, dtype=np.int32)
+        self.steps = np.zeros(N, dtype=np.int32)
+        self.episode_return = np.zeros(N, dtype=np.float32)
+        self._env_idx = np.arange(N)
+
+    # ----------------------------------------------------------------------
+    # Construction
+    # ----------------------------------------------------------------------
+
+    @classmethod
+    def from_kitchens(cls, kitchens: Sequence, **kwargs) -> "VecKitchenEnv":
+        """Un environnement par Kitchen (la grille est copiée une fois)"""
+        encoded = [encode_kitchen(k) for k in kitchens]
+        return cls(np.stack([c for c, _ in encoded]), np.stack([k for _, k in encoded]), **kwargs)
+
+    @classmethod
+    def from_layout(cls, layout, num_envs: int = 1, **kwargs) -> "VecKitchenEnv":
+        """N copies d'un layout compilé (common.layouts); départs du layout par défaut"""
+        from common import layouts as L
+
+        to_cell = np.array([FLOOR, COUNTER, CRATE, BOARD, STOVE, ASSEMBLY, COUNTER], dtype=np.int8)
+        to_item = np.array([0] + [item_code(name, "cru") for name in L.INGREDIENTS], dtype=np.int16)
+        cells = np.broadcast_to(to_cell[layout.cells], (num_envs, layout.height, layout.width))
+        crates = np.broadcast_to(to_item[layout.crates], (num_envs, layout.height, layout.width))
+        if layout.starts:
+            kwargs.setdefault('starts', list(layout.starts))
+        return cls(cells, crates, **kwargs)
+
+    @classmethod
+    def generate(cls, num_envs: int, nb_stoves: int = 2, nb_boards: int = 2, nb_assembly: int = 1,
+                 seed: Optional[int] = None, **kwargs) -> "VecKitchenEnv":
+        """N cuisines générées par Kitchen.generate_dynamic_kitchen (graines seed, seed+1, ...)"""
+        import contextlib
+        import io
+        from multi_agent.kitchen import Kitchen
+
+        base_seed = seed if seed is not None else random.randrange(2 ** 31)
+        kitchens = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(num_envs):
+                kitchen = Kitchen(headless=True)
+                kitchen.generate_dynamic_kitchen(nb_assembly=nb_assembly, nb_stoves=nb_stoves,
+                                                 nb_cutting_boards=nb_boards,
+                                                 rng=random.Random(base_seed + i))
+                kitchens.append(kitchen)
+        return cls.from_kitchens(kitchens, **kwargs)
+
+    # ----------------------------------------------------------------------
+    # API gym
+    # ----------------------------------------------------------------------
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        self._reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self.observation()
+
+    def _reset_envs(self, mask: np.ndarray):
+        self.pos[mask] = self.start_pos[mask]
+        self.facing[mask] = (0, 1)
+        self.holding[mask] = 0
+        self.timer[mask] = 0
+        self.tool_busy[mask] = False
+        self.assembly[mask] = 0
+        self.order[mask] = 0
+        self.delivered[mask] = 0
+        self.steps[mask] = 0
+        self.episode_return[mask] = 0
+
+    def observation(self) -> Dict[str, np.ndarray]:
+        """Vues sur l'état courant (aucune copie)"""
+        return {
+            'cell': self.cell,
+            'crate': self.crate,
+            'tool_busy': self.tool_busy,
+            'pos': self.pos,
+            'facing': self.facing,
+            'holding': self.holding,
+            'timer': self.timer,
+            'assembly': self.assembly,
+            'order': self.order,
+        }
+
+    def step(self, actions: np.ndarray):
+        """
+        actions: (N, A) entiers dans [0, NUM_ACTIONS)
+        Retourne (obs, reward (N,), done (N,), info)
+        """
+        actions = np.asarray(actions, dtype=np.int16).reshape(self.num_envs, self.num_agents)
+        reward = np.zeros(self.num_envs, dtype=np.float32)
+
+        self._step_timers()
+        free = self.timer == 0
+        self._step_moves(actions, free)
+        for a in range(self.num_agents):
+            self._step_interact(a, (actions[:, a] == INTERACT) & free[:, a], reward)
+
+        self.steps += 1
+        self.episode_return += reward
+        done = (self.delivered >= self.orders_per_episode) | (self.steps >= self.max_steps)
+        info = {'delivered': self.delivered.copy(), 'episode_return': self.episode_return.copy(),
+                'episode_steps': self.steps.copy()}
+        if done.any():
+            self._reset_envs(done)
+        return self.observation(), reward, done, info
+
+    # ----------------------------------------------------------------------
+    # Règles
+    # ----------------------------------------------------------------------
+
+    def _step_timers(self):
+        """Décompte des découpes / cuissons; libère l'outil à la fin"""
+        active = self.timer > 0
+        if not active.any():
+            return
+        self.timer[active] -= 1
+        finished = active & (self.timer == 0)
+        if finished.any():
+            n, a = np.nonzero(finished)
+            tx, ty = self.busy_tool[n, a, 0], self.busy_tool[n, a, 1]
+            self.tool_busy[n, ty, tx] = False
+
+    def _step_moves(self, actions: np.ndarray, free: np.ndarray):
+        moving = free & (actions >= UP) & (actions <= RIGHT)
+        delta = MOVES[actions]
+        # Un déplacement (réussi ou non) oriente l'agent
+        self.facing[moving] = delta[moving]
+
+        target = self.pos + delta
+        tx, ty = target[..., 0], target[..., 1]
+        inside = (tx >= 0) & (tx < self.width) & (ty >= 0) & (ty < self.height)
+        env_idx = self._env_idx[:, None]
+        walkable = inside & (self.cell[env_idx, np.clip(ty, 0, self.height - 1),
+                                       np.clip(tx, 0, self.width - 1)] == FLOOR)
+
+        # Case occupée par un autre agent, ou visée par plusieurs agents
+        others = ~np.eye(self.num_agents, dtype=bool)
+        on_agent = ((target[:, :, None, :] == self.pos[:, None, :, :]).all(-1) & others).any(-1)
+        both_moving = moving[:, :, None] & moving[:, None, :]
+        contested = ((target[:, :, None, :] == target[:, None, :, :]).all(-1) & others & both_moving).any(-1)
+
+        ok = moving & walkable & ~on_agent & ~contested
+        self.pos[ok] = target[ok]
+
+    def _step_interact(self, a: int, acting: np.ndarray, reward: np.ndarray):
+        """Interaction de l'agent a avec la case qu'il regarde, dans toutes les cuisines"""
+        if not acting.any():
+            return
+        n = np.nonzero(acting)[0]
+        front = self.pos[n, a] + self.facing[n, a]
+        fx, fy = front[:, 0], front[:, 1]
+        inside = (fx >= 0) & (fx < self.width) & (fy >= 0) & (fy < self.height)
+        n, fx, fy = n[inside], fx[inside], fy[inside]
+        cell = self.cell[n, fy, fx]
+        held = self.holding[n, a]
+        empty = held == 0
+
+        # Caisse: prendre un ingrédient cru
+        m = (cell == CRATE) & empty
+        self.holding[n[m], a] = self.crate[n[m], fy[m], fx[m]]
+
+        # Planche / poêle: l'agent reste bloqué pendant la transformation
+        for tool, table, duration in ((BOARD, CUT_RESULT, CUT_TICKS), (STOVE, COOK_RESULT, COOK_TICKS)):
+            result = table[held]
+            m = (cell == tool) & (result > 0) & ~self.tool_busy[n, fy, fx]
+            if m.any():
+                nm = n[m]
+                self.holding[nm, a] = result[m]
+                self.timer[nm, a] = duration
+                self.busy_tool[nm, a, 0] = fx[m]
+                self.busy_tool[nm, a, 1] = fy[m]
+                self.tool_busy[nm, fy[m], fx[m]] = True
+
+        # Table d'assemblage: déposer un ingrédient, ou récupérer le plat complet
+        at_table = cell == ASSEMBLY
+        m = at_table & ~empty & (held != DISH)
+        if m.any():
+            nm = n[m]
+            np.add.at(self.assembly, (nm, held[m]), 1)
+            self.holding[nm, a] = 0
+        m = at_table & empty
+        if m.any():
+            nm = n[m]
+            ready = (self.assembly[nm] >= self.requirements[self.order[nm]]).all(-1)
+            nm = nm[ready]
+            self.holding[nm, a] = DISH
+            self.assembly[nm] = 0
+
+        # Comptoir: livrer le plat
+        m = (cell == COUNTER) & (held == DISH)
+        if m.any():
+            nm = n[m]
+            self.holding[nm, a] = 0
+            self.delivered[nm] += 1
+            reward[nm] += DELIVERY_REWARD
+            self.order[nm] = (self.order[nm] + 1) % len(self.order_recipes)
+
+    def __repr__(self) -> str:
+        return (f"VecKitchenEnv(envs={self.num_envs}, agents={self.num_agents}, "
+                f"{self.width}x{self.height}, recettes={self.order_recipes})")
@@ -1,9 +1,8 @@
 """
 agent.py
-Définit le comportement de l'agent autonome avec recherche de chemin A*
+Définit le comportement de l'agent autonome avec recherche de chemin incrémentale (D* Lite)
 """
 
-import heapq
 import sys
 import os
 
@@ -12,12 +11,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from common.objects import Ingredient, Dish
 from common.recipes import parse_ingredient_requirement, get_ingredient_config
+from common.pathfinding import make_planner
 
 class Agent:
     """
     Agent autonome qui prépare les plats
     """
-    def __init__(self, position, kitchen):
+    def __init__(self, position, kitchen, pathfinding='auto'):
         self.position = list(position)  # [x, y]
         self.kitchen = kitchen
         self.holding = None  # Objet actuellement porté
@@ -27,6 +27,7 @@ class Agent:
         self.current_action = "En attente"
         self.action_timer = 0
         self.direction = "CF"  # Direction par défaut (face)
+        self.path_planner = make_planner(kitchen.walkable, pathfinding)  # Chemin conservé entre les ticks
 
     # ----------------------------------------------------------------------
     def set_recipe(self, recipe_name, recipe_data):
@@ -317,53 +318,21 @@ class Agent:
     # ----------------------------------------------------------------------
     def _move_towards(self, target):
         """
-        Déplace l'agent d'une case vers la cible en évitant les obstacles (A*).
+        Déplace l'agent d'une case vers la cible en évitant les obstacles.
+        Le chemin est conservé d'un tick à l'autre (D* Lite ou HPA*, voir make_planner).
         """
         tx, ty = target
         cx, cy = self.position
         if (cx, cy) == (tx, ty):
             return
 
-        def heuristic(a, b):
-            return abs(a[0]-b[0]) + abs(a[1]-b[1])
-
-        open_set = []
-        heapq.heappush(open_set, (heuristic((cx, cy), target), 0, (cx, cy)))
-        came_from = {}
-        g_score = {(cx, cy): 0}
-
-        while open_set:
-            _, cost, current = heapq.heappop(open_set)
-            if current == target:
-                break
-
-            x, y = current
-            for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
-                nx, ny = x+dx, y+dy
-                neighbor = (nx, ny)
-                if not self.kitchen.is_walkable(neighbor):
-                    continue
-                tentative_g = g_score[current]+1
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f_score = tentative_g + heuristic(neighbor, target)
-                    heapq.heappush(open_set, (f_score, tentative_g, neighbor))
-
-        if target not in came_from:
+        next_step = self.path_planner.next_step((cx, cy), (tx, ty), adjacent=False)
+        if next_step is None:
             return  # Aucun chemin trouvé
 
-        # Retrace le chemin jusqu'au prochain pas
-        path = []
-        node = target
-        while node != (cx, cy):
-            path.append(node)
-            node = came_from[node]
-        if path:
-            next_x, next_y = path[-1]
-            old_pos = self.position.copy()
-            self.position = [next_x, next_y]
-            self._update_direction(old_pos, self.position)
+        old_pos = self.position.copy()
+        self.position = list(next_step)
+        self._update_direction(old_pos, self.position)
 
     # ----------------------------------------------------------------------
     def __repr__(self):
@@ -6,6 +6,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from common.objects import Ingredient, Tool, Station
+from common.walkability import WalkabilityMask
 
 
 class Kitchen:
@@ -18,6 +19,8 @@ class Kitchen:
         self.height = height
         self.cell_size = cell_size
         self.grid = [[None for _ in range(width)] for _ in range(height)]
+        # Cases marchables (tenu à jour par set_cell, lu directement par l'A* de l'agent)
+        self.walkable = WalkabilityMask(width, height, walkable=True)
         self.current_dish_image = None
         self.current_dish_pos = None
         self.counter_dishes = []  # Liste des plats sur le comptoir
@@ -58,29 +61,29 @@ class Kitchen:
         for x, y, name in ingredient_positions:
             ing = Ingredient(name, "cru", (x, y))
             self.ingredients_available.append(ing)
-            self.grid[y][x] = ing
+            self.set_cell(x, y, ing)
 
         # Zone de découpe (droite haut)
         self.stations['cutting'] = Station('cutting', (13, 1), (1, 1))
         for pos in [(13, 1)]:
             tool = Tool('planche', pos)
             self.tools.append(tool)
-            self.grid[pos[1]][pos[0]] = tool
+            self.set_cell(pos[0], pos[1], tool)
 
         # Zone de cuisson (droite milieu)
         self.stations['cooking'] = Station('cooking', (13, 4), (1, 1))
         for pos in [(13, 4)]:
             tool = Tool('poele', pos)
             self.tools.append(tool)
-            self.grid[pos[1]][pos[0]] = tool
+            self.set_cell(pos[0], pos[1], tool)
 
         # Table centrale (assemblage) - UNE SEULE CASE
         self.stations['assembly'] = Station('assembly', (8, 8), (1, 1))
-        self.grid[8][8] = 'assembly_table'
+        self.set_cell(8, 8, 'assembly_table')
 
         # Comptoir (livraison) - UNE SEULE CASE
         self.stations['counter'] = Station('counter', (3, 12), (1, 1))
-        self.grid[12][3] = 'counter'
+        self.set_cell(3, 12, 'counter')
 
     # ----------------------------------------------------------------------
     def _load_images(self):
@@ -298,20 +301,17 @@ class Kitchen:
         return buttons
 
     # ----------------------------------------------------------------------
+    def set_cell(self, x, y, value):
+        """Modifie une case de la grille (seul le sol, None, est marchable)"""
+        self.grid[y][x] = value
+        self.walkable.set(x, y, value is None)
+
     def is_walkable(self, position):
         """Vérifie si une position est accessible"""
         x, y = position
-
-        if x < 0 or x >= self.width or y < 0 or y >= self.height:
-            return False
-        cell = self.grid[y][x]
-        if cell is None:
-            return True
-        if isinstance(cell, str) and cell in ("assembly_table", "counter"):
-            return False
-        # Les outils et ingrédients ne sont PAS marchables
-        if isinstance(cell, (Tool, Ingredient)):
-            return False
+        if 0 <= x < self.width and 0 <= y < self.height:
+            mask = self.walkable
+            return mask.cells[(y + 1) * mask.stride + x + 1] == 1
         return False
 
     # ----------------------------------------------------------------------